@@ -0,0 +1,252 @@
+from __future__ import annotations
+from common_values import EMPTY, MAX_PLAYER, MIN_PLAYER, RED, YELLOW
+from game_board import GameBoard, Location, zobrist_keys
+from functools import lru_cache
+from typing import Optional, List
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _layout(size):
+    """Masks and tables shared by every board of the given size. Bit
+    row * (size+2) + column stands for that cell, using the same padded
+    (size+2)x(size+2) layout as GameBoard.grid. Nothing is ever placed on
+    the ring around the edge, so shifting a bitboard by one row or column
+    never wraps a piece onto the far side of the board."""
+    width = size + 2
+    interior = 0
+    locations = {}
+    for row in range(1, size+1):
+        for column in range(1, size+1):
+            bit = row * width + column
+            interior |= 1 << bit
+            locations[bit] = Location(row, column)
+    neighbors = {}
+    for bit in locations:
+        mask = 0
+        for rowIncrement in [-1, 0, 1]:
+            for colIncrement in [-1, 0, 1]:
+                if rowIncrement == 0 and colIncrement == 0:
+                    continue
+                mask |= 1 << (bit + rowIncrement * width + colIncrement)
+        neighbors[bit] = mask
+    return width, interior, locations, neighbors
+
+
+@lru_cache(maxsize=None)
+def region_mask(size, rows: range, columns: range) -> int:
+    """Bitboard of the cells in the given rows and columns of a board of the
+    given size (indices into the padded grid)."""
+    width = size + 2
+    mask = 0
+    for row in rows:
+        for column in columns:
+            mask |= 1 << (row * width + column)
+    return mask
+
+
+def _at_least_two_neighbors(pieces: int, width: int) -> int:
+    """Returns the bitboard of cells with at least two of the given pieces
+    among their 8 neighbors. The 8 shifted copies of the board are added up
+    bit-sliced: ones has a bit set where at least one neighbor has been
+    seen, and twos where at least two have."""
+    ones = 0
+    twos = 0
+    for shift in (1, width - 1, width, width + 1):
+        for shifted in (pieces << shift, pieces >> shift):
+            twos |= ones & shifted
+            ones |= shifted
+    return twos
+
+
+class BitboardGameBoard(GameBoard):
+    """A GameBoard that keeps one integer bitboard per player instead of a
+    NumPy grid. Legal moves come from a few shifts and masks over the whole
+    board at once, neighbor counts are popcounts, and copying a board is
+    copying two integers. It has the same methods as GameBoard, so the
+    players and game.py can use either one. The grid attribute is still
+    available (built when first asked for) for code that reads cells
+    directly, such as the minimax heuristic."""
+
+    def __init__(self, size, array: Optional[np.ndarray] = None,
+                 pieces_placed=None) -> None:
+        GameBoard._num_boards_made += 1
+
+        self.size = size
+        self._width, self._interior, self._locations, self._neighbors = \
+            _layout(size)
+
+        self._zobrist_keys = zobrist_keys(size)
+
+        self.red = 0
+        self.yellow = 0
+        self.zobrist_hash = 0
+        if array is not None:
+            for bit, location in self._locations.items():
+                if array[location.row][location.column] == RED:
+                    self.red |= 1 << bit
+                    self.zobrist_hash ^= self._zobrist_keys[RED][bit]
+                elif array[location.row][location.column] == YELLOW:
+                    self.yellow |= 1 << bit
+                    self.zobrist_hash ^= self._zobrist_keys[YELLOW][bit]
+        self._grid = None
+
+        if pieces_placed:
+            self.pieces_placed = {}
+            self.pieces_placed[MAX_PLAYER] = pieces_placed[MAX_PLAYER]
+            self.pieces_placed[MIN_PLAYER] = pieces_placed[MIN_PLAYER]
+        else:
+            self.pieces_placed = {MAX_PLAYER: 0, MIN_PLAYER: 0}
+
+    @classmethod
+    def from_bitboards(cls, size, red: int, yellow: int) -> BitboardGameBoard:
+        '''A board with the given red and yellow bitboards (as in the red
+        and yellow attributes). Red moves first, so the number of pieces
+        each player has says whose turn it is.'''
+        board = cls(size)
+        board.red = red
+        board.yellow = yellow
+        board.pieces_placed = {MAX_PLAYER: red.bit_count(),
+                               MIN_PLAYER: yellow.bit_count()}
+        for bit in _bits(red):
+            board.zobrist_hash ^= board._zobrist_keys[RED][bit]
+        for bit in _bits(yellow):
+            board.zobrist_hash ^= board._zobrist_keys[YELLOW][bit]
+        return board
+
+    @property
+    def grid(self) -> np.ndarray:
+        if self._grid is None:
+            grid = np.ones((self.size+2, self.size+2)) * EMPTY
+            flat = grid.reshape(-1)
+            for bit in _bits(self.red):
+                flat[bit] = RED
+            for bit in _bits(self.yellow):
+                flat[bit] = YELLOW
+            self._grid = grid
+        return self._grid
+
+    def copy(self) -> BitboardGameBoard:
+        boardCopy = BitboardGameBoard.__new__(BitboardGameBoard)
+        GameBoard._num_boards_made += 1
+        boardCopy.size = self.size
+        boardCopy._width = self._width
+        boardCopy._interior = self._interior
+        boardCopy._locations = self._locations
+        boardCopy._neighbors = self._neighbors
+        boardCopy._zobrist_keys = self._zobrist_keys
+        boardCopy.red = self.red
+        boardCopy.yellow = self.yellow
+        boardCopy.zobrist_hash = self.zobrist_hash
+        boardCopy._grid = None
+        boardCopy.pieces_placed = {
+            MAX_PLAYER: self.pieces_placed[MAX_PLAYER],
+            MIN_PLAYER: self.pieces_placed[MIN_PLAYER]}
+        return boardCopy
+
+    def _pieces(self, piece) -> int:
+        return self.red if piece == RED else self.yellow
+
+    def num_adjacent_friendlies(self, location, piece) -> int:
+        '''Counts the number of friendly pieces that are orthogonal or diagonal
+        to the provided location.'''
+        bit = location.row * self._width + location.column
+        return (self._neighbors[bit] & self._pieces(piece)).bit_count()
+
+    def legal_move_mask(self) -> int:
+        '''Bitboard of the cells the active player can move to.'''
+        mask = self._interior & ~(self.red | self.yellow)
+        if self.in_second_stage():
+            mask &= _at_least_two_neighbors(
+                self._pieces(self.get_active_player()), self._width)
+        return mask
+
+    def neighbor_sum(self, cells: int, window: int) -> int:
+        """For every cell in the bitboard cells, adds up the grid values (1
+        for red, -1 for yellow) of its neighbors that are in the bitboard
+        window. Each piece in the window counts once per cell next to it, so
+        this is a popcount per direction rather than a loop over cells."""
+        red = self.red & window
+        yellow = self.yellow & window
+        total = 0
+        for shift in (1, self._width - 1, self._width, self._width + 1):
+            for shifted in (cells << shift, cells >> shift):
+                total += (shifted & red).bit_count()
+                total -= (shifted & yellow).bit_count()
+        return total
+
+    def is_legal_move(self, location) -> bool:
+        ''' Returns whether or not move is legal.'''
+        row = location.row
+        col = location.column
+        if not (0 <= row < self.size+2 and 0 <= col < self.size+2):
+            return False
+        return bool(self.legal_move_mask() >> (row * self._width + col) & 1)
+
+    def make_move(self, location) -> Optional[BitboardGameBoard]:
+        ''' Returns None if move is not legal. Otherwise returns an
+        updated board, which is a copy of the original.'''
+        if not self.is_legal_move(location):
+            return None
+        boardCopy = self.copy()
+        boardCopy.apply_move(location)
+        return boardCopy
+
+    def apply_move(self, location) -> Optional[int]:
+        ''' Makes the move on this board rather than on a copy (see
+        GameBoard.apply_move). The token is the bit of the new piece.'''
+        if not self.is_legal_move(location):
+            return None
+        piece = self.get_active_player()
+        cell = location.row * self._width + location.column
+        bit = 1 << cell
+        if piece == RED:
+            self.red |= bit
+        else:
+            self.yellow |= bit
+        self.pieces_placed[piece] += 1
+        self.zobrist_hash ^= self._zobrist_keys[piece][cell]
+        self._grid = None
+        return bit
+
+    def undo_move(self, token: int) -> None:
+        ''' Takes back the move that apply_move returned token for.'''
+        piece = RED if self.red & token else YELLOW
+        if piece == RED:
+            self.red ^= token
+        else:
+            self.yellow ^= token
+        self.pieces_placed[piece] -= 1
+        self.zobrist_hash ^= self._zobrist_keys[piece][token.bit_length() - 1]
+        self._grid = None
+
+    def get_legal_moves(self) -> List[Location]:
+        """Returns a list of Locations that represent legal moves that can be
+        made, in the same (row by row) order as GameBoard.get_legal_moves.
+        """
+        return [self._locations[bit] for bit in _bits(self.legal_move_mask())]
+
+    def is_terminal(self):
+        """Returns True if this is a terminal state, i.e. the current player
+        cannot move. Otherwise, returns False."""
+        return self.legal_move_mask() == 0
+
+    def value(self) -> int:
+        """Returns 0 if the state hasn't been won by anyone, 1 if it's a win
+        for the first player and -1 if it's a win for the second player (see
+        GameBoard.value)."""
+        if self.legal_move_mask():
+            return 0
+
+        if self.get_active_player() == MIN_PLAYER:
+            return 1
+
+        return -1
+
+
+def _bits(bits: int):
+    """Yields the index of every set bit, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
@@ -0,0 +1,75 @@
+from game_board import GameBoard, Location
+from bitboard_game_board import BitboardGameBoard
+from minimax_player import heuristic
+from common_values import RED, YELLOW
+import random
+import pytest
+
+sizes = [4, 5, 7]
+
+
+def random_games(size, games, seed):
+    """Yields every position of games random games played to the end, as a
+    GameBoard and a BitboardGameBoard given the same moves."""
+    rng = random.Random(seed)
+    for _ in range(games):
+        board = GameBoard(size)
+        bitboard = BitboardGameBoard(size)
+        yield board, bitboard
+        while not board.is_terminal():
+            move = rng.choice(board.get_legal_moves())
+            board = board.make_move(move)
+            bitboard = bitboard.make_move(move)
+            yield board, bitboard
+
+
+def assert_same(board, bitboard):
+    size = board.size
+    assert (bitboard.grid == board.grid).all()
+    assert bitboard.pieces_placed == board.pieces_placed
+    assert bitboard.get_active_player() == board.get_active_player()
+    assert bitboard.in_second_stage() == board.in_second_stage()
+    assert bitboard.get_legal_moves() == board.get_legal_moves()
+    assert bitboard.is_terminal() == board.is_terminal()
+    assert bitboard.value() == board.value()
+    assert bitboard.zobrist_hash == board.zobrist_hash
+    assert heuristic(bitboard) == heuristic(board)
+    for row in range(size + 2):
+        for column in range(size + 2):
+            location = Location(row, column)
+            assert (bitboard.is_legal_move(location) ==
+                    board.is_legal_move(location))
+            if 1 <= row <= size and 1 <= column <= size:
+                for piece in (RED, YELLOW):
+                    assert (bitboard.num_adjacent_friendlies(location, piece)
+                            == board.num_adjacent_friendlies(location, piece))
+
+
+@pytest.mark.parametrize("size", sizes)
+def test_random_games(size):
+    terminal = 0
+    for board, bitboard in random_games(size, 5, size):
+        assert_same(board, bitboard)
+        terminal += board.is_terminal()
+    assert terminal == 5
+
+
+@pytest.mark.parametrize("size", sizes)
+def test_from_grid_and_bitboards(size):
+    for board, bitboard in random_games(size, 2, 100 + size):
+        from_grid = BitboardGameBoard(size, board.grid, board.pieces_placed)
+        assert_same(board, from_grid)
+        from_bits = BitboardGameBoard.from_bitboards(size, bitboard.red,
+                                                     bitboard.yellow)
+        assert_same(board, from_bits)
+
+
+def test_illegal_move():
+    board = GameBoard(4)
+    bitboard = BitboardGameBoard(4)
+    for location in [Location(0, 1), Location(5, 5), Location(2, 0)]:
+        assert board.make_move(location) is None
+        assert bitboard.make_move(location) is None
+    bitboard = bitboard.make_move(Location(2, 2))
+    assert bitboard.make_move(Location(2, 2)) is None
+    assert bitboard.apply_move(Location(2, 2)) is None
@@ -11,6 +11,7 @@ import random
 import argparse
 from typing import Optional, Dict
 from game_board import GameBoard, Location
+from bitboard_game_board import BitboardGameBoard
 from player import Player
 from human_player import HumanPlayer
 from minimax_player import MinimaxPlayer, heuristic
@@ -35,6 +36,24 @@ def parse_args() -> argparse.Namespace:
         "Only relevant if player2type is minimax; number of plies ahead that"
         " it should look. Default=1"))
 
+    p.add_argument("--time1", type=int, default=None, help=(
+        "Only relevant if player1type is minimax; milliseconds it may spend"
+        " on each move, searching one ply deeper at a time (plies1 is then"
+        " ignored). Default=no limit, search plies1 deep."))
+
+    p.add_argument("--time2", type=int, default=None, help=(
+        "Only relevant if player2type is minimax; milliseconds it may spend"
+        " on each move, searching one ply deeper at a time (plies2 is then"
+        " ignored). Default=no limit, search plies2 deep."))
+
+    p.add_argument("--workers1", type=int, default=1, help=(
+        "Only relevant if player1type is minimax without --time1; number of"
+        " processes to search the first moves in. Default=1."))
+
+    p.add_argument("--workers2", type=int, default=1, help=(
+        "Only relevant if player2type is minimax without --time2; number of"
+        " processes to search the first moves in. Default=1."))
+
     p.add_argument("--playouts1", type=int, default=0, help=(
         "Only relevant if player1type is mcts; number of playouts it should"
         " run. Default=0."))
@@ -61,6 +80,10 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--board_size", type=int, default=7, help=(
         "Size of the game board. 7 by default."))
 
+    p.add_argument("--bitboard", action="store_true", default=False, help=(
+        "Use BitboardGameBoard, which keeps the board as one integer per"
+        " player and finds legal moves much faster."))
+
     p.add_argument("--seed", type=int, default=None, help=(
         "Seed for random number generator. Defaults to no seed, i.e., using"
         "Python default randomness source."))
@@ -69,11 +92,11 @@ def parse_args() -> argparse.Namespace:
     return args
 
 
-def playGame(players, board_size, silent) -> int:
+def playGame(players, board_size, silent, board_class=GameBoard) -> int:
     '''Manages playing an actual game.'''
 
     done = False
-    currentBoard: GameBoard = GameBoard(board_size)
+    currentBoard: GameBoard = board_class(board_size)
     currentPlayer = PLAYER_1
 
     while not done:
@@ -139,7 +162,9 @@ def main() -> None:
     if args.player1type == 'human':
         players[PLAYER_1] = HumanPlayer()
     elif args.player1type == 'minimax':
-        players[PLAYER_1] = MinimaxPlayer(heuristic, args.plies1)
+        players[PLAYER_1] = MinimaxPlayer(heuristic, args.plies1,
+                                         time_limit_ms=args.time1,
+                                         workers=args.workers1)
     elif args.player1type == 'mcts':
         players[PLAYER_1] = MctsPlayer(args.playouts1, args.ucb1)
     else:
@@ -148,7 +173,9 @@ def main() -> None:
     if args.player2type == 'human':
         players[PLAYER_2] = HumanPlayer()
     elif args.player2type == 'minimax':
-        players[PLAYER_2] = MinimaxPlayer(heuristic, args.plies2)
+        players[PLAYER_2] = MinimaxPlayer(heuristic, args.plies2,
+                                         time_limit_ms=args.time2,
+                                         workers=args.workers2)
     elif args.player2type == 'mcts':
         players[PLAYER_2] = MctsPlayer(args.playouts2, args.ucb2)
     else:
@@ -156,12 +183,17 @@ def main() -> None:
 
     first_player_games_won = 0
     for _ in range(args.num_games):
-        winner = playGame(players, args.board_size, args.silent)
+        winner = playGame(players, args.board_size, args.silent,
+                          BitboardGameBoard if args.bitboard else GameBoard)
         if winner == PLAYER_1:
             first_player_games_won += 1
         if args.silent:
             print(MARKERS[winner], end="", flush=True)
 
+    for player in players.values():
+        if isinstance(player, MinimaxPlayer):
+            player.close()
+
     print()
     print(f"Player 1 games won: {first_player_games_won}/{args.num_games}")
     print("Average number of boards made per game:",
@@ -3,6 +3,7 @@ from common_values import (
     EMPTY, MAX_PLAYER, MIN_PLAYER, RED, RED_MARKER, YELLOW, YELLOW_MARKER,
     COLOR_NAMES)
 from typing import Optional, List
+from functools import lru_cache
 import numpy as np
 import random
 from dataclasses import dataclass
@@ -14,6 +15,87 @@ class Location:
     column: int
 
 
+@lru_cache(maxsize=None)
+def _cell_tables(size):
+    """For a board of the given size, cells are numbered row * (size+2) +
+    column, matching the padded grid. Returns the Location of every cell
+    (None on the ring around the edge) and the offsets from a cell to its 8
+    neighbors."""
+    width = size + 2
+    locations = [None] * (width * width)
+    for row in range(1, size+1):
+        for column in range(1, size+1):
+            locations[row * width + column] = Location(row, column)
+    offsets = tuple(rowIncrement * width + colIncrement
+                    for rowIncrement in [-1, 0, 1]
+                    for colIncrement in [-1, 0, 1]
+                    if rowIncrement != 0 or colIncrement != 0)
+    return locations, offsets
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size):
+    """A random 64-bit key for each player and cell (numbered as in
+    _cell_tables) of a board of the given size. A board's Zobrist hash is
+    the XOR of the keys of its pieces. The keys come from their own
+    generator seeded with the size, so they are the same on every run and
+    don't disturb the game's random numbers."""
+    width = size + 2
+    rng = random.Random(size)
+    return {piece: [rng.getrandbits(64) for _ in range(width * width)]
+            for piece in (RED, YELLOW)}
+
+
+def neighbor_sums(grids: np.ndarray) -> np.ndarray:
+    """For padded grids (one board, or a stack of them along the first
+    axis), returns the sum of the 8 neighbors of every interior cell, as
+    the sum of 8 shifted slices. The ring around the edge is left 0."""
+    width = grids.shape[-1]
+    sums = np.zeros(grids.shape, dtype=grids.dtype)
+    interior = sums[..., 1:-1, 1:-1]
+    for rowIncrement in [-1, 0, 1]:
+        for colIncrement in [-1, 0, 1]:
+            if rowIncrement == 0 and colIncrement == 0:
+                continue
+            interior += grids[..., 1+rowIncrement:width-1+rowIncrement,
+                              1+colIncrement:width-1+colIncrement]
+    return sums
+
+
+def second_stage(size, pieces_placed) -> bool:
+    """Whether a board of the given size with pieces_placed (as in
+    GameBoard) is in the second stage of the game, where a move has to be
+    next to two of the player's own pieces: both players have placed at
+    least size-1 pieces."""
+    return (pieces_placed[MAX_PLAYER] >= size-1 and
+            pieces_placed[MIN_PLAYER] >= size-1)
+
+
+def legal_move_mask(grids: np.ndarray, player, second_stage) -> np.ndarray:
+    """Boolean mask of the cells player can move to, for one padded grid or
+    a stack of them. player and second_stage (see
+    game_board.second_stage) can be single values or have one value per
+    grid in the stack. The same rules as GameBoard.is_legal_move, for every
+    cell of every board at once: the cell must be empty and, in the second
+    stage, have at least two of player's pieces next to it."""
+    grids = np.asarray(grids)
+    player = np.asarray(player)
+    second_stage = np.asarray(second_stage)
+    if grids.ndim == 3:
+        # one value per grid lines up with the first axis
+        player = player.reshape(player.shape + (1, 1) * player.ndim)
+        second_stage = second_stage.reshape(
+            second_stage.shape + (1, 1) * second_stage.ndim)
+    friendly = neighbor_sums((grids == player).astype(np.int8))
+    mask = (grids == EMPTY) & (~second_stage | (friendly >= 2))
+    # nothing is ever played on the ring
+    mask[..., 0, :] = False
+    mask[..., -1, :] = False
+    mask[..., :, 0] = False
+    mask[..., :, -1] = False
+    return mask
+
+
 class GameBoard:
     """A game board, with a variety of methods for managing a game. We'll
     sometimes also refer to the board as a _state_. Note that this is different
@@ -55,6 +137,47 @@ class GameBoard:
         else:
             self.pieces_placed = {MAX_PLAYER: 0, MIN_PLAYER: 0}
 
+        self._build_move_sets()
+
+    def _build_move_sets(self) -> None:
+        '''Works out, from the grid, the sets that legal moves are read from.
+        make_move keeps them up to date from then on, touching only the 8
+        neighbors of the new piece:
+
+        _friendly_counts[piece][cell]: number of that player's pieces next
+            to the cell
+        _empty: the empty cells, where any move can go in the first stage
+        _candidates[piece]: the empty cells next to at least two of that
+            player's pieces, where that player can move in the second stage
+
+        It also works out zobrist_hash, the XOR of zobrist_keys for every
+        piece on the board, which make_move updates the same way. Whose turn
+        it is follows from the pieces, so the hash identifies the state.
+        '''
+        self._locations, self._offsets = _cell_tables(self.size)
+        self._zobrist_keys = zobrist_keys(self.size)
+        self.zobrist_hash = 0
+        width = self.size + 2
+        self._friendly_counts = {RED: [0] * (width * width),
+                                 YELLOW: [0] * (width * width)}
+        self._empty = set()
+        self._candidates = {RED: set(), YELLOW: set()}
+        for cell, location in enumerate(self._locations):
+            if location is None:
+                continue
+            piece = self.grid[location.row][location.column]
+            if piece == EMPTY:
+                self._empty.add(cell)
+            else:
+                self.zobrist_hash ^= self._zobrist_keys[int(piece)][cell]
+                counts = self._friendly_counts[int(piece)]
+                for offset in self._offsets:
+                    counts[cell + offset] += 1
+        for cell in self._empty:
+            for piece in (RED, YELLOW):
+                if self._friendly_counts[piece][cell] >= 2:
+                    self._candidates[piece].add(cell)
+
     @classmethod
     def get_num_boards_made(cls) -> int:
         return GameBoard._num_boards_made
@@ -73,7 +196,24 @@ class GameBoard:
             raise Exception("Pieces placed is inconsistent.")
 
     def copy(self) -> GameBoard:
-        boardCopy = GameBoard(self.size, self.grid, self.pieces_placed)
+        # copies the move sets rather than building them again
+        boardCopy = GameBoard.__new__(GameBoard)
+        GameBoard._num_boards_made += 1
+        boardCopy.size = self.size
+        boardCopy.grid = self.grid.copy()
+        boardCopy.pieces_placed = {
+            MAX_PLAYER: self.pieces_placed[MAX_PLAYER],
+            MIN_PLAYER: self.pieces_placed[MIN_PLAYER]}
+        boardCopy._locations = self._locations
+        boardCopy._offsets = self._offsets
+        boardCopy._zobrist_keys = self._zobrist_keys
+        boardCopy.zobrist_hash = self.zobrist_hash
+        boardCopy._friendly_counts = {
+            piece: counts.copy()
+            for piece, counts in self._friendly_counts.items()}
+        boardCopy._empty = self._empty.copy()
+        boardCopy._candidates = {
+            piece: cells.copy() for piece, cells in self._candidates.items()}
         return boardCopy
 
     def display(self) -> None:
@@ -105,59 +245,99 @@ class GameBoard:
     def num_adjacent_friendlies(self, location, piece) -> int:
         '''Counts the number of friendly pieces that are orthogonal or diagonal
         to the provided location.'''
-        row = location.row
-        col = location.column
-        numAdjacentFriendlies = 0
-        for rowIncrement in [-1, 0, 1]:
-            for colIncrement in [-1, 0, 1]:
-                if rowIncrement == 0 and colIncrement == 0:
-                    continue
-                if self.grid[row + rowIncrement][col + colIncrement] == piece:
-                    numAdjacentFriendlies += 1
-        return numAdjacentFriendlies
+        return self._friendly_counts[piece][
+            location.row * (self.size+2) + location.column]
 
     def in_second_stage(self) -> bool:
-        return (self.pieces_placed[MAX_PLAYER] >= self.size-1 and
-                self.pieces_placed[MIN_PLAYER] >= self.size-1)
+        return second_stage(self.size, self.pieces_placed)
+
+    def _legal_cells(self) -> set:
+        '''The cells the active player can move to. In the first stage that
+        is every empty cell; once both players are in the second stage it
+        is the active player's candidates.'''
+        if self.in_second_stage():
+            return self._candidates[self.get_active_player()]
+        return self._empty
 
     def is_legal_move(self, location) -> bool:
-        ''' Returns whether or not move is legal.'''
+        ''' Returns whether or not move is legal. Cells on the ring around
+        the edge (and anything off the board) never are.'''
         row = location.row
         col = location.column
-        piece = self.get_active_player()
-
-        # A move cannot be made if a piece is already there.
-        if self.grid[row][col] != EMPTY:
-            return False
-
-        # A move cannot be made if the piece "value" is not red or yellow.
-        if piece != YELLOW and piece != RED:
+        if not (1 <= row <= self.size and 1 <= col <= self.size):
             return False
-
-        # Extra restrictions once initial stage is over
-        if (self.in_second_stage() and
-                self.num_adjacent_friendlies(location, piece) < 2):
-            return False
-
-        return True
+        return row * (self.size+2) + col in self._legal_cells()
 
     def make_move(self, location) -> Optional[GameBoard]:
         ''' Returns None if move is not legal. Otherwise returns an
         updated board, which is a copy of the original.'''
 
-        piece = self.get_active_player()
         if not self.is_legal_move(location):
             return None
 
         # Make a copy of the board (not just the pointer!) and record move
         boardCopy = self.copy()
-        row = location.row
-        col = location.column
-        boardCopy.grid[row][col] = piece
-        boardCopy.pieces_placed[piece] += 1
+        boardCopy.apply_move(location)
 
         return boardCopy
 
+    def apply_move(self, location) -> Optional[Location]:
+        ''' Makes the move on this board rather than on a copy. Returns None
+        (leaving the board alone) if the move is not legal. Otherwise returns
+        a token to pass to undo_move. Moves must be undone in the opposite
+        order to the one they were made in.'''
+        if not self.is_legal_move(location):
+            return None
+
+        piece = self.get_active_player()
+        row = location.row
+        col = location.column
+        self.grid[row][col] = piece
+        self.pieces_placed[piece] += 1
+        self._place(row * (self.size+2) + col, piece)
+
+        # the move sets can all be worked back from the location
+        return location
+
+    def undo_move(self, token: Location) -> None:
+        ''' Takes back the move that apply_move returned token for.'''
+        row = token.row
+        col = token.column
+        piece = int(self.grid[row][col])
+        self.grid[row][col] = EMPTY
+        self.pieces_placed[piece] -= 1
+        self._remove(row * (self.size+2) + col, piece)
+
+    def _place(self, cell, piece) -> None:
+        '''Updates the move sets and hash for a new piece on cell.'''
+        self.zobrist_hash ^= self._zobrist_keys[piece][cell]
+        self._empty.discard(cell)
+        self._candidates[RED].discard(cell)
+        self._candidates[YELLOW].discard(cell)
+        counts = self._friendly_counts[piece]
+        candidates = self._candidates[piece]
+        for offset in self._offsets:
+            neighbor = cell + offset
+            counts[neighbor] += 1
+            if counts[neighbor] == 2 and neighbor in self._empty:
+                candidates.add(neighbor)
+
+    def _remove(self, cell, piece) -> None:
+        '''Updates the move sets and hash for the piece on cell being taken
+        away.'''
+        self.zobrist_hash ^= self._zobrist_keys[piece][cell]
+        counts = self._friendly_counts[piece]
+        candidates = self._candidates[piece]
+        for offset in self._offsets:
+            neighbor = cell + offset
+            counts[neighbor] -= 1
+            if counts[neighbor] == 1:
+                candidates.discard(neighbor)
+        self._empty.add(cell)
+        for player in (RED, YELLOW):
+            if self._friendly_counts[player][cell] >= 2:
+                self._candidates[player].add(cell)
+
     def get_randomized_moves(self) -> List[Location]:
         """Returns a randomly ordered list of all Locations on this board.
         Note that these are not necessarily legal moves.
@@ -187,22 +367,15 @@ class GameBoard:
         made.
         """
 
-        legal_moves = []
-        for row in range(1, self.size+1):
-            for column in range(1, self.size+1):
-                location = Location(row, column)
-                if self.is_legal_move(location):
-                    legal_moves.append(location)
-        return legal_moves
+        # cells are numbered row by row, so sorting them gives row-major order
+        return [self._locations[cell] for cell in sorted(self._legal_cells())]
 
     def is_terminal(self):
         """Returns True if this is a terminal state, i.e. the current player
-        cannot move. Otherwise, returns False. Make sure to notice that this
-        function calls get_legal_moves, so it is slow to call both
-        this function and get_legal_moves if you need to do both.
+        cannot move. Otherwise, returns False.
         """
 
-        return len(self.get_legal_moves()) == 0
+        return len(self._legal_cells()) == 0
 
     def value(self) -> int:
         """Returns 0 if the state hasn't been won by anyone, returns 1 if it's
@@ -210,7 +383,7 @@ class GameBoard:
         that resulted in this state, which is a win for the first player), and
         returns -1 if it's a win for the second player.
         """
-        if len(self.get_legal_moves()) > 0:
+        if len(self._legal_cells()) > 0:
             return 0
 
         if self.get_active_player() == MIN_PLAYER:
@@ -0,0 +1,166 @@
+from game_board import GameBoard, Location, legal_move_mask, second_stage
+from bitboard_game_board import BitboardGameBoard
+from common_values import EMPTY, RED, YELLOW
+import numpy as np
+import random
+import pytest
+
+sizes = [4, 5, 7]
+
+
+def snapshot(board):
+    """Everything apply_move and undo_move change, as plain values."""
+    if isinstance(board, BitboardGameBoard):
+        return (board.red, board.yellow, dict(board.pieces_placed),
+                board.zobrist_hash)
+    return (board.grid.tolist(), dict(board.pieces_placed),
+            set(board._empty),
+            {piece: set(cells) for piece, cells in board._candidates.items()},
+            {piece: list(counts)
+             for piece, counts in board._friendly_counts.items()},
+            board.zobrist_hash)
+
+
+def rebuilt(board):
+    """The board made again from its grid, without any incremental
+    updates."""
+    return type(board)(board.size, board.grid, board.pieces_placed)
+
+
+def legal_by_rule(board):
+    """The legal moves worked out from the grid alone: empty cells, next to
+    two of the active player's pieces in the second stage."""
+    piece = board.get_active_player()
+    moves = []
+    for row in range(1, board.size + 1):
+        for column in range(1, board.size + 1):
+            if board.grid[row][column] != EMPTY:
+                continue
+            friendly = sum(board.grid[row + x][column + y] == piece
+                           for x in [-1, 0, 1] for y in [-1, 0, 1])
+            if not board.in_second_stage() or friendly >= 2:
+                moves.append(Location(row, column))
+    return moves
+
+
+@pytest.mark.parametrize("size", sizes)
+def test_move_sets_across_stages(size):
+    rng = random.Random(size)
+    for _ in range(5):
+        board = GameBoard(size)
+        stages = []
+        while True:
+            stages.append(board.in_second_stage())
+            assert snapshot(board) == snapshot(rebuilt(board))
+            assert board.get_legal_moves() == legal_by_rule(board)
+            assert board.is_terminal() == (not legal_by_rule(board))
+            if board.is_terminal():
+                break
+            board = board.make_move(rng.choice(board.get_legal_moves()))
+        assert stages.index(True) == 2 * (size - 1)
+
+
+def test_ring_not_legal():
+    board = GameBoard(4)
+    for location in [Location(0, 0), Location(0, 2), Location(5, 3),
+                     Location(2, 5), Location(9, 9)]:
+        assert not board.is_legal_move(location)
+        assert board.make_move(location) is None
+
+
+@pytest.mark.parametrize("board_class", [GameBoard, BitboardGameBoard])
+@pytest.mark.parametrize("size", sizes)
+def test_apply_undo(board_class, size):
+    rng = random.Random(size)
+    for _ in range(5):
+        board = board_class(size)
+        # snapshot before each move still on the board, and its token
+        made = []
+        for _ in range(6 * size * size):
+            if made and (board.is_terminal() or rng.random() < 0.4):
+                before, token = made.pop()
+                board.undo_move(token)
+                assert snapshot(board) == before
+            elif not board.is_terminal():
+                before = snapshot(board)
+                token = board.apply_move(rng.choice(board.get_legal_moves()))
+                assert token is not None
+                made.append((before, token))
+            assert snapshot(board) == snapshot(rebuilt(board))
+        while made:
+            before, token = made.pop()
+            board.undo_move(token)
+            assert snapshot(board) == before
+        assert snapshot(board) == snapshot(board_class(size))
+
+
+@pytest.mark.parametrize("board_class", [GameBoard, BitboardGameBoard])
+def test_make_move_leaves_board_alone(board_class):
+    board = board_class(5).make_move(Location(3, 3))
+    before = snapshot(board)
+    after = board.make_move(Location(2, 2))
+    assert snapshot(board) == before
+    assert after.zobrist_hash != board.zobrist_hash
+    assert board.apply_move(Location(3, 3)) is None
+    assert snapshot(board) == before
+
+
+def test_zobrist_hash_by_position():
+    # the same pieces reached in a different order hash the same
+    first = GameBoard(5)
+    second = GameBoard(5)
+    for move in [Location(1, 1), Location(2, 2), Location(3, 3),
+                 Location(4, 4)]:
+        first.apply_move(move)
+    for move in [Location(3, 3), Location(4, 4), Location(1, 1),
+                 Location(2, 2)]:
+        second.apply_move(move)
+    assert (first.grid == second.grid).all()
+    assert first.zobrist_hash == second.zobrist_hash
+    assert first.zobrist_hash != GameBoard(5).zobrist_hash
+
+
+def random_boards(size, count, seed):
+    """count boards from random games, from the start to the end, so that
+    both players and both stages come up."""
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        board = GameBoard(size)
+        for _ in range(rng.randrange(size * size + 1)):
+            if board.is_terminal():
+                break
+            board = board.make_move(rng.choice(board.get_legal_moves()))
+        boards.append(board)
+    return boards
+
+
+def mask_moves(mask):
+    return [Location(int(row), int(column))
+            for row, column in zip(*np.nonzero(mask))]
+
+
+@pytest.mark.parametrize("size", sizes)
+def test_legal_move_mask(size):
+    boards = random_boards(size, 40, size)
+    players = [board.get_active_player() for board in boards]
+    stages = [board.in_second_stage() for board in boards]
+    assert len(set(players)) == 2 and len(set(stages)) == 2
+    masks = legal_move_mask(np.stack([board.grid for board in boards]),
+                            players, stages)
+    for board, mask in zip(boards, masks):
+        assert mask_moves(mask) == board.get_legal_moves()
+        assert (mask_moves(legal_move_mask(
+            board.grid, board.get_active_player(), board.in_second_stage()))
+            == board.get_legal_moves())
+
+
+def test_second_stage():
+    for size in sizes:
+        for red in range(size + 1):
+            for yellow in (red - 1, red):
+                if yellow < 0:
+                    continue
+                pieces_placed = {RED: red, YELLOW: yellow}
+                assert second_stage(size, pieces_placed) == (
+                    red >= size - 1 and yellow >= size - 1)
@@ -138,16 +138,20 @@ class MctsNode:
     
     def simulation(self, board: GameBoard) -> int:
 
-        # Recursively check for terminal state, when found, return
-        if GameBoard.is_terminal(board):
-            
-            if GameBoard.get_active_player(self.state) == GameBoard.value(board):
-                return 1
-            else:
-                return -1        
+        # Play random moves on the board itself until a terminal state is
+        # found, then take them all back so the board is left as it was
+        tokens = []
+        while not board.is_terminal():
+            current_legal_moves = board.get_legal_moves()
+            tokens.append(board.apply_move(current_legal_moves[random.randint(0,len(current_legal_moves)-1)]))
+        value = board.value()
+        while tokens:
+            board.undo_move(tokens.pop())
+
+        if self.state.get_active_player() == value:
+            return 1
         else:
-            current_legal_moves = GameBoard.get_legal_moves(board)
-            return self.simulation(GameBoard.make_move(board,current_legal_moves[random.randint(0,len(current_legal_moves)-1)]))
+            return -1
 
     def choose_move_via_mcts(self, playouts: int) -> Optional[Location]:
         iterations = playouts
@@ -177,7 +181,7 @@ class MctsNode:
 
             # Simulation:
                 
-            if not GameBoard.is_terminal(current_node.state):
+            if not current_node.state.is_terminal():
                 target = None
                 for move in current_node.legal_moves:
                     if move not in current_node.children:
@@ -187,13 +191,13 @@ class MctsNode:
 
                 if target == None:
                     self.print_tree("")
-                newNode = MctsNode(GameBoard.make_move(current_node.state,target),current_node,self.ucb_const)
+                newNode = MctsNode(current_node.state.make_move(target),current_node,self.ucb_const)
                 current_node.children[target] = newNode
                 current_node = newNode 
                 current_node.update_play_counts(outcome,self.state)
                 current_node = current_node.parent
             else:
-                outcome = GameBoard.value(current_node.state)
+                outcome = current_node.state.value()
                 current_node.fully_visited = True
             
            
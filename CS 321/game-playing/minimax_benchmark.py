@@ -0,0 +1,86 @@
+"""Times MinimaxPlayer's parallel root search with 1 (the serial search) up
+to --max_workers worker processes, on the same random positions, and checks
+that every number of workers chooses the same moves as the serial search.
+
+Every position is reached by the same number of random moves, so positions
+never meet in the transposition table at different depths.
+"""
+
+
+import argparse
+import os
+import random
+import time
+from game_board import GameBoard
+from bitboard_game_board import BitboardGameBoard
+from minimax_player import MinimaxPlayer, heuristic
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """ Parse command line arguments.
+    """
+    p = argparse.ArgumentParser()
+
+    p.add_argument("--max_workers", type=int, default=os.cpu_count(), help=(
+        "Largest number of worker processes to time. Default=number of"
+        " CPUs."))
+
+    p.add_argument("--board_size", type=int, default=7, help=(
+        "Size of the game board. Default=7."))
+
+    p.add_argument("--plies", type=int, default=4, help=(
+        "Number of plies to search from each position. Default=4."))
+
+    p.add_argument("--positions", type=int, default=5, help=(
+        "Number of positions to search. Default=5."))
+
+    p.add_argument("--moves", type=int, default=6, help=(
+        "Number of random moves made to reach each position. Default=6."))
+
+    p.add_argument("--bitboard", action="store_true", default=False, help=(
+        "Use BitboardGameBoard instead of GameBoard."))
+
+    p.add_argument("--seed", type=int, default=0, help=(
+        "Seed for the random positions. Default=0."))
+
+    return p.parse_args(argv)
+
+
+def random_positions(board_class, size, count, moves):
+    positions = []
+    while len(positions) < count:
+        board = board_class(size)
+        for _ in range(moves):
+            if board.is_terminal():
+                break
+            board = board.make_move(random.choice(board.get_legal_moves()))
+        if not board.is_terminal():
+            positions.append(board)
+    return positions
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    random.seed(args.seed)
+    board_class = BitboardGameBoard if args.bitboard else GameBoard
+    positions = random_positions(board_class, args.board_size, args.positions,
+                                 args.moves)
+
+    serial_time = None
+    serial_moves = None
+    print(f"{'workers':>7} {'seconds':>9} {'speedup':>8}  same moves")
+    for workers in range(1, max(args.max_workers, 1) + 1):
+        player = MinimaxPlayer(heuristic, args.plies, workers=workers)
+        start = time.perf_counter()
+        moves = [player.choose_move(board) for board in positions]
+        elapsed = time.perf_counter() - start
+        player.close()
+        if serial_time is None:
+            serial_time = elapsed
+            serial_moves = moves
+        print(f"{workers:>7} {elapsed:>9.3f} {serial_time / elapsed:>8.2f}"
+              f"  {moves == serial_moves}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,12 +6,18 @@ Feel free to add additional helper methods or functions.
 """
 
 from __future__ import annotations
-from game_board import GameBoard, Location
+from game_board import (
+    GameBoard, Location, legal_move_mask, neighbor_sums, second_stage)
+from bitboard_game_board import BitboardGameBoard, region_mask
 from typing import Optional, Callable, List
 from player import Player
 from collections import namedtuple
 import common_values
+import math
+import multiprocessing
+import numpy as np
 import sys
+import time
 from common_values import (
     EMPTY, MAX_PLAYER, MIN_PLAYER, RED, RED_MARKER, YELLOW, YELLOW_MARKER,
     COLOR_NAMES)
@@ -48,7 +54,13 @@ def heuristic(board: GameBoard) -> float:
 
     sum = 0
     max_neighbors = 8
-    legal_moves = GameBoard.get_legal_moves(board)
+    if isinstance(board, BitboardGameBoard):
+        # same sum (including get_neighbors' window), from shifts and
+        # popcounts
+        window = region_mask(board.size, range(board.size), range(board.size))
+        sum = board.neighbor_sum(board.legal_move_mask(), window)
+        return sum/max_neighbors
+    legal_moves = board.get_legal_moves()
     for move in legal_moves:
         neighbors = get_neighbors(board, move.row, move.column)
         for neighbor in neighbors:
@@ -64,77 +76,573 @@ def heuristic(board: GameBoard) -> float:
     #     final_heu = ((1 - (len(enemy_legal_moves)/((board.size+2)**2))) - (1 - (len(player_legal_moves)/((board.size+2)**2))))
 
 
+def batch_heuristic(grids: np.ndarray, player, second_stage) -> np.ndarray:
+    """heuristic for a stack of padded grids at once, where player is the
+    active player and second_stage says whether the boards are in the
+    second stage (either can also be given per grid). Returns one value per
+    grid, the same as calling heuristic on each board."""
+    grids = np.asarray(grids)
+    size = grids.shape[-1] - 2
+    # get_neighbors only looks at rows and columns 0 to size-1
+    window = grids.copy()
+    window[..., size:, :] = 0
+    window[..., :, size:] = 0
+    mask = legal_move_mask(grids, player, second_stage)
+    sums = (neighbor_sums(window) * mask).sum(axis=(-2, -1))
+    return sums / 8
+
+
+heuristic.batch = batch_heuristic
+
+
+# Bound types for transposition table entries: the stored value is the
+# node's exact value, a lower bound on it (the search failed high) or an
+# upper bound on it (the search failed low).
+EXACT, LOWER, UPPER = 0, 1, 2
+
+TableEntry = namedtuple("TableEntry",
+                        ["key", "depth", "bound", "value", "move", "nodes"])
+
+
+class TranspositionTable:
+    """Fixed-size table of search results indexed by Zobrist hash. Each slot
+    has two entries: a depth-preferred one, only replaced by a search at
+    least as deep, and one that is always replaced by the newest result. A
+    depth-preferred entry that gets pushed out moves to the other one."""
+
+    def __init__(self, slots: int) -> None:
+        self.slots = slots
+        self._deep: List[Optional[TableEntry]] = [None] * slots
+        self._recent: List[Optional[TableEntry]] = [None] * slots
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        self.probes += 1
+        index = key % self.slots
+        for entry in (self._deep[index], self._recent[index]):
+            if entry is not None and entry.key == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def store(self, entry: TableEntry) -> None:
+        index = entry.key % self.slots
+        deep = self._deep[index]
+        if deep is None or entry.depth >= deep.depth:
+            if deep is not None and deep.key != entry.key:
+                self._recent[index] = deep
+            self._deep[index] = entry
+        else:
+            # includes a shallower search of the same position, which
+            # leaves the deeper result in place
+            self._recent[index] = entry
+
+    def clear(self) -> None:
+        self._deep = [None] * self.slots
+        self._recent = [None] * self.slots
+
+
+class _OutOfTime(Exception):
+    """Raised inside a search when the time limit is up."""
+
+
 class MinimaxPlayer(Player):
-    """Minimax player: uses minimax to find the best move."""
+    """Minimax player: uses minimax to find the best move.
+
+    Searches with fail-soft alpha-beta pruning: a node's value can fall
+    outside the window, in which case it is a bound on the true value. Moves
+    are ordered by the best line of the last search, the transposition
+    table (kept from move to move unless table_slots is 0), killer moves,
+    static evaluation and the history heuristic. get_stats reports how well
+    the pruning and the table are doing. With time_limit_ms, plies is ignored and
+    each move is searched deeper and deeper until the time is up (see
+    iterative_deepening). Otherwise, with more than one worker, the root
+    moves are searched in that many processes (see parallel_root_search).
+    Call close when done with a parallel player."""
 
     def __init__(self,
                  heuristic: Callable[[GameBoard], float],
-                 plies: int) -> None:
+                 plies: int,
+                 table_slots: int = 1 << 16,
+                 time_limit_ms: Optional[int] = None,
+                 workers: int = 1) -> None:
         self.heuristic = heuristic
         self.plies = plies
+        self.time_limit_ms = time_limit_ms
+        self.table_slots = table_slots
+        self.workers = workers
+        # made by the first parallel search
+        self._pool = None
+        # depth of the last search iterative_deepening finished
+        self.completed_depth = 0
+        self._deadline = None
+        # in a parallel search's worker, returns the latest bound for the
+        # root move being searched (see _search_root_move)
+        self._root_bound = None
+        # ply -> best line found from the node being searched at that ply
+        self._lines = {}
+        # best line of the last finished search, tried first by the next
+        self._best_line = []
         self.Board_Node = namedtuple("Board_Node", ["heuristic", "parent_move"])
-        self.alpha = sys.maxsize
-        self.beta = -sys.maxsize
+        # the widest window: every value is between alpha and beta
+        self.alpha = -sys.maxsize
+        self.beta = sys.maxsize
+        self.table = TranspositionTable(table_slots) if table_slots else None
+        self.batch_evaluation = hasattr(heuristic, "batch")
+        self.nodes = 0
+        self.cutoffs = 0
+        # ply -> nodes that table entries saved searching at that ply
+        self.nodes_saved = {}
+        # ply -> the last two moves that caused a cutoff at that ply
+        self._killers = {}
+        # move -> sum of depth squared over the cutoffs it caused
+        self._history = {}
+        # nodes, cutoffs, depth and effective branching factor of the last
+        # choose_move
+        self.last_search = {}
+
+    def get_stats(self) -> dict:
+        '''Counts since the player was made: nodes searched, cutoffs,
+        table probes and hits (and the hit rate), and nodes saved at each
+        ply, along with last_search.'''
+        probes = self.table.probes if self.table else 0
+        hits = self.table.hits if self.table else 0
+        return {"nodes": self.nodes, "cutoffs": self.cutoffs,
+                "probes": probes, "hits": hits,
+                "hit_rate": hits / probes if probes else 0.0,
+                "nodes_saved": dict(sorted(self.nodes_saved.items())),
+                "last_search": self.last_search}
+
+    def record_search(self, depth, nodes, cutoffs) -> None:
+        '''Fills in last_search. The effective branching factor is the b
+        for which b**depth is the number of nodes searched.'''
+        self.last_search = {
+            "nodes": nodes, "cutoffs": cutoffs, "depth": depth,
+            "branching_factor": nodes ** (1 / depth) if depth else 0.0}
+
+    def order_moves(self, board: GameBoard, child_locations: List[Location],
+                    depth, ply, first_moves: List[Location]) -> List[Location]:
+        '''Puts the moves in the order to search them: first_moves (those
+        that aren't None or illegal), then the killer moves for this ply,
+        then the rest, best static evaluation for the player to move first,
+        with higher history scores breaking ties. One ply from the bottom
+        every child gets evaluated anyway, so there the rest stay in board
+        order.'''
+        legal = set(child_locations)
+        front = []
+        for move in first_moves + self._killers.get(ply, []):
+            if move in legal and move not in front:
+                front.append(move)
+        rest = [move for move in child_locations if move not in front]
+        if depth > 1 and len(rest) > 1:
+            values = self.evaluate_children(board, rest)
+            sign = board.get_active_player()
+            order = sorted(range(len(rest)), key=lambda i: (
+                -sign * values[i], -self._history.get(rest[i], 0)))
+            rest = [rest[i] for i in order]
+        return front + rest
+
+    def record_cutoff(self, move: Location, depth, ply) -> None:
+        '''Counts a cutoff caused by move, and remembers the move as a
+        killer for this ply and in the history scores.'''
+        self.cutoffs += 1
+        killers = self._killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self._history[move] = self._history.get(move, 0) + depth * depth
+
+    def evaluate_children(self, board: GameBoard,
+                          child_locations: List[Location]) -> List[float]:
+        '''The heuristic value of the board after each of the moves, from a
+        single call to the heuristic's batch version on a stack of the
+        child grids where there is one (and the board isn't a bitboard,
+        which has a faster heuristic of its own).'''
+        if not self.batch_evaluation or isinstance(board, BitboardGameBoard):
+            values = []
+            for location in child_locations:
+                token = board.apply_move(location)
+                values.append(self.heuristic(board))
+                board.undo_move(token)
+            return values
+        piece = board.get_active_player()
+        grids = np.repeat(board.grid[np.newaxis], len(child_locations), axis=0)
+        grids[np.arange(len(child_locations)),
+              [location.row for location in child_locations],
+              [location.column for location in child_locations]] = piece
+        pieces_placed = dict(board.pieces_placed)
+        pieces_placed[piece] += 1
+        return self.heuristic.batch(
+            grids, -piece, second_stage(board.size, pieces_placed)).tolist()
 
-    
     def choose_move(self, board: GameBoard) -> Optional[Location]:
         '''
         Function that chooses a move by calling minimax helper function
         '''
         player = board.get_active_player()
-        minimax_result = self.minimax(self.alpha, self.beta, board, self.plies, player)
+        # the search makes and takes back moves on this one copy
+        board = board.copy()
+        # killers are by ply from the root, which has moved on; old history
+        # counts for less
+        self._killers = {}
+        self._history = {move: score // 2
+                         for move, score in self._history.items() if score > 1}
+        if self.time_limit_ms is not None:
+            return self.iterative_deepening(board, player)
+        nodes = self.nodes
+        cutoffs = self.cutoffs
+        if self.workers > 1:
+            minimax_result = self.parallel_root_search(board, self.plies, player)
+        else:
+            minimax_result = self.minimax(self.alpha, self.beta, board, self.plies, player)
+        self.record_search(self.plies, self.nodes - nodes,
+                           self.cutoffs - cutoffs)
 
         return minimax_result.parent_move
+
+    def parallel_root_search(self, board: GameBoard, depth, player):
+        '''minimax at the root, with the root moves spread over worker
+        processes in young brothers wait style. The first move in order
+        (the most promising, see order_moves) is searched here, to get a
+        bound, and the rest are handed out one at a time. Workers are sent
+        the board as encode_board's three integers, and share the best value
+        found so far, which they search with as alpha (beta for the min
+        player), reading it again before each reply to their root move. The
+        result is the same as minimax's: the best value and,
+        of the moves that have it, the first on the board.'''
+        if board.is_terminal() or depth == 0:
+            return self.minimax(self.alpha, self.beta, board, depth, player)
+
+        entry = self.table.probe(board.zobrist_hash) if self.table else None
+        table_move = entry.move if entry is not None else None
+        child_locations = self.order_moves(board, board.get_legal_moves(),
+                                           depth, 0, [table_move])
+        self.nodes += 1
+
+        best_move = child_locations[0]
+        token = board.apply_move(best_move)
+        best_value = self.minimax(self.alpha, self.beta, board, depth - 1,
+                                  -player, 1).heuristic
+        board.undo_move(token)
+
+        pool, shared_value, shared_order, lock = self._get_pool()
+        with lock:
+            shared_value.value = best_value
+            shared_order.value = _board_order(best_move, board.size)
+        encoding = encode_board(board)
+        bitboard = isinstance(board, BitboardGameBoard)
+        tasks = [(encoding, bitboard, location.row, location.column, depth,
+                  player)
+                 for location in child_locations[1:]]
+        for location, value, nodes, cutoffs in pool.imap_unordered(
+                _search_root_move, tasks):
+            self.nodes += nodes
+            self.cutoffs += cutoffs
+            if _improves(value, _board_order(location, board.size),
+                         best_value, _board_order(best_move, board.size),
+                         player):
+                best_value = value
+                best_move = location
+
+        return self.Board_Node(best_value, best_move)
+
+    def _get_pool(self):
+        if self._pool is None:
+            shared_value = multiprocessing.Value("d", 0.0, lock=False)
+            shared_order = multiprocessing.Value("q", 0, lock=False)
+            lock = multiprocessing.Lock()
+            pool = multiprocessing.Pool(
+                self.workers, _init_worker,
+                (self.heuristic, self.table_slots, shared_value, shared_order,
+                 lock))
+            self._pool = (pool, shared_value, shared_order, lock)
+        return self._pool
+
+    def close(self) -> None:
+        '''Shuts down the worker processes, if there are any.'''
+        if self._pool is not None:
+            self._pool[0].terminate()
+            self._pool[0].join()
+            self._pool = None
+
+    def iterative_deepening(self, board: GameBoard, player) -> Optional[Location]:
+        '''Searches 1 ply deep, then 2, and so on until time_limit_ms is up
+        or there are no more empty cells to look ahead through, and returns
+        the best move of the deepest search that finished. Each search tries
+        the best line of the one before it first. The 1-ply search always
+        finishes, so there is always a move if there is a legal one.'''
+        deadline = time.perf_counter() + self.time_limit_ms / 1000
+        max_depth = (board.size * board.size -
+                     board.pieces_placed[MAX_PLAYER] -
+                     board.pieces_placed[MIN_PLAYER])
+        move = None
+        self._best_line = []
+        self.completed_depth = 0
+        for depth in range(1, max_depth + 1):
+            self._deadline = deadline if depth > 1 else None
+            nodes = self.nodes
+            cutoffs = self.cutoffs
+            try:
+                minimax_result = self.minimax(self.alpha, self.beta, board, depth, player, on_line=True)
+            except _OutOfTime:
+                # the board was left partway through the search
+                break
+            finally:
+                self._deadline = None
+            move = minimax_result.parent_move
+            self._best_line = self._lines[0]
+            self.completed_depth = depth
+            self.record_search(depth, self.nodes - nodes,
+                               self.cutoffs - cutoffs)
+            if time.perf_counter() >= deadline:
+                break
+        return move
         
         
-    def minimax(self, alpha, beta, board: GameBoard, depth, player):
+    def minimax(self, alpha, beta, board: GameBoard, depth, player, ply=0, on_line=False):
         '''The minimax helper function that compares heuristic values and returns the best move found
-        for max player and min player respectively '''
+        for max player and min player respectively. on_line is whether the
+        moves so far follow the previous search's best line. '''
+
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _OutOfTime()
+        self.nodes += 1
+        self._lines[ply] = []
 
         #Check if game is over for player or max depth has been reached 
         if board.is_terminal() or depth == 0:
-            return self.Board_Node(heuristic(board), None)
+            return self.Board_Node(self.heuristic(board), None)
+
+        #Look the board up; the stored move is tried early, and the stored
+        #value is used outright if it was searched deep enough and is
+        #conclusive for this window (except at the root, which needs a move)
+        entry = self.table.probe(board.zobrist_hash) if self.table else None
+        table_move = None
+        if entry is not None:
+            if ply > 0 and entry.depth >= depth and (
+                    entry.bound == EXACT or
+                    (entry.bound == LOWER and entry.value >= beta) or
+                    (entry.bound == UPPER and entry.value <= alpha)):
+                self.nodes_saved[ply] = self.nodes_saved.get(ply, 0) + entry.nodes
+                return self.Board_Node(entry.value, entry.move)
+            table_move = entry.move
+        #The previous search's best line goes before anything else
+        line_move = None
+        if on_line and ply < len(self._best_line):
+            line_move = self._best_line[ply]
+        child_locations = self.order_moves(board, board.get_legal_moves(),
+                                           depth, ply, [line_move, table_move])
+        original_alpha = alpha
+        original_beta = beta
+        nodes_before = self.nodes
+
+        #One ply from the bottom, every child is just evaluated, so do them
+        #all in one batch call when the heuristic has one (bitboards have
+        #their own faster path in heuristic)
+        values = None
+        if (depth == 1 and self.batch_evaluation and
+                not isinstance(board, BitboardGameBoard)):
+            values = self.evaluate_children(board, child_locations)
+            self.nodes += len(child_locations)
 
         #Return best move for current board for a max player
         if player == 1:
-            max_value = -sys.maxsize
-            child_locations = board.get_legal_moves()
+            best_value = -sys.maxsize
             move = Location(1,1)
     
-            for child_location in child_locations:
-                child_board = board.make_move(child_location)
-                minimax_result = self.minimax(alpha, beta, child_board, depth - 1, -1 if player == 1 else 1)
-                value = minimax_result.heuristic
+            for i, child_location in enumerate(child_locations):
+                #In a worker, another root move may have raised the bound
+                #since this reply to a min root move started
+                if ply == 1 and i > 0 and self._root_bound is not None:
+                    beta = min(beta, self._root_bound())
+                    original_beta = beta
+                    if alpha >= beta:
+                        break
+                if values is not None:
+                    value = values[i]
+                else:
+                    #At the root a tie goes to the move first on the board,
+                    #so a move ahead of the best has to show if it ties
+                    child_alpha = alpha
+                    if (ply == 0 and i > 0 and
+                            _board_order(child_location, board.size) < _board_order(move, board.size)):
+                        child_alpha = math.nextafter(alpha, -math.inf)
+                    token = board.apply_move(child_location)
+                    minimax_result = self.minimax(child_alpha, beta, board, depth - 1, -1 if player == 1 else 1, ply + 1,
+                                                  child_location == line_move)
+                    board.undo_move(token)
+                    value = minimax_result.heuristic
 
-                if value > max_value:
-                    max_value = value
+                if value > best_value or (
+                        ply == 0 and value == best_value and
+                        _board_order(child_location, board.size) < _board_order(move, board.size)):
+                    best_value = value
                     move = child_location
+                    self._lines[ply] = [move] + (self._lines[ply + 1] if values is None else [])
                 
-                alpha = max_value
+                alpha = max(alpha, best_value)
                 
-                if alpha <= beta:
+                if alpha >= beta:
+                    self.record_cutoff(child_location, depth, ply)
                     break
 
-            return self.Board_Node(max_value, move)
-
         #Return best move for current board for a min player
         else:
-            min_value = sys.maxsize
-            child_locations = board.get_legal_moves()
+            best_value = sys.maxsize
             move = Location(1,1)
-            for child_location in child_locations:
-                child_board = board.make_move(child_location)
+            for i, child_location in enumerate(child_locations):
+                if ply == 1 and i > 0 and self._root_bound is not None:
+                    alpha = max(alpha, self._root_bound())
+                    original_alpha = alpha
+                    if alpha >= beta:
+                        break
+                if values is not None:
+                    value = values[i]
+                else:
+                    child_beta = beta
+                    if (ply == 0 and i > 0 and
+                            _board_order(child_location, board.size) < _board_order(move, board.size)):
+                        child_beta = math.nextafter(beta, math.inf)
+                    token = board.apply_move(child_location)
 
-                minimax_result = self.minimax(alpha, beta, child_board, depth - 1, -1 if player == 1 else 1)
-                value = minimax_result.heuristic
+                    minimax_result = self.minimax(alpha, child_beta, board, depth - 1, -1 if player == 1 else 1, ply + 1,
+                                                  child_location == line_move)
+                    board.undo_move(token)
+                    value = minimax_result.heuristic
 
-                if value <  min_value:
-                    min_value = value
+                if value <  best_value or (
+                        ply == 0 and value == best_value and
+                        _board_order(child_location, board.size) < _board_order(move, board.size)):
+                    best_value = value
                     move = child_location
-                beta = min_value
+                    self._lines[ply] = [move] + (self._lines[ply + 1] if values is None else [])
+                beta = min(beta, best_value)
                 
-                if alpha <= beta:
+                if alpha >= beta:
+                    self.record_cutoff(child_location, depth, ply)
                     break
-                    
 
-            return self.Board_Node(min_value, move)
\ No newline at end of file
+        if self.table is not None:
+            if best_value <= original_alpha:
+                bound = UPPER
+            elif best_value >= original_beta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.table.store(TableEntry(board.zobrist_hash, depth, bound,
+                                        best_value, move,
+                                        self.nodes - nodes_before + 1))
+
+        return self.Board_Node(best_value, move)
+
+
+def encode_board(board: GameBoard) -> tuple:
+    """The board as (size, red, yellow), where red and yellow are
+    bitboards as in BitboardGameBoard. Whose turn it is and the rest follow
+    from those."""
+    if isinstance(board, BitboardGameBoard):
+        return (board.size, board.red, board.yellow)
+    flat = board.grid.reshape(-1)
+    red = 0
+    for cell in np.flatnonzero(flat == RED):
+        red |= 1 << int(cell)
+    yellow = 0
+    for cell in np.flatnonzero(flat == YELLOW):
+        yellow |= 1 << int(cell)
+    return (board.size, red, yellow)
+
+
+def decode_board(encoding: tuple, bitboard: bool) -> GameBoard:
+    """The board encode_board gave encoding for, as a BitboardGameBoard or
+    a GameBoard."""
+    size, red, yellow = encoding
+    board = BitboardGameBoard.from_bitboards(size, red, yellow)
+    if bitboard:
+        return board
+    return GameBoard(size, board.grid, board.pieces_placed)
+
+
+def _board_order(location: Location, size) -> int:
+    """The location's cell number, as in GameBoard, which puts moves in board
+    (row by row) order. Ties between root moves go to the lower one."""
+    return location.row * (size + 2) + location.column
+
+
+def _improves(value, order, best_value, best_order, player) -> bool:
+    """Whether a root move with value and _board_order order beats the best
+    so far, going by value for player and then by board order."""
+    if value * player > best_value * player:
+        return True
+    return value == best_value and order < best_order
+
+
+# The worker process's player and the bound shared with the other workers
+_worker_player = None
+_worker_shared = None
+_worker_encoding = None
+
+
+def _init_worker(heuristic, table_slots, shared_value, shared_order, lock):
+    global _worker_player, _worker_shared
+    _worker_player = MinimaxPlayer(heuristic, 0, table_slots)
+    _worker_shared = (shared_value, shared_order, lock)
+
+
+def _read_bound(order, player):
+    """The best value any worker has found so far, as the bound to search
+    the root move with _board_order order with. A move ahead of the best
+    one on the board has to show whether it ties the best value (it would
+    win the tie), so its bound is a tiny bit looser than for a move behind
+    the best, which only has to show whether it beats it."""
+    shared_value, shared_order, lock = _worker_shared
+    with lock:
+        bound = shared_value.value
+        bound_order = shared_order.value
+    if order < bound_order:
+        bound = math.nextafter(bound, -player * math.inf)
+    return bound
+
+
+def _search_root_move(task):
+    """Searches one root move in a worker; see parallel_root_search.
+    Returns the move, its value and the nodes and cutoffs it took.
+
+    The shared bound is read at the start and again before each reply
+    after the first (see minimax), so a better move found by another
+    worker meanwhile narrows the rest of this search. Deeper nodes keep
+    the window they were given."""
+    global _worker_encoding
+    encoding, bitboard, row, column, depth, player = task
+    searcher = _worker_player
+    if encoding != _worker_encoding:
+        # a new root, so the killers by ply no longer apply
+        searcher._killers = {}
+        _worker_encoding = encoding
+    location = Location(row, column)
+    order = _board_order(location, encoding[0])
+    board = decode_board(encoding, bitboard)
+    board.apply_move(location)
+
+    bound = _read_bound(order, player)
+    if player == MAX_PLAYER:
+        alpha, beta = bound, searcher.beta
+    else:
+        alpha, beta = searcher.alpha, bound
+
+    nodes = searcher.nodes
+    cutoffs = searcher.cutoffs
+    searcher._root_bound = lambda: _read_bound(order, player)
+    try:
+        value = searcher.minimax(alpha, beta, board, depth - 1, -player,
+                                 1).heuristic
+    finally:
+        searcher._root_bound = None
+    shared_value, shared_order, lock = _worker_shared
+    with lock:
+        if _improves(value, order, shared_value.value, shared_order.value,
+                     player):
+            shared_value.value = value
+            shared_order.value = order
+    return (location, value, searcher.nodes - nodes,
+            searcher.cutoffs - cutoffs)
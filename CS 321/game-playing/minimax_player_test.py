@@ -0,0 +1,209 @@
+from game_board import GameBoard
+from bitboard_game_board import BitboardGameBoard
+from minimax_player import (
+    MinimaxPlayer, TableEntry, TranspositionTable, batch_heuristic, heuristic,
+    EXACT)
+import minimax_player
+import multiprocessing
+import numpy as np
+import random
+import types
+import pytest
+
+
+def random_positions(board_class, size, count, seed, max_moves=None):
+    """count positions from random games, after up to max_moves moves (by
+    default, anywhere up to the end of the game), none of them over."""
+    rng = random.Random(seed)
+    if max_moves is None:
+        max_moves = size * size
+    positions = []
+    while len(positions) < count:
+        board = board_class(size)
+        for _ in range(rng.randrange(max_moves)):
+            board = board.make_move(rng.choice(board.get_legal_moves()))
+            if board.is_terminal():
+                break
+        if not board.is_terminal():
+            positions.append(board)
+    return positions
+
+
+def plain_minimax(board, depth):
+    """Minimax without pruning, tables or move ordering. Returns the value
+    and the first move on the board with that value."""
+    if board.is_terminal() or depth == 0:
+        return heuristic(board), None
+    player = board.get_active_player()
+    best = None
+    for move in board.get_legal_moves():
+        value, _ = plain_minimax(board.make_move(move), depth - 1)
+        if best is None or value * player > best[0] * player:
+            best = (value, move)
+    return best
+
+
+@pytest.mark.parametrize("board_class", [GameBoard, BitboardGameBoard])
+@pytest.mark.parametrize("table_slots", [0, 7, 1 << 16])
+@pytest.mark.parametrize("depth", [2, 3])
+def test_same_as_plain_minimax(board_class, table_slots, depth):
+    # one player for all the positions, so the table, killers and history
+    # carry over from one search to the next
+    player = MinimaxPlayer(heuristic, depth, table_slots)
+    for board in random_positions(board_class, 5, 8, depth):
+        value, move = plain_minimax(BitboardGameBoard(
+            5, board.grid, board.pieces_placed), depth)
+        assert player.choose_move(board) == move
+        result = player.minimax(player.alpha, player.beta, board.copy(),
+                                depth, board.get_active_player())
+        assert result.heuristic == value
+        assert result.parent_move == move
+    assert player.get_stats()["cutoffs"] > 0
+
+
+@pytest.mark.parametrize("size", [4, 5, 7])
+def test_batch_heuristic(size):
+    boards = random_positions(GameBoard, size, 40, size)
+    players = [board.get_active_player() for board in boards]
+    stages = [board.in_second_stage() for board in boards]
+    assert len(set(players)) == 2 and len(set(stages)) == 2
+    values = batch_heuristic(np.stack([board.grid for board in boards]),
+                             players, stages)
+    assert values.tolist() == [heuristic(board) for board in boards]
+    for board in boards:
+        assert batch_heuristic(board.grid, board.get_active_player(),
+                               board.in_second_stage()) == heuristic(board)
+        # evaluate_children's single batch call, against one call per child
+        moves = board.get_legal_moves()
+        assert MinimaxPlayer(heuristic, 1).evaluate_children(board, moves) == \
+            [heuristic(board.make_move(move)) for move in moves]
+
+
+def entry(key, depth, value=0.0):
+    return TableEntry(key, depth, EXACT, value, None, 1)
+
+
+def test_table_replacement():
+    table = TranspositionTable(8)
+    table.store(entry(3, 4, 1.0))
+    # a shallower search of the same position keeps the deeper result
+    table.store(entry(3, 2, 2.0))
+    assert table.probe(3) == entry(3, 4, 1.0)
+    assert table._recent[3] == entry(3, 2, 2.0)
+    # one at least as deep replaces it
+    table.store(entry(3, 4, 3.0))
+    assert table.probe(3) == entry(3, 4, 3.0)
+    # a shallower position in the same slot only takes the recent entry
+    table.store(entry(11, 1))
+    assert table.probe(3) == entry(3, 4, 3.0)
+    assert table.probe(11) == entry(11, 1)
+    # a deeper one pushes the deep entry out to the recent one
+    table.store(entry(19, 5))
+    assert table.probe(19) == entry(19, 5)
+    assert table.probe(3) == entry(3, 4, 3.0)
+    assert table.probe(11) is None
+    assert table.probe(4) is None
+    assert (table.probes, table.hits) == (8, 6)
+    table.clear()
+    assert table.probe(19) is None
+
+
+def test_stats():
+    board = random_positions(BitboardGameBoard, 5, 1, 0, 4)[0]
+    player = MinimaxPlayer(heuristic, 4)
+    player.choose_move(board)
+    player.choose_move(board)
+    stats = player.get_stats()
+    assert stats["nodes"] > 0
+    assert 0 < stats["cutoffs"] < stats["nodes"]
+    assert 0 < stats["hits"] <= stats["probes"]
+    assert stats["hit_rate"] == stats["hits"] / stats["probes"]
+    # the second search of the same position is answered from the table
+    # below the root
+    assert stats["nodes_saved"][1] > 0
+    assert all(1 <= ply < 4 and saved > 0
+               for ply, saved in stats["nodes_saved"].items())
+    assert stats["last_search"]["depth"] == 4
+    assert stats["last_search"]["nodes"] < stats["nodes"] / 2
+    assert (stats["last_search"]["branching_factor"] ** 4 ==
+            pytest.approx(stats["last_search"]["nodes"]))
+
+    player = MinimaxPlayer(heuristic, 4, table_slots=0)
+    player.choose_move(board)
+    stats = player.get_stats()
+    assert (stats["probes"], stats["hits"], stats["hit_rate"]) == (0, 0, 0.0)
+    assert stats["nodes_saved"] == {}
+
+
+class TickingClock:
+    """Stands in for time.perf_counter: stopped until start is called, then
+    a millisecond later every time it is read."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.ticking = False
+
+    def start(self):
+        self.ticking = True
+
+    def perf_counter(self):
+        if self.ticking:
+            self.now += 0.001
+        return self.now
+
+
+@pytest.mark.parametrize("completed", [1, 2, 3])
+def test_iterative_deepening_out_of_time(monkeypatch, completed):
+    clock = TickingClock()
+    monkeypatch.setattr(minimax_player, "time",
+                        types.SimpleNamespace(perf_counter=clock.perf_counter))
+    # early positions, where the next depth takes well over 50 nodes
+    for board in random_positions(BitboardGameBoard, 5, 4, completed, 4):
+        player = MinimaxPlayer(heuristic, 0, time_limit_ms=50)
+        record_search = player.record_search
+
+        def record_and_start(depth, nodes, cutoffs):
+            # the search after this one runs out of time partway through
+            record_search(depth, nodes, cutoffs)
+            if depth == completed:
+                clock.start()
+
+        player.record_search = record_and_start
+        clock.now = 0.0
+        clock.ticking = False
+        move = player.choose_move(board)
+        assert player.completed_depth == completed
+        assert player.last_search["depth"] == completed
+        assert move == MinimaxPlayer(heuristic, completed).choose_move(board)
+
+
+def test_iterative_deepening_to_the_end():
+    board = random_positions(BitboardGameBoard, 4, 1, 4)[0]
+    while len(board.get_legal_moves()) > 5:
+        board = board.make_move(board.get_legal_moves()[0])
+    player = MinimaxPlayer(heuristic, 0, time_limit_ms=60000)
+    move = player.choose_move(board)
+    empty = 16 - sum(board.pieces_placed.values())
+    assert player.completed_depth == empty
+    assert move == plain_minimax(board, empty)[1]
+
+
+@pytest.mark.parametrize("board_class", [GameBoard, BitboardGameBoard])
+def test_parallel_same_as_serial(board_class):
+    serial = MinimaxPlayer(heuristic, 3)
+    parallel = MinimaxPlayer(heuristic, 3, workers=2)
+    try:
+        for board in random_positions(board_class, 5, 8, 25):
+            player = board.get_active_player()
+            assert parallel.choose_move(board) == serial.choose_move(board)
+            expected = serial.minimax(serial.alpha, serial.beta, board.copy(),
+                                      3, player)
+            result = parallel.parallel_root_search(board.copy(), 3, player)
+            assert result == expected
+        workers = multiprocessing.active_children()
+        assert len(workers) == 2
+    finally:
+        parallel.close()
+    assert parallel._pool is None
+    assert not any(worker.is_alive() for worker in workers)
+    assert multiprocessing.active_children() == []
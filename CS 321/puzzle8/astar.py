@@ -1,6 +1,11 @@
 import puzzle8 as p8
+import incremental
 import heapq
-from typing import List
+import itertools
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 
 def num_wrong_tiles(state) -> int:
@@ -37,41 +42,429 @@ def manhattan_distance(state) -> int:
     return manhattan_dist
     
 
+# both heuristics are sums of per-tile costs, so searches can update them one
+# move at a time (see incremental.py)
 
-def astar_search(state: int, heuristic) -> List[int]:
+num_wrong_tiles.tile_costs = incremental.wrong_tile_costs()
+manhattan_distance.tile_costs = incremental.manhattan_costs()
+
+
+# The two heuristics below read a state one row at a time: the three tiles
+# of row r are the base 9 digits (state // 729**r) % 729, so every table is
+# indexed by row and then by that 0-728 row key. The tables are built the
+# first time each heuristic is called.
+
+_ROW_POWERS = [1, 729, 729 ** 2]
+
+
+def _row_tiles(key) -> List[int]:
+    return [key % 9, (key // 9) % 9, key // 81]
+
+
+def _goal_squares() -> List[int]:
+    # goal square of each tile
+    where = [0] * 9
+    for square in range(9):
+        where[p8.get_tile(p8._goal, square)] = square
+    return where
+
+
+def _line_conflicts(goal_positions) -> int:
+    # goal_positions are the goal places (along the line) of the tiles that
+    # belong in this line, in the order they appear. Every tile that has to
+    # leave the line to let the others pass costs 2 extra moves, and the
+    # fewest that have to leave is everything outside the longest run that
+    # is already in order.
+    longest = [1] * len(goal_positions)
+    for i in range(len(goal_positions)):
+        for j in range(i):
+            if goal_positions[j] < goal_positions[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    return 2 * (len(goal_positions) - max(longest, default=0))
+
+
+@lru_cache(maxsize=None)
+def _linear_conflict_tables():
+    # rows[r][key]: Manhattan distance of the row's tiles, plus their row
+    # conflicts
+    # columns[r][key]: the row's tiles as digits of the three column keys
+    # (tile * 9**r), packed 10 bits per column so that adding them up over
+    # the rows gives all three column keys at once
+    # column_conflicts[c][key]: conflicts in column c, by column key
+    goal = _goal_squares()
+    rows = []
+    columns = []
+    for r in range(3):
+        row_costs = []
+        column_parts = []
+        for key in range(729):
+            tiles = _row_tiles(key)
+            cost = 0
+            packed = 0
+            for c, tile in enumerate(tiles):
+                packed += (tile * 9 ** r) << (10 * c)
+                if tile:
+                    goal_r, goal_c = divmod(goal[tile], 3)
+                    cost += abs(goal_r - r) + abs(goal_c - c)
+            cost += _line_conflicts([goal[tile] % 3 for tile in tiles
+                                     if tile and goal[tile] // 3 == r])
+            row_costs.append(cost)
+            column_parts.append(packed)
+        rows.append(row_costs)
+        columns.append(column_parts)
+
+    column_conflicts = []
+    for c in range(3):
+        column_conflicts.append([
+            _line_conflicts([goal[tile] // 3 for tile in _row_tiles(key)
+                             if tile and goal[tile] % 3 == c])
+            for key in range(729)])
+    return rows, columns, column_conflicts
+
+
+def linear_conflict(state) -> int:
+
+    # Manhattan distance, plus 2 moves for each tile that has to step out of
+    # its goal row or column so that another tile in that line can get past
+    # it (only the fewest such tiles are counted, so it stays admissible)
+
+    rows, columns, column_conflicts = _linear_conflict_tables()
+    keys = [(state // power) % 729 for power in _ROW_POWERS]
+    packed = columns[0][keys[0]] + columns[1][keys[1]] + columns[2][keys[2]]
+    return (rows[0][keys[0]] + rows[1][keys[1]] + rows[2][keys[2]]
+            + column_conflicts[0][packed & 1023]
+            + column_conflicts[1][(packed >> 10) & 1023]
+            + column_conflicts[2][packed >> 20])
+
+
+# Walking distance looks at the rows (and, separately, the columns) as
+# bags of tiles: how many tiles in each row belong in each goal row, and
+# which row the blank is in. Every move swaps the blank with a tile from the
+# row above or below it, so a breadth first search over those counts gives
+# the fewest vertical moves needed to get every tile into its goal row, and
+# the same goes for columns and horizontal moves. A count table is keyed by
+# its nine counts as base 4 digits (line * 3 + goal line), plus the blank's
+# line times 4**9.
+
+_BLANK_DIGIT = 4 ** 9
+
+
+def _walking_distances(goal_key: int) -> Dict[int, int]:
+    # breadth first search over count tables, outward from the goal's
+    distances = {goal_key: 0}
+    deck = deque([goal_key])
+    while deck:
+        key = deck.popleft()
+        blank = key // _BLANK_DIGIT
+        for line in (blank - 1, blank + 1):
+            if not 0 <= line < 3:
+                continue
+            for goal_line in range(3):
+                # a tile that belongs in goal_line moves from line to the
+                # blank's line, and the blank moves the other way
+                if (key // 4 ** (line * 3 + goal_line)) % 4 == 0:
+                    continue
+                dest = (key - 4 ** (line * 3 + goal_line)
+                        + 4 ** (blank * 3 + goal_line)
+                        + (line - blank) * _BLANK_DIGIT)
+                if dest not in distances:
+                    distances[dest] = distances[key] + 1
+                    deck.append(dest)
+    return distances
+
+
+@lru_cache(maxsize=None)
+def _walking_distance_tables():
+    # vertical[r][key], horizontal[r][key]: what the row's tiles (and the
+    # blank, if it's there) add to the vertical and horizontal count keys
+    goal = _goal_squares()
+    vertical = []
+    horizontal = []
+    for r in range(3):
+        vertical_parts = []
+        horizontal_parts = []
+        for key in range(729):
+            v = 0
+            h = 0
+            for c, tile in enumerate(_row_tiles(key)):
+                if tile:
+                    goal_r, goal_c = divmod(goal[tile], 3)
+                    v += 4 ** (r * 3 + goal_r)
+                    h += 4 ** (c * 3 + goal_c)
+                else:
+                    v += r * _BLANK_DIGIT
+                    h += c * _BLANK_DIGIT
+            vertical_parts.append(v)
+            horizontal_parts.append(h)
+        vertical.append(vertical_parts)
+        horizontal.append(horizontal_parts)
+
+    goal_keys = [(p8._goal // power) % 729 for power in _ROW_POWERS]
+    vertical_distances = _walking_distances(
+        sum(vertical[r][goal_keys[r]] for r in range(3)))
+    horizontal_distances = _walking_distances(
+        sum(horizontal[r][goal_keys[r]] for r in range(3)))
+    return vertical, horizontal, vertical_distances, horizontal_distances
+
+
+def walking_distance(state) -> int:
+
+    # fewest vertical moves to get every tile into its goal row, plus fewest
+    # horizontal moves to get every tile into its goal column (see above)
+
+    vertical, horizontal, vertical_distances, horizontal_distances = \
+        _walking_distance_tables()
+    keys = [(state // power) % 729 for power in _ROW_POWERS]
+    return (vertical_distances[vertical[0][keys[0]] + vertical[1][keys[1]]
+                               + vertical[2][keys[2]]]
+            + horizontal_distances[horizontal[0][keys[0]]
+                                   + horizontal[1][keys[1]]
+                                   + horizontal[2][keys[2]]])
+
+
+def astar_search(state: int, heuristic, puzzle=p8, stats=None) -> List[int]:
 
     # using heap property (and heappop) navigate to the goal state
-  
-    heap = []
-    cost = 0
-    currState = state
-    path = []
-    heapq.heappush(heap,(cost,currState,path))
+    # puzzle can be puzzle8 or anything with the same functions (see
+    # npuzzle), as long as the heuristic understands its states
+
+    # best_g holds the cheapest known cost to every state reached so far, and
+    # parents holds the state it was reached from, so paths are only built
+    # once at the end
+    # heap entries are (f, h, order, state): ties on f go to the lower h
+    # (closer to the goal), then to the older entry
+    # entries beaten by a cheaper path are left in the heap and skipped when
+    # popped (lazy deletion)
+    # if a stats dict is given, the number of nodes pushed, popped, expanded
+    # and re-expanded is stored in it
+    # heuristics with a tile_costs table are only evaluated once, for the
+    # start state; successors are scored from the change in one tile
+
+    goal = puzzle.solution()
+    best_g = {state: 0}
+    parents = {state: None}
+    closed = set()
+    order = itertools.count()
+    tile_costs = incremental.heuristic_costs(heuristic, puzzle)
+
+    if tile_costs is not None:
+        h = incremental.evaluate(state, tile_costs, puzzle)
+    else:
+        h = heuristic(state)
+    heap = [(h, h, next(order), state)]
+    pushed = 1
+    popped = 0
+    expanded = 0
+    reexpanded = 0
+    solution = None
+
     while heap:
 
-        cost, currState, path = heapq.heappop(heap)
+        f, h, _, currState = heapq.heappop(heap)
+        popped += 1
+        cost = f - h
 
-        # setup for processing + solution catch
+        # stale entry, a cheaper path to this state was found after it was
+        # pushed
 
-        blank_square = p8.blank_square(currState)
-        blanksNeighbors = p8.neighbors(blank_square)
+        if cost > best_g[currState]:
+            continue
 
         # solution catch
 
-        if currState == p8._goal:
-            solution = []
-            for state in path[:-1]:
-                solution.append(p8.blank_square(state))
-            solution.append(blank_square)
-            return solution
+        if currState == goal:
+            solution = _path_to(currState, parents, puzzle)
+            break
+
+        # a closed state only comes back if a cheaper path to it turned up,
+        # which can happen with an inconsistent heuristic
+
+        if currState in closed:
+            reexpanded += 1
+        closed.add(currState)
+        expanded += 1
 
         # neighbor processing
 
-        for neighbors in blanksNeighbors:
-            dest = p8.move_blank(currState,neighbors)
-            total_cost = cost + 1
-            pathCost = total_cost + heuristic(dest)
-            new_path = path + [dest]
-            heapq.heappush(heap,(pathCost,dest,new_path))
-        
-    return None
+        total_cost = cost + 1
+        blank_square = puzzle.blank_square(currState)
+        for neighbors in puzzle.neighbors(blank_square):
+            if tile_costs is not None:
+                dest, delta = incremental.move_blank_with_delta(
+                    currState, blank_square, neighbors, tile_costs, puzzle)
+            else:
+                dest = puzzle.move_blank(currState,neighbors)
+            if dest in best_g and best_g[dest] <= total_cost:
+                continue
+            best_g[dest] = total_cost
+            parents[dest] = currState
+            if tile_costs is not None:
+                dest_h = h + delta
+            else:
+                dest_h = heuristic(dest)
+            heapq.heappush(heap,(total_cost + dest_h,dest_h,next(order),dest))
+            pushed += 1
+
+    if stats is not None:
+        stats["pushed"] = pushed
+        stats["popped"] = popped
+        stats["expanded"] = expanded
+        stats["reexpanded"] = reexpanded
+    return solution
+
+
+def anytime_astar_search(state: int, heuristic, time_limit=None,
+                         max_nodes=None, callback=None, initial_weight=3.0,
+                         weight_step=0.5, puzzle=p8,
+                         stats=None) -> Optional[List[int]]:
+
+    # anytime repairing A* (ARA*): starts as weighted A*, ordering the heap by
+    # g + weight * h, which finds a (possibly longer) solution quickly
+    # the weight then steps down towards 1, and each pass reuses the g
+    # values and parent pointers of the last one, only re-expanding states
+    # whose cost went down (kept in incons), until the solution is proven
+    # optimal or the time limit (seconds) or node budget runs out
+    # every better solution is passed to callback(solution, bound), where
+    # bound is how many times longer than optimal it can be at most
+    # returns the best solution found, or None if there wasn't time for one
+    # if a stats dict is given, the number of nodes expanded, passes made and
+    # the final bound are stored in it
+
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    goal = puzzle.solution()
+    tile_costs = incremental.heuristic_costs(heuristic, puzzle)
+
+    best_g = {state: 0}
+    parents = {state: None}
+    h_values = {}
+    if tile_costs is not None:
+        h_values[state] = incremental.evaluate(state, tile_costs, puzzle)
+    else:
+        h_values[state] = heuristic(state)
+
+    weight = max(initial_weight, 1.0)
+    order = itertools.count()
+    open_states = {state}
+    closed = set()
+    incons = set()
+    heap = [(weight * h_values[state], h_values[state], next(order), state)]
+    expanded = 0
+    passes = 0
+    solution = None
+    bound = None
+
+    def out_of_budget():
+        if max_nodes is not None and expanded >= max_nodes:
+            return True
+        return deadline is not None and time.monotonic() >= deadline
+
+    while True:
+
+        # improve the path with the current weight: expand until nothing in
+        # the heap could lead to a cheaper goal than the one already found
+
+        exhausted = False
+        while heap:
+            f, h, _, currState = heap[0]
+            if currState not in open_states or \
+                    f != best_g[currState] + weight * h:
+                heapq.heappop(heap)
+                continue
+            if goal in best_g and f >= best_g[goal]:
+                break
+            if out_of_budget():
+                exhausted = True
+                break
+
+            heapq.heappop(heap)
+            open_states.discard(currState)
+            closed.add(currState)
+            expanded += 1
+
+            total_cost = best_g[currState] + 1
+            blank_square = puzzle.blank_square(currState)
+            for neighbors in puzzle.neighbors(blank_square):
+                if tile_costs is not None:
+                    dest, delta = incremental.move_blank_with_delta(
+                        currState, blank_square, neighbors, tile_costs,
+                        puzzle)
+                else:
+                    dest = puzzle.move_blank(currState,neighbors)
+                if dest in best_g and best_g[dest] <= total_cost:
+                    continue
+                best_g[dest] = total_cost
+                parents[dest] = currState
+                if dest not in h_values:
+                    if tile_costs is not None:
+                        h_values[dest] = h + delta
+                    else:
+                        h_values[dest] = heuristic(dest)
+
+                # states already expanded in this pass wait for the next one
+                if dest in closed:
+                    incons.add(dest)
+                else:
+                    open_states.add(dest)
+                    dest_h = h_values[dest]
+                    heapq.heappush(heap, (total_cost + weight * dest_h,
+                                          dest_h, next(order), dest))
+
+        passes += 1
+        if goal not in best_g:
+            break
+
+        # the optimal cost is at least the smallest g + h of anything still
+        # waiting, which bounds how far off this solution can be
+        # only a finished pass also guarantees it is within weight of optimal,
+        # but a goal reached in a pass the budget cut short is still reported
+
+        waiting = [best_g[s] + h_values[s] for s in open_states | incons]
+        lower = min(waiting) if waiting else best_g[goal]
+        if lower >= best_g[goal]:
+            new_bound = 1.0
+        elif lower > 0:
+            new_bound = max(1.0, best_g[goal] / lower)
+            if not exhausted:
+                new_bound = min(weight, new_bound)
+        else:
+            new_bound = weight if not exhausted else float("inf")
+
+        if solution is None or len(solution) > best_g[goal] or \
+                new_bound < bound:
+            solution = _path_to(goal, parents, puzzle)
+            bound = new_bound
+            if callback is not None:
+                callback(solution, bound)
+
+        if exhausted or bound <= 1.0 or weight <= 1.0:
+            break
+
+        # next pass: lower the weight and put everything that is waiting back
+        # in the heap with the new priorities
+
+        weight = max(1.0, weight - weight_step)
+        open_states |= incons
+        incons = set()
+        closed = set()
+        heap = [(best_g[s] + weight * h_values[s], h_values[s], next(order), s)
+                for s in open_states]
+        heapq.heapify(heap)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["passes"] = passes
+        stats["bound"] = bound
+    return solution
+
+
+def _path_to(state, parents, puzzle) -> List[int]:
+
+    # walk the parent pointers back to the start, recording where the blank
+    # is at each step
+
+    solution = []
+    while parents[state] is not None:
+        solution.append(puzzle.blank_square(state))
+        state = parents[state]
+    solution.reverse()
+    return solution
@@ -4,6 +4,7 @@ import pytest
 import random
 import itertools
 import time
+from functools import reduce
 
 off_two_puzzle = p8.state([3, 4, 5, 2, 0, 6, 1, 8, 7])
 
@@ -44,7 +45,8 @@ states_and_shortest_lengths = [
     (108306836, 16),
 ]
 
-heuristics = [astar.num_wrong_tiles, astar.manhattan_distance]
+heuristics = [astar.num_wrong_tiles, astar.manhattan_distance,
+              astar.linear_conflict, astar.walking_distance]
 
 puzzles_and_heuristics = list(itertools.product(states_and_shortest_lengths,
                                                 heuristics))
@@ -63,3 +65,135 @@ def test_astar(test_input_pair, heuristic):
     print("Time to run =", time_after-time_before)
     assert soln_path is not None
     assert len(soln_path) == expected
+
+
+@pytest.mark.parametrize("heuristic", heuristics,
+                         ids=[h.__name__ for h in heuristics])
+def test_astar_stats(heuristic):
+    stats = {}
+    soln_path = astar.astar_search(108306836, heuristic, stats=stats)
+    assert len(soln_path) == 16
+    assert stats["popped"] <= stats["pushed"]
+    assert stats["expanded"] <= stats["popped"]
+    # both heuristics are consistent, so nothing is expanded twice
+    assert stats["reexpanded"] == 0
+
+
+def test_astar_already_solved():
+    assert astar.astar_search(p8.solution(), astar.manhattan_distance) == []
+
+
+def test_astar_reexpands_with_inconsistent_heuristic():
+    # an admissible but inconsistent heuristic can make A* find a cheaper
+    # path to a state it has already expanded
+    def inconsistent(state):
+        return astar.manhattan_distance(state) if state % 7 else 0
+
+    stats = {}
+    soln_path = astar.astar_search(300501380, inconsistent, stats=stats)
+    assert len(soln_path) == 12
+    assert stats["reexpanded"] > 0
+
+
+def test_linear_conflict():
+    assert astar.linear_conflict(p8.solution()) == 0
+    # 2 and 1 swapped in the top row, one of them has to step aside
+    swapped = p8.state([2, 1, 3, 8, 0, 4, 7, 6, 5])
+    assert astar.linear_conflict(swapped) == \
+        astar.manhattan_distance(swapped) + 2
+    random.seed(12345)
+    for _ in range(100):
+        state = p8.random_state(30)
+        assert astar.linear_conflict(state) >= astar.manhattan_distance(state)
+
+
+def test_walking_distance():
+    random.seed(12345)
+    assert astar.walking_distance(p8.solution()) == 0
+    assert astar.walking_distance(p8.random_state(1)) == 1
+    # 8 and 3 have to trade rows, and the blank has to go back and forth
+    # between the rows to carry each of them
+    state = p8.state([1, 2, 8, 4, 0, 3, 7, 6, 5])
+    assert astar.manhattan_distance(state) == 6
+    assert astar.walking_distance(state) == 8
+
+
+@pytest.mark.parametrize("heuristic", [astar.linear_conflict,
+                                       astar.walking_distance],
+                         ids=["linear_conflict", "walking_distance"])
+def test_stronger_heuristics_expand_fewer(heuristic):
+    manhattan = 0
+    stronger = 0
+    for state, expected in states_and_shortest_lengths:
+        stats = {}
+        astar.astar_search(state, astar.manhattan_distance, stats=stats)
+        manhattan += stats["expanded"]
+        assert heuristic(state) <= expected
+        stats = {}
+        astar.astar_search(state, heuristic, stats=stats)
+        stronger += stats["expanded"]
+    assert stronger < manhattan
+
+
+@pytest.mark.parametrize("test_input_pair", states_and_shortest_lengths,
+                         ids=[str(state) for (state, _)
+                              in states_and_shortest_lengths])
+def test_anytime_astar_reaches_optimal(test_input_pair):
+    (test_input, expected) = test_input_pair
+    reported = []
+    stats = {}
+    soln_path = astar.anytime_astar_search(
+        test_input, astar.manhattan_distance,
+        callback=lambda solution, bound: reported.append((solution, bound)),
+        stats=stats)
+    assert len(soln_path) == expected
+    assert stats["bound"] == 1.0
+    assert reported[-1] == (soln_path, 1.0)
+
+
+def test_anytime_astar_improves():
+    random.seed(12345)
+    state = p8.random_state(200)
+    optimal = len(astar.astar_search(state, astar.manhattan_distance))
+    reported = []
+    soln_path = astar.anytime_astar_search(
+        state, astar.manhattan_distance, initial_weight=5, weight_step=1,
+        callback=lambda solution, bound: reported.append((solution, bound)))
+    assert len(soln_path) == optimal
+    for (solution, bound), (better, tighter) in zip(reported, reported[1:]):
+        assert len(better) <= len(solution)
+        assert tighter <= bound
+    for solution, bound in reported:
+        assert len(solution) <= bound * optimal
+
+
+def test_anytime_astar_budget():
+    random.seed(12345)
+    state = p8.random_state(200)
+    assert astar.anytime_astar_search(state, astar.manhattan_distance,
+                                      max_nodes=3) is None
+    soln_path = astar.anytime_astar_search(state, astar.manhattan_distance,
+                                           time_limit=10, max_nodes=2000)
+    assert soln_path is not None
+
+
+def test_anytime_astar_budget_keeps_last_improvement():
+    # the budget runs out partway through the pass that finds a 22 move
+    # path; that path is still reported and returned
+    random.seed(12345)
+    state = p8.random_state(200)
+    reported = []
+    soln_path = astar.anytime_astar_search(
+        state, astar.manhattan_distance, max_nodes=640,
+        callback=lambda solution, bound: reported.append((solution, bound)))
+    assert len(soln_path) == 22
+    assert reported[-1][0] == soln_path
+    assert reduce(p8.move_blank, soln_path, state) == p8.solution()
+
+
+def test_anytime_astar_already_solved():
+    reported = []
+    assert astar.anytime_astar_search(
+        p8.solution(), astar.manhattan_distance,
+        callback=lambda solution, bound: reported.append(bound)) == []
+    assert reported == [1.0]
@@ -0,0 +1,130 @@
+'''
+    batch_heuristics.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    NumPy versions of the astar heuristics that score a whole array of
+    puzzle8 states at once, and an A* search that uses them to score all the
+    successors of a chunk of the frontier in one call.
+'''
+
+import heapq
+from typing import List, Optional
+import numpy as np
+import puzzle8 as p8
+
+# 9 to the power of each square, for pulling the tiles out of a state
+_POWERS = np.array([9 ** i for i in range(9)], dtype=np.int64)
+
+_SQUARE_X = np.array([p8.xy_location(i)[0] for i in range(9)])
+_SQUARE_Y = np.array([p8.xy_location(i)[1] for i in range(9)])
+
+# Goal square coordinates of each tile (the blank's are never used)
+_GOAL_TILES = np.array([p8.get_tile(p8._goal, i) for i in range(9)])
+_GOAL_X = np.zeros(9, dtype=np.int64)
+_GOAL_Y = np.zeros(9, dtype=np.int64)
+_GOAL_X[_GOAL_TILES] = _SQUARE_X
+_GOAL_Y[_GOAL_TILES] = _SQUARE_Y
+
+
+def decode(states) -> np.ndarray:
+    '''Returns an array with one row per state, holding the tile in each of
+    the nine squares.'''
+    states = np.asarray(states, dtype=np.int64)
+    return (states[:, np.newaxis] // _POWERS) % 9
+
+
+def manhattan_distances(states) -> np.ndarray:
+    '''astar.manhattan_distance for every state in the array.'''
+    return _manhattan(decode(states))
+
+
+def num_wrong_tiles(states) -> np.ndarray:
+    '''astar.num_wrong_tiles for every state in the array.'''
+    return _wrong(decode(states))
+
+
+def heuristics(states):
+    '''Returns (manhattan distances, numbers of wrong tiles) for every state
+    in the array, decoding the states only once.'''
+    tiles = decode(states)
+    return _manhattan(tiles), _wrong(tiles)
+
+
+def _manhattan(tiles: np.ndarray) -> np.ndarray:
+    distances = (np.abs(_GOAL_X[tiles] - _SQUARE_X)
+                 + np.abs(_GOAL_Y[tiles] - _SQUARE_Y))
+    return np.where(tiles != 0, distances, 0).sum(axis=1)
+
+
+def _wrong(tiles: np.ndarray) -> np.ndarray:
+    return ((tiles != 0) & (tiles != _GOAL_TILES)).sum(axis=1)
+
+
+def batch_astar_search(state: int, heuristic=manhattan_distances,
+                       chunk_size: int = 64,
+                       stats=None) -> Optional[List[int]]:
+    '''A* search that pops up to chunk_size of the best frontier states at a
+    time and scores all of their successors with one call to heuristic,
+    which takes and returns arrays (e.g. manhattan_distances). Returns the
+    squares the blank moves to, like astar.astar_search. If a stats dict is
+    given, the number of nodes expanded is stored in it.'''
+    best_g = {state: 0}
+    parents = {state: None}
+    h = int(heuristic([state])[0])
+    heap = [(h, h, state)]
+    expanded = 0
+
+    while heap:
+        # Gather the chunk. The goal is only accepted when it comes off the
+        # heap before anything else in the chunk; otherwise the nodes ahead of
+        # it are expanded first, since they might lead to a cheaper path.
+        chunk = []
+        while heap and len(chunk) < chunk_size:
+            f, h, currState = heapq.heappop(heap)
+            if f - h > best_g[currState]:
+                # stale entry, the state was reached more cheaply since
+                continue
+            if currState == p8._goal:
+                if not chunk:
+                    if stats is not None:
+                        stats["expanded"] = expanded
+                    return _path_to(currState, parents)
+                heapq.heappush(heap, (f, h, currState))
+                break
+            chunk.append(currState)
+
+        successors = []
+        costs = []
+        for currState in chunk:
+            expanded += 1
+            g = best_g[currState] + 1
+            for square in p8.neighbors(p8.blank_square(currState)):
+                dest = p8.move_blank(currState, square)
+                if dest in best_g and best_g[dest] <= g:
+                    continue
+                best_g[dest] = g
+                parents[dest] = currState
+                successors.append(dest)
+                costs.append(g)
+
+        if successors:
+            scores = heuristic(successors).tolist()
+            for dest, g, h in zip(successors, costs, scores):
+                # a state can show up twice in one chunk; only the cheapest
+                # (the one still in best_g) is worth pushing
+                if best_g[dest] == g:
+                    heapq.heappush(heap, (g + h, h, dest))
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    return None
+
+
+def _path_to(state, parents) -> List[int]:
+    solution = []
+    while parents[state] is not None:
+        solution.append(p8.blank_square(state))
+        state = parents[state]
+    solution.reverse()
+    return solution
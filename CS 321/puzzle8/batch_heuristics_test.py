@@ -0,0 +1,47 @@
+import puzzle8 as p8
+import astar
+import batch_heuristics
+import pytest
+import random
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+
+def test_decode():
+    tiles = batch_heuristics.decode([p8.solution()])
+    assert tiles.tolist() == [[1, 2, 3, 8, 0, 4, 7, 6, 5]]
+
+
+def test_matches_astar_heuristics():
+    random.seed(12345)
+    states = [p8.random_state(40) for _ in range(200)]
+    manhattan, wrong = batch_heuristics.heuristics(states)
+    assert manhattan.tolist() == [astar.manhattan_distance(s) for s in states]
+    assert wrong.tolist() == [astar.num_wrong_tiles(s) for s in states]
+    assert (batch_heuristics.manhattan_distances(states) == manhattan).all()
+    assert (batch_heuristics.num_wrong_tiles(states) == wrong).all()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 256])
+@pytest.mark.parametrize("test_input,expected", states_and_shortest_lengths)
+def test_batch_astar(test_input, expected, chunk_size):
+    soln_path = batch_heuristics.batch_astar_search(
+        test_input, chunk_size=chunk_size)
+    assert soln_path is not None
+    assert len(soln_path) == expected
+
+    state = test_input
+    for square in soln_path:
+        state = p8.move_blank(state, square)
+    assert state == p8.solution()
+
+
+def test_batch_astar_already_solved():
+    assert batch_heuristics.batch_astar_search(p8.solution()) == []
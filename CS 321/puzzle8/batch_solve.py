@@ -0,0 +1,243 @@
+'''
+    batch_solve.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Solves a large batch of 8-puzzles across a pool of worker processes.
+    States are read from a file (one per line, as puzzle8 integers) or
+    generated with puzzle8.random_state. Results are written one line per
+    solve, as soon as each chunk finishes, and a summary of throughput and
+    p50/p95/p99 latency per solver is printed at the end. For example:
+
+        python batch_solve.py --random 1000 --solvers astar-manhattan,ida
+        python batch_solve.py --input states.txt --workers 8
+'''
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+import puzzle8 as p8
+import astar
+import bfs
+import distance_table
+import itdeep
+import smastar
+import solve_cache
+import tracked8
+
+
+def _tracked(solver, **kwargs):
+    '''Wraps a search so that it takes a puzzle8 state but runs on the
+    tracked8 encoding, which finds the blank without scanning.'''
+    def solve(state, stats=None):
+        return solver(tracked8.from_state(state), puzzle=tracked8,
+                      stats=stats, **kwargs)
+    return solve
+
+
+def _on_tracked(heuristic):
+    '''Wraps a heuristic that reads puzzle8 states so that it takes tracked8
+    states instead.'''
+    def evaluate(tracked):
+        return heuristic(tracked8.to_state(tracked))
+    return evaluate
+
+
+SOLVERS = {
+    "bfs": _tracked(bfs.breadth_first_search),
+    "bidirectional": _tracked(bfs.breadth_first_search, bidirectional=True),
+    "astar-manhattan": _tracked(astar.astar_search,
+                                heuristic=astar.manhattan_distance),
+    "astar-wrong-tiles": _tracked(astar.astar_search,
+                                  heuristic=astar.num_wrong_tiles),
+    "astar-linear-conflict": _tracked(
+        astar.astar_search,
+        heuristic=_on_tracked(astar.linear_conflict)),
+    "astar-walking-distance": _tracked(
+        astar.astar_search,
+        heuristic=_on_tracked(astar.walking_distance)),
+    "itdeep": _tracked(itdeep.iterative_deepening_search),
+    "ida": _tracked(itdeep.ida_star_search,
+                    heuristic=astar.manhattan_distance),
+    "sma-manhattan": _tracked(smastar.sma_star_search,
+                              heuristic=astar.manhattan_distance,
+                              max_nodes=1000),
+    "table": distance_table.table_search,
+}
+
+# Each worker process keeps its own cache
+SOLVERS["astar-cached"] = solve_cache.SolveCache(SOLVERS["astar-manhattan"])
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """ Parse command line arguments.
+    """
+    p = argparse.ArgumentParser()
+
+    source = p.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", type=str, help=(
+        "File with one state per line (\"-\" for standard input)."))
+    source.add_argument("--random", type=int, help=(
+        "Number of random states to generate with puzzle8.random_state."))
+
+    p.add_argument("--moves", type=int, default=100, help=(
+        "Only relevant with --random; number of random moves used to make"
+        " each state. Default=100."))
+
+    p.add_argument("--seed", type=int, default=0, help=(
+        "Only relevant with --random. Each chunk seeds its own generator"
+        " from this and the chunk number, so the states don't depend on"
+        " which worker makes them. Default=0."))
+
+    p.add_argument("--solvers", type=str, default="astar-manhattan", help=(
+        "Comma separated solvers to run on every state, out of "
+        + ", ".join(SOLVERS) + ". Default=astar-manhattan."))
+
+    p.add_argument("--workers", type=int, default=None, help=(
+        "Number of worker processes. Defaults to the number of CPUs."))
+
+    p.add_argument("--chunk_size", type=int, default=32, help=(
+        "Number of states sent to a worker at a time. Default=32."))
+
+    p.add_argument("--output", type=str, default=None, help=(
+        "File to write results to, one JSON object per line. Defaults to"
+        " standard output."))
+
+    args = p.parse_args(argv)
+    for name in args.solvers.split(","):
+        if name not in SOLVERS:
+            p.error("unknown solver: " + name)
+    return args
+
+
+def read_states(path: str) -> List[int]:
+    '''Reads one state per line, skipping blank lines.'''
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        return [int(line) for line in f if line.strip()]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def chunk_seed(seed: int, chunk: int) -> int:
+    '''Seed used to generate the states of the given chunk.'''
+    return seed * 1000003 + chunk
+
+
+def solve_chunk(task) -> List[Dict]:
+    '''Runs in a worker. task is (chunk number, first index, states or a
+    (count, moves, seed) triple to generate them from, solver names).'''
+    chunk, first, states, solvers = task
+    if isinstance(states, tuple):
+        count, moves, seed = states
+        random.seed(chunk_seed(seed, chunk))
+        states = [p8.random_state(moves) for _ in range(count)]
+
+    results = []
+    for offset, state in enumerate(states):
+        for name in solvers:
+            time_before = time.perf_counter()
+            solution = SOLVERS[name](state)
+            seconds = time.perf_counter() - time_before
+            results.append({
+                "index": first + offset,
+                "state": state,
+                "solver": name,
+                "length": None if solution is None else len(solution),
+                "solution": solution,
+                "seconds": seconds,
+            })
+    return results
+
+
+def make_tasks(args) -> List:
+    solvers = args.solvers.split(",")
+    tasks = []
+    if args.input is not None:
+        states = read_states(args.input)
+        for chunk, first in enumerate(range(0, len(states), args.chunk_size)):
+            tasks.append((chunk, first,
+                          states[first:first + args.chunk_size], solvers))
+    else:
+        for chunk, first in enumerate(range(0, args.random, args.chunk_size)):
+            count = min(args.chunk_size, args.random - first)
+            tasks.append((chunk, first, (count, args.moves, args.seed),
+                          solvers))
+    return tasks
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    '''Nearest-rank percentile of values (p from 0 to 100).'''
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: Dict[str, List[float]], wall_seconds: float,
+              out) -> None:
+    '''Prints throughput and latency percentiles for every solver.'''
+    print(f"{'solver':<24}{'solves':>8}{'per sec':>10}{'p50 ms':>10}"
+          f"{'p95 ms':>10}{'p99 ms':>10}", file=out)
+    for name, values in latencies.items():
+        if not values:
+            continue
+        print(f"{name:<24}{len(values):>8}"
+              f"{len(values) / wall_seconds:>10.1f}"
+              f"{percentile(values, 50) * 1000:>10.2f}"
+              f"{percentile(values, 95) * 1000:>10.2f}"
+              f"{percentile(values, 99) * 1000:>10.2f}", file=out)
+
+
+def pool_context():
+    '''Start method for the workers: fork where there is one, so workers
+    start with the parent's SOLVERS and its loaded distance table rather
+    than importing them afresh.'''
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    tasks = make_tasks(args)
+    latencies: Dict[str, List[float]] = {
+        name: [] for name in args.solvers.split(",")}
+
+    if "table" in latencies:
+        # built (if need be) once here, rather than by every worker at once
+        distance_table.default_table()
+
+    out = sys.stdout if args.output is None else open(args.output, "w")
+    time_before = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(args.workers,
+                                 mp_context=pool_context()) as pool:
+            futures = [pool.submit(solve_chunk, task) for task in tasks]
+            # chunks come back in whatever order they finish
+            for future in as_completed(futures):
+                for result in future.result():
+                    latencies[result["solver"]].append(result["seconds"])
+                    print(json.dumps(result), file=out, flush=True)
+    except BrokenProcessPool as error:
+        raise RuntimeError("A worker process died before finishing its"
+                           " chunk") from error
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    wall_seconds = time.perf_counter() - time_before
+
+    summarize(latencies, wall_seconds, sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import batch_solve
+import json
+import multiprocessing
+import os
+import pytest
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert batch_solve.percentile(values, 50) == 50
+    assert batch_solve.percentile(values, 95) == 95
+    assert batch_solve.percentile(values, 99) == 99
+    assert batch_solve.percentile([3.0], 99) == 3.0
+    assert batch_solve.percentile([], 50) is None
+
+
+def test_solve_chunk():
+    states = [state for (state, _) in states_and_shortest_lengths]
+    results = batch_solve.solve_chunk(
+        (0, 10, states, ["astar-manhattan", "ida"]))
+    assert len(results) == 2 * len(states)
+    for result in results:
+        assert result["length"] == dict(states_and_shortest_lengths)[
+            result["state"]]
+        assert result["index"] - 10 == states.index(result["state"])
+
+
+def test_random_chunks_are_deterministic():
+    task = (3, 0, (5, 30, 12345), ["astar-manhattan"])
+    first = batch_solve.solve_chunk(task)
+    second = batch_solve.solve_chunk(task)
+    assert [r["state"] for r in first] == [r["state"] for r in second]
+
+
+def test_main(tmp_path, capsys):
+    states = tmp_path / "states.txt"
+    states.write_text("\n".join(
+        str(state) for (state, _) in states_and_shortest_lengths) + "\n")
+    output = tmp_path / "results.jsonl"
+    batch_solve.main(["--input", str(states), "--workers", "2",
+                      "--chunk_size", "2", "--solvers",
+                      "bfs,astar-manhattan", "--output", str(output)])
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(results) == 2 * len(states_and_shortest_lengths)
+    for result in results:
+        state, expected = states_and_shortest_lengths[result["index"]]
+        assert result["state"] == state
+        assert result["length"] == expected
+
+    summary = capsys.readouterr().err
+    assert "astar-manhattan" in summary and "p99 ms" in summary
+
+
+def test_unknown_solver():
+    with pytest.raises(SystemExit):
+        batch_solve.parse_args(["--random", "1", "--solvers", "nope"])
+
+
+def _die(state, stats=None):
+    os._exit(1)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(),
+                    reason="workers only see the added solver when forked")
+def test_dead_worker_fails(tmp_path, monkeypatch):
+    monkeypatch.setitem(batch_solve.SOLVERS, "die", _die)
+    # whatever the default start method is, as spawn would not see "die"
+    start_method = multiprocessing.get_start_method()
+    multiprocessing.set_start_method("spawn", force=True)
+    try:
+        with pytest.raises(RuntimeError):
+            batch_solve.main(["--random", "4", "--workers", "2", "--solvers",
+                              "die", "--output", str(tmp_path / "out.jsonl")])
+    finally:
+        multiprocessing.set_start_method(start_method, force=True)
@@ -0,0 +1,181 @@
+'''
+    benchmark.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Benchmarks the puzzle8 solvers (see batch_solve.SOLVERS) on the test
+    fixtures and on seeded random states. For every solver it records wall
+    time, nodes expanded and peak memory (from tracemalloc), and writes them
+    to a JSON baseline. A later run can be compared against a baseline, and
+    any solver that got slower, expanded more nodes or used more memory by
+    more than the threshold is flagged. For example:
+
+        python benchmark.py --output baseline.json
+        python benchmark.py --compare baseline.json --threshold 0.2
+'''
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+import puzzle8 as p8
+from batch_solve import SOLVERS
+
+# Same states as the *_test.py files
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+DEFAULT_SOLVERS = ["bfs", "bidirectional", "astar-manhattan",
+                   "astar-wrong-tiles", "astar-linear-conflict",
+                   "astar-walking-distance", "itdeep", "ida", "sma-manhattan",
+                   "table"]
+
+METRICS = ["seconds", "expanded", "peak_bytes"]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """ Parse command line arguments.
+    """
+    p = argparse.ArgumentParser()
+
+    p.add_argument("--solvers", type=str, default=",".join(DEFAULT_SOLVERS),
+                   help=("Comma separated solvers to benchmark, out of "
+                         + ", ".join(SOLVERS) + ". Default is all of them."))
+
+    p.add_argument("--random", type=int, default=10, help=(
+        "Number of seeded random states to add to the fixtures. Default=10."))
+
+    p.add_argument("--moves", type=int, default=30, help=(
+        "Number of random moves used to make each random state."
+        " Default=30."))
+
+    p.add_argument("--seed", type=int, default=12345, help=(
+        "Seed for the random states. Default=12345."))
+
+    p.add_argument("--repeat", type=int, default=3, help=(
+        "Number of timed runs per state; the fastest one is kept."
+        " Default=3."))
+
+    p.add_argument("--output", type=str, default=None, help=(
+        "File to write the results to as a JSON baseline."))
+
+    p.add_argument("--compare", type=str, default=None, help=(
+        "Baseline file to compare these results against."))
+
+    p.add_argument("--threshold", type=float, default=0.2, help=(
+        "Relative increase over the baseline that counts as a regression."
+        " Default=0.2 (20%%)."))
+
+    args = p.parse_args(argv)
+    for name in args.solvers.split(","):
+        if name not in SOLVERS:
+            p.error("unknown solver: " + name)
+    return args
+
+
+def benchmark_states(count: int, moves: int, seed: int) -> List[int]:
+    '''The fixture states followed by count seeded random states.'''
+    random.seed(seed)
+    return ([state for (state, _) in states_and_shortest_lengths]
+            + [p8.random_state(moves) for _ in range(count)])
+
+
+def measure(solver, state: int, repeat: int) -> Dict:
+    '''Runs solver on state and returns its best wall time, nodes expanded
+    and peak memory. Memory is measured on a separate run, since tracing
+    slows everything down.'''
+    seconds = None
+    for _ in range(repeat):
+        stats = {}
+        time_before = time.perf_counter()
+        solution = solver(state, stats=stats)
+        elapsed = time.perf_counter() - time_before
+        if seconds is None or elapsed < seconds:
+            seconds = elapsed
+
+    tracemalloc.start()
+    solver(state, stats={})
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "expanded": stats.get("expanded", 0),
+            "peak_bytes": peak_bytes,
+            "length": None if solution is None else len(solution)}
+
+
+def run_benchmarks(solvers: List[str], states: List[int],
+                   repeat: int = 1) -> Dict:
+    '''Benchmarks every solver on every state. Returns, for each solver, the
+    totals over all states and the measurements for each state.'''
+    results = {}
+    for name in solvers:
+        per_state = {}
+        for state in states:
+            per_state[str(state)] = measure(SOLVERS[name], state, repeat)
+        results[name] = {
+            "seconds": sum(m["seconds"] for m in per_state.values()),
+            "expanded": sum(m["expanded"] for m in per_state.values()),
+            "peak_bytes": max(m["peak_bytes"] for m in per_state.values()),
+            "states": per_state,
+        }
+    return results
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    '''Returns a description of every metric in current that is more than
+    threshold (relative) above the same metric in baseline.'''
+    regressions = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        for metric in METRICS:
+            old = baseline[name][metric]
+            new = result[metric]
+            if new > old * (1 + threshold):
+                change = (new - old) / old * 100 if old else float("inf")
+                regressions.append(f"{name} {metric}: {old:.6g} -> {new:.6g}"
+                                   f" (+{change:.0f}%)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    solvers = args.solvers.split(",")
+    states = benchmark_states(args.random, args.moves, args.seed)
+
+    results = run_benchmarks(solvers, states, args.repeat)
+
+    print(f"{'solver':<24}{'seconds':>12}{'expanded':>12}{'peak KB':>12}")
+    for name, result in results.items():
+        print(f"{name:<24}{result['seconds']:>12.4f}"
+              f"{result['expanded']:>12}{result['peak_bytes'] / 1024:>12.1f}")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(),
+                       "random": args.random, "moves": args.moves,
+                       "seed": args.seed, "results": results}, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
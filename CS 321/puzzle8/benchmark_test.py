@@ -0,0 +1,40 @@
+import benchmark
+import json
+
+
+def test_run_benchmarks():
+    states = benchmark.benchmark_states(2, 10, 12345)
+    assert len(states) == len(benchmark.states_and_shortest_lengths) + 2
+
+    results = benchmark.run_benchmarks(["astar-manhattan", "ida"], states)
+    for name in ["astar-manhattan", "ida"]:
+        result = results[name]
+        assert result["expanded"] > 0
+        assert result["peak_bytes"] > 0
+        for state, expected in benchmark.states_and_shortest_lengths:
+            assert result["states"][str(state)]["length"] == expected
+
+
+def test_compare():
+    baseline = {"ida": {"seconds": 1.0, "expanded": 100, "peak_bytes": 1000}}
+    same = {"ida": {"seconds": 1.1, "expanded": 100, "peak_bytes": 900}}
+    worse = {"ida": {"seconds": 1.5, "expanded": 100, "peak_bytes": 1000},
+             "bfs": {"seconds": 9.0, "expanded": 9, "peak_bytes": 9}}
+    assert benchmark.compare(baseline, same, 0.2) == []
+    regressions = benchmark.compare(baseline, worse, 0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("ida seconds")
+
+
+def test_main_baseline_round_trip(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    assert benchmark.main(["--solvers", "ida", "--random", "2", "--repeat",
+                           "1", "--output", str(baseline)]) == 0
+    assert "ida" in json.loads(baseline.read_text())["results"]
+
+    # halving the baseline node count makes the same run a regression
+    data = json.loads(baseline.read_text())
+    data["results"]["ida"]["expanded"] //= 2
+    baseline.write_text(json.dumps(data))
+    assert benchmark.main(["--solvers", "ida", "--random", "2", "--repeat",
+                           "1", "--compare", str(baseline)]) == 1
@@ -1,4 +1,4 @@
-''' 
+'''
     bfs.py
     Author: A.J. Ristino
     Based on code written by Professor David Musicant
@@ -8,53 +8,143 @@
 from collections import deque
 import puzzle8
 
-def breadth_first_search(state):
-    # create a deque containing the initial state
-    # create empty path since first state is starting point
-    path = []
-    deck = deque([(path, state)])
 
-    # create a set to keep track of visited nodes / states
-    # set chosen because of its data storage properties over array
-    visited = set()
+def breadth_first_search(state, bidirectional=False, puzzle=puzzle8,
+                         stats=None):
+    '''Finds a shortest path to the goal. Returns the list of squares the
+    blank moves to, or None if the goal can't be reached. Each visited state
+    stores a single parent pointer, and the path is only rebuilt once the
+    goal has been found. With bidirectional=True, the search runs forward
+    from state and backward from the goal until the two frontiers meet.
+    puzzle can be any module or object with the same functions as puzzle8,
+    such as an npuzzle.NPuzzle. If a stats dict is given, the number of
+    states expanded is stored in it.'''
+    if bidirectional:
+        return bidirectional_search(state, puzzle, stats)
+
+    goal = puzzle.solution()
+    if state == goal:
+        _record(stats, 0)
+        return []
+
+    # every visited state maps to the state it was reached from
+    # (the start state has no parent)
+    parents = {state: None}
+    deck = deque([state])
+    expanded = 0
 
     # loop over deck until it's empty
 
     while deck:
-        # pop first element in deck in order to access current state and path of current state
-        path, currState = deck.popleft()
+        currState = deck.popleft()
+        expanded += 1
+
+        # get location of blank in current and the set of possible moves
+        blankLoc = puzzle.blank_square(currState)
 
-        if currState in visited:
-            continue
+        for neighbor_square in puzzle.neighbors(blankLoc):
+            dest = puzzle.move_blank(currState, neighbor_square)
+            if dest in parents:
+                continue
+            parents[dest] = currState
 
-        if currState == puzzle8._goal: # checking if current is equivalent to our goal state
+            # goal is checked on generation, so the path is one layer shorter
+            # to find than if we waited for it to be popped
+            if dest == goal:
+                _record(stats, expanded)
+                return _path_to(dest, parents, puzzle)
 
-            # process path into returnable solution so it passes tests
-            solution = []
+            deck.append(dest)
 
-            # iterate over path, converting each state into its blank square location
-            for state in path:
-                solution.append(puzzle8.blank_square(state))
+    # otherwise no solution has been found :(
+    _record(stats, expanded)
+    return None
 
-    
-            return solution 
-        
-        # otherwise, make sure current state is marked as visited
-        visited.add(currState)
-        
-       
 
-        # get location of blank in current
-        blankLoc = puzzle8.blank_square(currState) 
+def bidirectional_search(state, puzzle=puzzle8, stats=None):
+    '''Breadth first search run from both ends at once. The forward search
+    starts at state, the backward search starts at the goal, and the smaller
+    frontier is expanded one full layer at a time. Returns the same list of
+    blank squares as breadth_first_search.'''
+    goal = puzzle.solution()
+    if state == goal:
+        _record(stats, 0)
+        return []
 
-        # use blank location to determine the set of possible moves (neighbors)
-        blankNeighbors = puzzle8.neighbors(blankLoc) 
+    # forward parents point back towards the start; backward parents point
+    # forward towards the goal (moves are reversible)
+    forward = {state: None}
+    backward = {goal: None}
+    forward_frontier = [state]
+    backward_frontier = [goal]
+    forward_depth = {state: 0}
+    backward_depth = {goal: 0}
 
-        # add neighbors of current state to the deque & prep their paths
-        for neighbor_state in blankNeighbors:
-            dest = puzzle8.move_blank(currState, neighbor_state)
-            if dest not in visited:
-                deck.append((path + [dest], dest))
+    expanded = 0
 
-    # otherwise no solution has been found :(
+    while forward_frontier and backward_frontier:
+        # expanding the smaller side keeps both searches roughly balanced
+        if len(forward_frontier) <= len(backward_frontier):
+            expanded += len(forward_frontier)
+            forward_frontier, meet = _expand_layer(
+                forward_frontier, forward, forward_depth, backward_depth,
+                puzzle)
+        else:
+            expanded += len(backward_frontier)
+            backward_frontier, meet = _expand_layer(
+                backward_frontier, backward, backward_depth, forward_depth,
+                puzzle)
+
+        # Once a layer produces a meeting state, the cheapest meeting state
+        # in that layer is on a shortest path.
+        if meet is not None:
+            path = _path_to(meet, forward, puzzle)
+            currState = meet
+            while backward[currState] is not None:
+                currState = backward[currState]
+                path.append(puzzle.blank_square(currState))
+            _record(stats, expanded)
+            return path
+
+    _record(stats, expanded)
     return None
+
+
+def _expand_layer(frontier, parents, depths, other_depths, puzzle):
+    '''Expands one whole BFS layer. Returns the next layer, and the best state
+    seen by the other search (or None if the searches haven't met yet).'''
+    next_frontier = []
+    meet = None
+    best = None
+    for currState in frontier:
+        depth = depths[currState] + 1
+        for neighbor_square in puzzle.neighbors(
+                puzzle.blank_square(currState)):
+            dest = puzzle.move_blank(currState, neighbor_square)
+            if dest in parents:
+                continue
+            parents[dest] = currState
+            depths[dest] = depth
+            if dest in other_depths:
+                total = depth + other_depths[dest]
+                if best is None or total < best:
+                    best = total
+                    meet = dest
+            next_frontier.append(dest)
+    return next_frontier, meet
+
+
+def _record(stats, expanded):
+    if stats is not None:
+        stats["expanded"] = expanded
+
+
+def _path_to(state, parents, puzzle):
+    '''Walks the parent pointers back from state and returns the blank
+    squares along the way, in order from the start.'''
+    solution = []
+    while parents[state] is not None:
+        solution.append(puzzle.blank_square(state))
+        state = parents[state]
+    solution.reverse()
+    return solution
@@ -1,4 +1,5 @@
 import bfs
+import puzzle8
 import pytest
 import time
 
@@ -17,3 +18,23 @@ def test_bfs(test_input, expected):
     print("Time to run =", time_after-time_before)
     assert soln_path is not None
     assert len(soln_path) == expected
+
+
+@pytest.mark.parametrize("test_input,expected", states_and_shortest_lengths)
+def test_bidirectional_bfs(test_input, expected):
+    soln_path = bfs.breadth_first_search(test_input, bidirectional=True)
+    assert soln_path is not None
+    assert len(soln_path) == expected
+
+    # the moves should actually take the puzzle to the goal
+    state = test_input
+    for square in soln_path:
+        state = puzzle8.move_blank(state, square)
+    assert state == puzzle8.solution()
+
+
+def test_bfs_already_solved():
+    assert bfs.breadth_first_search(puzzle8.solution()) == []
+    assert bfs.breadth_first_search(puzzle8.solution(),
+                                    bidirectional=True) == []
+
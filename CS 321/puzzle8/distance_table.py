@@ -0,0 +1,181 @@
+'''
+    distance_table.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Precomputed optimal distances for the whole 8-puzzle. Only 9!/2 = 181,440
+    states can reach the goal, so a single backward breadth first search from
+    the goal finds the optimal distance (and a best move) for every one of
+    them. After that, solving a state is a walk through the table, one lookup
+    per move.
+
+    States are indexed by permutation rank rather than by the sparse base-9
+    integer from puzzle8.state: the square of the blank, combined with the
+    rank of the order the eight tiles appear in. Sliding a tile never changes
+    the parity of that order, and two orders that only differ in their last
+    two tiles have neighboring ranks and opposite parity, so halving the rank
+    gives a dense index for the solvable half.
+
+    Each entry is two bytes (distance, best square for the blank), so the
+    file is 362,880 bytes and is memory-mapped when loaded.
+'''
+
+import mmap
+import os
+from collections import deque
+from typing import List, Optional
+import puzzle8 as p8
+import safe_write
+
+NUM_ENTRIES = 181440
+ENTRY_SIZE = 2
+UNREACHABLE = 255
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "puzzle8_distances.bin")
+
+_FACTORIALS = [5040, 720, 120, 24, 6, 2, 1, 1]
+
+
+def tiles(state) -> List[int]:
+    '''Returns the tile in each of the nine squares of state.'''
+    return [p8.get_tile(state, i) for i in range(9)]
+
+
+def rank(state) -> int:
+    '''Returns the dense table index of state.'''
+    return _rank_tiles(tiles(state))[0]
+
+
+def solvable(state) -> bool:
+    '''Whether the goal can be reached from state at all.'''
+    return _rank_tiles(tiles(state))[1] == _goal_parity
+
+
+def _rank_tiles(pieces):
+    # Lehmer code of the tile order, halved (see module docstring), along
+    # with the parity of the order
+    order = [tile for tile in pieces if tile != 0]
+    r = 0
+    inversions = 0
+    for i in range(7):
+        tile = order[i]
+        smaller = 0
+        for j in range(i + 1, 8):
+            if order[j] < tile:
+                smaller += 1
+        r += smaller * _FACTORIALS[i]
+        inversions += smaller
+    return pieces.index(0) * 20160 + r // 2, inversions % 2
+
+
+_goal_parity = _rank_tiles(tiles(p8._goal))[1]
+
+
+def build(path=DEFAULT_PATH) -> None:
+    '''Runs one breadth first search backward from the goal and writes the
+    distance and best move of every reachable state to path. The table is
+    written to a temporary file next to path and then renamed onto it, so
+    path only ever holds a complete table, and a file another process has
+    memory-mapped is replaced rather than rewritten under it.'''
+    table = bytearray([UNREACHABLE]) * (NUM_ENTRIES * ENTRY_SIZE)
+
+    # The search works on tuples of tiles, which are much cheaper to move
+    # around than the base-9 encoding.
+    goal = tuple(tiles(p8._goal))
+    index = _rank_tiles(goal)[0]
+    table[index * ENTRY_SIZE] = 0
+    deck = deque([(goal, goal.index(0), 0)])
+
+    while deck:
+        pieces, blank, distance = deck.popleft()
+        for square in p8.neighbors(blank):
+            moved = list(pieces)
+            moved[blank] = moved[square]
+            moved[square] = 0
+            index = _rank_tiles(moved)[0]
+            if table[index * ENTRY_SIZE] != UNREACHABLE:
+                continue
+
+            # Moving the blank back to where it came from undoes this move,
+            # and takes the new state one step closer to the goal.
+            table[index * ENTRY_SIZE] = distance + 1
+            table[index * ENTRY_SIZE + 1] = blank
+            deck.append((tuple(moved), square, distance + 1))
+
+    with safe_write.replacing(path) as f:
+        f.write(table)
+
+
+class DistanceTable:
+    '''A memory-mapped distance table, as written by build.'''
+
+    def __init__(self, path=DEFAULT_PATH) -> None:
+        with open(path, "rb") as f:
+            self._table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._table) != NUM_ENTRIES * ENTRY_SIZE:
+            raise ValueError("Distance table has the wrong size: " + path)
+
+    def close(self) -> None:
+        self._table.close()
+
+    def distance(self, state) -> Optional[int]:
+        '''Optimal number of moves from state to the goal, or None if the
+        goal can't be reached.'''
+        index, parity = _rank_tiles(tiles(state))
+        distance = self._table[index * ENTRY_SIZE]
+        if distance == UNREACHABLE or parity != _goal_parity:
+            return None
+        return distance
+
+    def best_move(self, state) -> Optional[int]:
+        '''Square the blank should move to next, or None if state is the
+        goal or can't reach it.'''
+        if not self.distance(state):
+            return None
+        return self._table[rank(state) * ENTRY_SIZE + 1]
+
+    def solve(self, state) -> Optional[List[int]]:
+        '''Returns an optimal list of squares for the blank to move to, in
+        the same form as the search functions, or None if unsolvable.'''
+        distance = self.distance(state)
+        if distance is None:
+            return None
+        solution = []
+        for _ in range(distance):
+            square = self._table[rank(state) * ENTRY_SIZE + 1]
+            state = p8.move_blank(state, square)
+            solution.append(square)
+        return solution
+
+
+def load(path=DEFAULT_PATH) -> DistanceTable:
+    '''Memory-maps the table at path, building it first if needed. Several
+    processes can load at once: each may build the table, but an existing
+    file is never written to (see build).'''
+    if not os.path.exists(path):
+        build(path)
+    return DistanceTable(path)
+
+
+_default_table = None
+
+
+def default_table() -> DistanceTable:
+    '''The table at DEFAULT_PATH, loaded (or built) on first use and then
+    kept. Loading it in a parent process before starting workers means the
+    workers never have to build it.'''
+    global _default_table
+    if _default_table is None:
+        _default_table = load()
+    return _default_table
+
+
+def table_search(state, stats=None) -> Optional[List[int]]:
+    '''Drop-in replacement for the search functions that answers from the
+    default table (see default_table). If a stats dict is given, the number
+    of states looked up is stored as "expanded".'''
+    solution = default_table().solve(state)
+    if stats is not None:
+        stats["expanded"] = 1 if solution is None else len(solution) + 1
+    return solution
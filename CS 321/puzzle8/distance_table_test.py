@@ -0,0 +1,79 @@
+import puzzle8 as p8
+import distance_table
+import pytest
+import random
+import time
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tables") / "distances.bin")
+    time_before = time.time()
+    distance_table.build(path)
+    time_after = time.time()
+    print("Time to build =", time_after-time_before)
+    table = distance_table.load(path)
+    yield table
+    table.close()
+
+
+def test_rank_is_dense():
+    random.seed(12345)
+    ranks = set()
+    for _ in range(200):
+        r = distance_table.rank(p8.random_state(50))
+        assert 0 <= r < distance_table.NUM_ENTRIES
+        ranks.add(r)
+    assert distance_table.rank(p8.solution()) in range(
+        distance_table.NUM_ENTRIES)
+
+
+def test_goal(table):
+    assert table.distance(p8.solution()) == 0
+    assert table.best_move(p8.solution()) is None
+    assert table.solve(p8.solution()) == []
+
+
+@pytest.mark.parametrize("test_input,expected", states_and_shortest_lengths)
+def test_solve(table, test_input, expected):
+    assert table.distance(test_input) == expected
+    soln_path = table.solve(test_input)
+    assert len(soln_path) == expected
+
+    state = test_input
+    for square in soln_path:
+        state = p8.move_blank(state, square)
+    assert state == p8.solution()
+
+
+def test_unsolvable(table):
+    unsolvable = p8.state([2, 1, 3, 8, 0, 4, 7, 6, 5])
+    assert not distance_table.solvable(unsolvable)
+    assert table.distance(unsolvable) is None
+    assert table.solve(unsolvable) is None
+
+
+def test_hardest_state(table):
+    # the hardest 8-puzzle states are 30 moves away
+    hardest = p8.state([0, 2, 1, 3, 5, 8, 4, 6, 7])
+    assert table.distance(hardest) == 30
+    assert len(table.solve(hardest)) == 30
+
+
+def test_rebuild_leaves_mapped_table_alone(tmp_path):
+    path = str(tmp_path / "distances.bin")
+    distance_table.build(path)
+    table = distance_table.load(path)
+    distance_table.build(path)
+    assert table.distance(300501380) == 12
+    table.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["distances.bin"]
@@ -0,0 +1,349 @@
+'''
+    external_bfs.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Breadth first search that keeps its layers on disk instead of in a set,
+    for puzzles (such as the 15-puzzle) whose state spaces don't fit in
+    memory. Each layer is a file of sorted, distinct states, each written as
+    a fixed number of big-endian bytes, so the files sort the same way the
+    states do. To build the next layer:
+
+      1. The current layer is read back a buffer at a time, and the
+         successors of its states are collected in a buffer of at most
+         buffer_states states. Whenever the buffer fills, it is sorted and
+         written out as a run file.
+      2. The runs are merged (heapq.merge), dropping duplicates, and anything
+         that is also in the current or previous layer is dropped by merging
+         against those files too. Every successor of a state in layer d is
+         in layer d - 1, d or d + 1, so what is left is layer d + 1. At most
+         max_open_runs runs are merged at a time: when there are more, they
+         are first merged in groups into fewer, longer runs, as many passes
+         as it takes, so the number of open files stays bounded.
+
+    Nothing is ever held in memory beyond the buffers. A manifest.json in the
+    directory records the layers finished so far, and a search started again
+    on the same directory carries on after the last one (throwing away any
+    run files left by the layer that was being built).
+
+    The finished layer files double as a distance table: LayerTable finds a
+    state's distance from the start by binary search through them. For
+    example, to lay out the whole 8-puzzle from its goal:
+
+        python external_bfs.py --width 3 --directory layers
+'''
+
+import argparse
+import bisect
+import heapq
+import json
+import mmap
+import os
+from typing import Iterable, Iterator, List, Optional
+import puzzle8 as p8
+import safe_write
+from npuzzle import PUZZLE8, PUZZLE15, PUZZLE24
+
+PUZZLES = {3: PUZZLE8, 4: PUZZLE15, 5: PUZZLE24}
+
+MANIFEST = "manifest.json"
+
+
+def state_bytes(puzzle=p8) -> int:
+    '''Number of bytes needed to write any state of puzzle.'''
+    bits = getattr(puzzle, "bits", None)
+    if bits is None:
+        # tracked8 gives a bound on its states; puzzle8 states are nine
+        # base 9 digits
+        largest = getattr(puzzle, "MAX_STATE", 9 ** 9 - 1)
+        return (largest.bit_length() + 7) // 8
+    n = puzzle.num_squares
+    # the tiles, and the square of the blank above them
+    return (n * bits + (n - 1).bit_length() + 7) // 8
+
+
+def layer_path(directory: str, depth: int) -> str:
+    '''Where the states at the given depth are stored in directory.'''
+    return os.path.join(directory, "layer" + str(depth).zfill(3) + ".bin")
+
+
+def read_states(path: str, width: int,
+                buffer_states: int) -> Iterator[int]:
+    '''Yields the states in a file, reading buffer_states at a time.'''
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(buffer_states * width)
+            if not data:
+                return
+            for i in range(0, len(data), width):
+                yield int.from_bytes(data[i:i + width], "big")
+
+
+def write_states(path: str, states: Iterable[int], width: int,
+                 buffer_states: int) -> int:
+    '''Writes states to path, buffer_states at a time, by way of a temporary
+    file so that path only ever holds a complete layer. Returns how many
+    states were written.'''
+    count = 0
+    buffer = bytearray()
+    with safe_write.replacing(path) as f:
+        for state in states:
+            buffer += state.to_bytes(width, "big")
+            count += 1
+            if count % buffer_states == 0:
+                f.write(buffer)
+                buffer.clear()
+        f.write(buffer)
+    return count
+
+
+def run_path(directory: str, merge_pass: int, number: int) -> str:
+    '''Where the given run of a layer being built is stored: pass 0 holds
+    the sorted runs of successors, and each later pass the runs merged from
+    the one before.'''
+    return os.path.join(directory, "run" + str(merge_pass) + "-"
+                        + str(number) + ".bin")
+
+
+def _remove_runs(directory: str) -> None:
+    # run files left by an unfinished layer, and the temporary files of
+    # anything that was being written when the search stopped
+    for name in os.listdir(directory):
+        if ((name.startswith("run") and name.endswith(".bin"))
+                or name.endswith(".tmp")):
+            os.remove(os.path.join(directory, name))
+
+
+def _merge_runs(run_paths: List[str], directory: str, width: int,
+                buffer_states: int, max_open_runs: int) -> List[str]:
+    # merges groups of max_open_runs runs into single runs until there are
+    # no more than max_open_runs left, and returns those
+    merge_pass = 0
+    while len(run_paths) > max_open_runs:
+        merge_pass += 1
+        run_buffer = max(1, buffer_states // max_open_runs)
+        merged = []
+        for first in range(0, len(run_paths), max_open_runs):
+            group = run_paths[first:first + max_open_runs]
+            path = run_path(directory, merge_pass, len(merged))
+            write_states(path, _distinct(heapq.merge(
+                *[read_states(run, width, run_buffer) for run in group])),
+                width, buffer_states)
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+        run_paths = merged
+    return run_paths
+
+
+def _distinct(states: Iterable[int]) -> Iterator[int]:
+    # drops repeats from a sorted stream
+    previous = None
+    for state in states:
+        if state != previous:
+            yield state
+            previous = state
+
+
+def _difference(states: Iterable[int],
+                *others: Iterable[int]) -> Iterator[int]:
+    # states that are in the sorted stream but not in any of the sorted others
+    others = heapq.merge(*others)
+    other = next(others, None)
+    for state in states:
+        while other is not None and other < state:
+            other = next(others, None)
+        if state != other:
+            yield state
+
+
+class _Manifest:
+    '''What has been done in a directory so far.'''
+
+    def __init__(self, directory: str, start: List[int], width: int) -> None:
+        self.path = os.path.join(directory, MANIFEST)
+        self.start = start
+        self.width = width
+        self.layers = []
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                saved = json.load(f)
+            if saved["start"] != start or saved["state_bytes"] != width:
+                raise ValueError(directory + " holds a different search")
+            self.layers = saved["layers"]
+
+    def save(self) -> None:
+        with safe_write.replacing(self.path, "w") as f:
+            json.dump({"start": self.start, "state_bytes": self.width,
+                       "layers": self.layers}, f)
+
+
+def external_breadth_first_search(start, directory: str, puzzle=p8,
+                                  buffer_states: int = 1 << 16,
+                                  max_depth: Optional[int] = None,
+                                  width: Optional[int] = None,
+                                  max_open_runs: int = 64,
+                                  stats=None) -> List[int]:
+    '''Lays out every state reachable from start (a state, or a list of
+    them) one layer per file in directory, stopping early after max_depth
+    if given. Returns the number of states at each depth. width is the
+    number of bytes written per state, and defaults to state_bytes(puzzle).
+    max_open_runs is the most run files merged at once. If a stats dict is
+    given, the numbers of states expanded and run files of successors
+    written are stored in it.'''
+    if buffer_states < 1:
+        raise ValueError("buffer_states should be at least 1")
+    if max_open_runs < 2:
+        raise ValueError("max_open_runs should be at least 2")
+    start = sorted(set([start] if isinstance(start, int) else start))
+    if width is None:
+        width = state_bytes(puzzle)
+    os.makedirs(directory, exist_ok=True)
+    manifest = _Manifest(directory, start, width)
+    if not manifest.layers:
+        manifest.layers.append(write_states(layer_path(directory, 0), start,
+                                            width, buffer_states))
+        manifest.save()
+
+    expanded = 0
+    runs = 0
+    while manifest.layers[-1] and (max_depth is None
+                                   or len(manifest.layers) <= max_depth):
+        depth = len(manifest.layers) - 1
+        current = layer_path(directory, depth)
+        _remove_runs(directory)
+
+        # 1. sorted runs of successors
+        run_paths = []
+        buffer = []
+
+        def write_run():
+            path = run_path(directory, 0, len(run_paths))
+            buffer.sort()
+            write_states(path, _distinct(buffer), width, buffer_states)
+            run_paths.append(path)
+            buffer.clear()
+
+        for state in read_states(current, width, buffer_states):
+            expanded += 1
+            for square in puzzle.neighbors(puzzle.blank_square(state)):
+                buffer.append(puzzle.move_blank(state, square))
+                if len(buffer) == buffer_states:
+                    write_run()
+        if buffer:
+            write_run()
+        runs += len(run_paths)
+
+        # 2. merge the runs, and take out the current and previous layers;
+        # the runs share one buffer's worth of memory between them
+        run_paths = _merge_runs(run_paths, directory, width, buffer_states,
+                                max_open_runs)
+        run_buffer = max(1, buffer_states // max(1, len(run_paths)))
+        readers = [read_states(path, width, run_buffer) for path in run_paths]
+        seen = [read_states(layer_path(directory, d), width, buffer_states)
+                for d in range(max(0, depth - 1), depth + 1)]
+        count = write_states(layer_path(directory, depth + 1),
+                             _difference(_distinct(heapq.merge(*readers)),
+                                         *seen),
+                             width, buffer_states)
+        for path in run_paths:
+            os.remove(path)
+
+        manifest.layers.append(count)
+        manifest.save()
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["runs"] = runs
+    layers = manifest.layers
+    if not layers[-1]:
+        # the empty layer just marks the end of the search
+        layers = layers[:-1]
+    return layers
+
+
+class _Layer:
+    # A memory-mapped layer file that can be searched like a sorted list
+    def __init__(self, path: str, width: int) -> None:
+        self.width = width
+        self._map = None
+        if os.path.getsize(path):
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return 0 if self._map is None else len(self._map) // self.width
+
+    def __getitem__(self, i: int) -> int:
+        return int.from_bytes(self._map[i * self.width:(i + 1) * self.width],
+                              "big")
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+
+
+class LayerTable:
+    '''The layer files written by external_breadth_first_search, used as a
+    table of distances from the start.'''
+
+    def __init__(self, directory: str) -> None:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        width = manifest["state_bytes"]
+        self._layers = [_Layer(layer_path(directory, depth), width)
+                        for depth in range(len(manifest["layers"]))]
+
+    def close(self) -> None:
+        for layer in self._layers:
+            layer.close()
+
+    def distance(self, state) -> Optional[int]:
+        '''Number of moves between state and the start, or None if state
+        isn't in any finished layer.'''
+        for depth, layer in enumerate(self._layers):
+            i = bisect.bisect_left(layer, state)
+            if i < len(layer) and layer[i] == state:
+                return depth
+        return None
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """ Parse command line arguments.
+    """
+    p = argparse.ArgumentParser()
+
+    p.add_argument("--width", type=int, default=3, choices=[3, 4, 5], help=(
+        "Width of the puzzle. The search starts from its goal. Default=3."))
+
+    p.add_argument("--directory", type=str, required=True, help=(
+        "Where the layers are written. A search that was stopped carries on"
+        " from its last finished layer."))
+
+    p.add_argument("--buffer", type=int, default=1 << 16, help=(
+        "Number of states held in memory at a time. Default=65536."))
+
+    p.add_argument("--max_runs", type=int, default=64, help=(
+        "Most run files merged (and open) at once. Default=64."))
+
+    p.add_argument("--max_depth", type=int, default=None, help=(
+        "Stop once the layer at this depth is finished. Defaults to the"
+        " whole space."))
+
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    puzzle = PUZZLES[args.width]
+    layers = external_breadth_first_search(
+        puzzle.solution(), args.directory, puzzle=puzzle,
+        buffer_states=args.buffer, max_depth=args.max_depth,
+        max_open_runs=args.max_runs)
+    for depth, count in enumerate(layers):
+        print(depth, count)
+    print("total", sum(layers))
+
+
+if __name__ == '__main__':
+    main()
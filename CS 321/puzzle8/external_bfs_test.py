@@ -0,0 +1,141 @@
+import puzzle8 as p8
+import external_bfs
+import tracked8
+from collections import deque
+from npuzzle import NPuzzle, PUZZLE8
+import os
+import pytest
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+
+def layer_counts(start, puzzle, max_depth):
+    # the same layers, counted with an in-memory breadth first search
+    depths = {start: 0}
+    deck = deque([start])
+    counts = [1]
+    while deck:
+        state = deck.popleft()
+        if depths[state] == max_depth:
+            continue
+        for square in puzzle.neighbors(puzzle.blank_square(state)):
+            dest = puzzle.move_blank(state, square)
+            if dest not in depths:
+                depths[dest] = depths[state] + 1
+                deck.append(dest)
+                if depths[dest] == len(counts):
+                    counts.append(0)
+                counts[depths[dest]] += 1
+    return counts
+
+
+def test_state_bytes():
+    assert external_bfs.state_bytes(p8) == 4
+    assert external_bfs.state_bytes(tracked8) == 5
+    assert external_bfs.state_bytes(PUZZLE8) == 5
+    assert external_bfs.state_bytes(NPuzzle(4)) == 9
+
+
+def test_whole_8_puzzle(tmp_path):
+    # npuzzle's 8-puzzle, which moves much faster than puzzle8
+    stats = {}
+    layers = external_bfs.external_breadth_first_search(
+        PUZZLE8.solution(), str(tmp_path), puzzle=PUZZLE8,
+        buffer_states=5000, stats=stats)
+    assert sum(layers) == 181440
+    assert len(layers) == 31
+    assert layers == layer_counts(PUZZLE8.solution(), PUZZLE8, 30)
+    assert stats["expanded"] == 181440
+    assert stats["runs"] > len(layers)
+    # the runs are cleaned up after every layer
+    assert not [name for name in os.listdir(tmp_path)
+                if name.startswith("run")]
+
+    table = external_bfs.LayerTable(str(tmp_path))
+    for state, expected in states_and_shortest_lengths:
+        pieces = [p8.get_tile(state, square) for square in range(9)]
+        assert table.distance(PUZZLE8.state(pieces)) == expected
+    assert table.distance(PUZZLE8.state([2, 1, 3, 8, 0, 4, 7, 6, 5])) is None
+    table.close()
+
+
+def test_npuzzle(tmp_path):
+    puzzle = NPuzzle(4)
+    layers = external_bfs.external_breadth_first_search(
+        puzzle.solution(), str(tmp_path), puzzle=puzzle, buffer_states=100,
+        max_depth=8)
+    assert layers == layer_counts(puzzle.solution(), puzzle, 8)
+
+
+def test_restart(tmp_path):
+    directory = str(tmp_path)
+    first = external_bfs.external_breadth_first_search(
+        p8.solution(), directory, max_depth=5)
+    assert len(first) == 6
+
+    # a layer that was being built when the search stopped is ignored
+    junk = external_bfs.layer_path(directory, 6) + ".x1y2z3.tmp"
+    with open(junk, "wb") as f:
+        f.write(b"junk")
+    stats = {}
+    second = external_bfs.external_breadth_first_search(
+        p8.solution(), directory, max_depth=12, stats=stats)
+    assert second[:6] == first
+    assert second == layer_counts(p8.solution(), p8, 12)
+    # only layers 6 to 12 had to be built
+    assert stats["expanded"] == sum(second[5:12])
+    assert not os.path.exists(junk)
+
+
+def test_few_open_runs(tmp_path):
+    # small buffers make dozens of runs, merged 3 at a time over several
+    # passes
+    stats = {}
+    layers = external_bfs.external_breadth_first_search(
+        PUZZLE8.solution(), str(tmp_path), puzzle=PUZZLE8, buffer_states=200,
+        max_depth=16, max_open_runs=3, stats=stats)
+    assert layers == layer_counts(PUZZLE8.solution(), PUZZLE8, 16)
+    assert stats["runs"] > 100
+
+
+def test_restart_removes_stale_runs(tmp_path):
+    directory = str(tmp_path)
+    external_bfs.external_breadth_first_search(p8.solution(), directory,
+                                               max_depth=3)
+    # runs left behind by a layer that was interrupted
+    for merge_pass, number in [(0, 0), (0, 1), (1, 0)]:
+        with open(external_bfs.run_path(directory, merge_pass, number),
+                  "wb") as f:
+            f.write(b"\xff" * 8)
+    layers = external_bfs.external_breadth_first_search(
+        p8.solution(), directory, max_depth=6)
+    assert layers == layer_counts(p8.solution(), p8, 6)
+    assert not [name for name in os.listdir(directory)
+                if name.startswith("run")]
+
+
+def test_tracked(tmp_path):
+    start = tracked8.from_state(p8.solution())
+    layers = external_bfs.external_breadth_first_search(
+        start, str(tmp_path), puzzle=tracked8, max_depth=10)
+    assert layers == layer_counts(p8.solution(), p8, 10)
+
+
+def test_different_search(tmp_path):
+    external_bfs.external_breadth_first_search(p8.solution(), str(tmp_path),
+                                               max_depth=1)
+    with pytest.raises(ValueError):
+        external_bfs.external_breadth_first_search(108306836, str(tmp_path))
+
+
+def test_bad_max_open_runs(tmp_path):
+    with pytest.raises(ValueError):
+        external_bfs.external_breadth_first_search(
+            p8.solution(), str(tmp_path), max_open_runs=1)
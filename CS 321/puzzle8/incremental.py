@@ -0,0 +1,114 @@
+'''
+    incremental.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Moving the blank only moves one tile, so a heuristic that is a sum of
+    per-tile costs (Manhattan distance, number of wrong tiles) only changes
+    by that tile's part. This module has tables of those per-tile costs,
+    indexed by tile and then by square, and a move function that returns
+    the successor state along with the change in the heuristic.
+
+    A heuristic function advertises its table through a tile_costs
+    attribute (see astar.manhattan_distance), or a function that builds the
+    table for the puzzle the heuristic belongs to (see the NPuzzle
+    heuristics); astar_search and itdeep.ida_star_search then score
+    successors with one table lookup instead of calling the heuristic.
+'''
+
+from functools import lru_cache
+from typing import List, Tuple
+import puzzle8 as p8
+
+_POWERS = [9 ** i for i in range(9)]
+
+
+def _num_squares(puzzle) -> int:
+    # puzzle8 itself doesn't say how big it is
+    return getattr(puzzle, "num_squares", 9)
+
+
+def _goal_tiles(puzzle) -> List[int]:
+    goal = puzzle.solution()
+    return [puzzle.get_tile(goal, square)
+            for square in range(_num_squares(puzzle))]
+
+
+@lru_cache(maxsize=None)
+def manhattan_costs(puzzle=p8) -> Tuple[Tuple[int, ...], ...]:
+    '''Distance of each tile from its goal square, indexed by tile and then
+    by square. The blank costs nothing.'''
+    n = _num_squares(puzzle)
+    goal_tiles = _goal_tiles(puzzle)
+    costs = [(0,) * n]
+    for tile in range(1, n):
+        goal_x, goal_y = puzzle.xy_location(goal_tiles.index(tile))
+        costs.append(tuple(
+            abs(goal_x - x) + abs(goal_y - y)
+            for (x, y) in map(puzzle.xy_location, range(n))))
+    return tuple(costs)
+
+
+@lru_cache(maxsize=None)
+def wrong_tile_costs(puzzle=p8) -> Tuple[Tuple[int, ...], ...]:
+    '''1 if a tile is out of place on a square, indexed by tile and then by
+    square. The blank costs nothing.'''
+    n = _num_squares(puzzle)
+    goal_tiles = _goal_tiles(puzzle)
+    costs = [(0,) * n]
+    for tile in range(1, n):
+        costs.append(tuple(int(goal_tiles[square] != tile)
+                           for square in range(n)))
+    return tuple(costs)
+
+
+def heuristic_costs(heuristic, puzzle=p8):
+    '''The tile_costs table of heuristic, for use with puzzle, or None if it
+    doesn't have one. Raises ValueError if the table is for a puzzle with a
+    different number of squares.'''
+    tile_costs = getattr(heuristic, "tile_costs", None)
+    if tile_costs is None:
+        return None
+    if callable(tile_costs):
+        # an NPuzzle method: the table comes from the puzzle it is bound to
+        tile_costs = tile_costs(heuristic.__self__)
+    n = _num_squares(puzzle)
+    if len(tile_costs) != n or any(len(row) != n for row in tile_costs):
+        raise ValueError("The heuristic's tile_costs are for a puzzle with "
+                         + str(len(tile_costs)) + " squares, not "
+                         + str(n))
+    return tile_costs
+
+
+def evaluate(state, tile_costs, puzzle=p8) -> int:
+    '''Full value of the heuristic described by tile_costs.'''
+    return sum(tile_costs[puzzle.get_tile(state, square)][square]
+               for square in range(_num_squares(puzzle)))
+
+
+def move_blank(state, source, dest) -> Tuple[int, int, int]:
+    '''Moves the blank of a puzzle8 state from square source to square dest,
+    which should be one of its neighbors (this isn't checked). Returns the
+    new state, the change in Manhattan distance and the change in the number
+    of wrong tiles.'''
+    tile = (state // _POWERS[dest]) % 9
+    manhattan = manhattan_costs()
+    wrong = wrong_tile_costs()
+    return (state + tile * (_POWERS[source] - _POWERS[dest]),
+            manhattan[tile][source] - manhattan[tile][dest],
+            wrong[tile][source] - wrong[tile][dest])
+
+
+def move_blank_with_delta(state, source, dest, tile_costs,
+                          puzzle=p8) -> Tuple[int, int]:
+    '''Moves the blank from square source (where it must be) to square dest.
+    Returns the new state and the change in the heuristic described by
+    tile_costs.'''
+    if puzzle is p8:
+        # skip the blank_square scan in puzzle8.move_blank
+        tile = (state // _POWERS[dest]) % 9
+        new_state = state + tile * (_POWERS[source] - _POWERS[dest])
+    else:
+        tile = puzzle.get_tile(state, dest)
+        new_state = puzzle.move_blank(state, dest)
+    return new_state, tile_costs[tile][source] - tile_costs[tile][dest]
@@ -0,0 +1,130 @@
+import puzzle8 as p8
+import astar
+import itdeep
+import incremental
+import smastar
+from npuzzle import PUZZLE8, PUZZLE15, PUZZLE24
+import pytest
+import random
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+
+def test_evaluate_matches_heuristics():
+    random.seed(12345)
+    for _ in range(100):
+        state = p8.random_state(40)
+        assert incremental.evaluate(
+            state, incremental.manhattan_costs()) == \
+            astar.manhattan_distance(state)
+        assert incremental.evaluate(
+            state, incremental.wrong_tile_costs()) == \
+            astar.num_wrong_tiles(state)
+
+
+def test_move_blank_deltas():
+    random.seed(12345)
+    for _ in range(100):
+        state = p8.random_state(40)
+        blank = p8.blank_square(state)
+        for square in p8.neighbors(blank):
+            new_state, manhattan, wrong = incremental.move_blank(
+                state, blank, square)
+            assert new_state == p8.move_blank(state, square)
+            assert manhattan == (astar.manhattan_distance(new_state)
+                                 - astar.manhattan_distance(state))
+            assert wrong == (astar.num_wrong_tiles(new_state)
+                             - astar.num_wrong_tiles(state))
+
+
+def test_move_blank_with_delta_npuzzle():
+    costs = incremental.manhattan_costs(PUZZLE15)
+    random.seed(12345)
+    for _ in range(50):
+        state = PUZZLE15.random_state(40)
+        blank = PUZZLE15.blank_square(state)
+        for square in PUZZLE15.neighbors(blank):
+            new_state, delta = incremental.move_blank_with_delta(
+                state, blank, square, costs, PUZZLE15)
+            assert new_state == PUZZLE15.move_blank(state, square)
+            assert delta == (PUZZLE15.manhattan_distance(new_state)
+                             - PUZZLE15.manhattan_distance(state))
+
+
+@pytest.mark.parametrize("test_input,expected", states_and_shortest_lengths)
+def test_same_search_as_full_evaluation(test_input, expected):
+    # wrapping the heuristic hides its tile_costs, forcing full evaluation
+    def full(state):
+        return astar.manhattan_distance(state)
+
+    incremental_stats = {}
+    full_stats = {}
+    assert len(astar.astar_search(test_input, astar.manhattan_distance,
+                                  stats=incremental_stats)) == expected
+    assert len(astar.astar_search(test_input, full,
+                                  stats=full_stats)) == expected
+    assert incremental_stats == full_stats
+
+    incremental_stats = {}
+    full_stats = {}
+    assert len(itdeep.ida_star_search(test_input, astar.manhattan_distance,
+                                      stats=incremental_stats)) == expected
+    assert len(itdeep.ida_star_search(test_input, full,
+                                      stats=full_stats)) == expected
+    assert incremental_stats == full_stats
+
+
+def test_incremental_on_packed_puzzle8():
+    state = PUZZLE8.state([p8.get_tile(108306836, i) for i in range(9)])
+    soln_path = astar.astar_search(state, astar.manhattan_distance,
+                                   puzzle=PUZZLE8)
+    assert len(soln_path) == 16
+
+
+@pytest.mark.parametrize("puzzle", [PUZZLE8, PUZZLE15, PUZZLE24])
+def test_npuzzle_heuristic_costs(puzzle):
+    manhattan = incremental.heuristic_costs(puzzle.manhattan_distance, puzzle)
+    wrong = incremental.heuristic_costs(puzzle.num_wrong_tiles, puzzle)
+    random.seed(12345)
+    for _ in range(50):
+        state = puzzle.random_state(40)
+        assert incremental.evaluate(state, manhattan, puzzle) == \
+            puzzle.manhattan_distance(state)
+        assert incremental.evaluate(state, wrong, puzzle) == \
+            puzzle.num_wrong_tiles(state)
+
+
+def test_same_search_as_full_evaluation_npuzzle():
+    def full(state):
+        return PUZZLE15.manhattan_distance(state)
+
+    random.seed(12345)
+    state = PUZZLE15.random_state(30)
+    incremental_stats = {}
+    full_stats = {}
+    path = astar.astar_search(state, PUZZLE15.manhattan_distance,
+                              puzzle=PUZZLE15, stats=incremental_stats)
+    assert path == astar.astar_search(state, full, puzzle=PUZZLE15,
+                                      stats=full_stats)
+    assert incremental_stats == full_stats
+
+
+def test_tile_costs_for_another_puzzle():
+    state = PUZZLE15.random_state(10)
+    with pytest.raises(ValueError):
+        astar.astar_search(state, astar.manhattan_distance, puzzle=PUZZLE15)
+    with pytest.raises(ValueError):
+        itdeep.ida_star_search(state, astar.num_wrong_tiles, puzzle=PUZZLE15)
+    with pytest.raises(ValueError):
+        smastar.sma_star_search(state, astar.manhattan_distance, 100,
+                                puzzle=PUZZLE15)
+    with pytest.raises(ValueError):
+        astar.astar_search(PUZZLE24.random_state(10),
+                           PUZZLE15.manhattan_distance, puzzle=PUZZLE24)
@@ -1,31 +1,117 @@
 import puzzle8 as p8
-from typing import List
+import incremental
+from typing import List, Optional
 from collections import deque
 
-def depth_first_search(state: int, depth: int, path: List[int]) -> List[int]:
-    if state == p8.solution():
-        return path
-    elif depth == 0:
-        return []
-    else:
-        for square in p8.neighbors(p8.blank_square(state)):
-            new_state = p8.move_blank(state, square)
-            new_path = path.copy()
-            new_path.append(square)
-            result = depth_first_search(new_state, depth-1, new_path)
-            if len(result) != 0:
-                return result
-        return []
-        
-
-def iterative_deepening_search(state: int) -> List[int]:
+# Returned by _bounded_search once the goal is reached
+_FOUND = -1
+
+
+def _no_heuristic(state: int) -> int:
+    return 0
+
+
+def depth_first_search(state: int, depth: int, path: List[int],
+                       puzzle=p8) -> List[int]:
+    """Depth limited search. Returns path extended by the squares the blank
+    moves to in order to get to solution within depth moves, or [] if there
+    is no such path.
+    """
+    moves = list(path)
+    if _bounded_search(state, depth, _no_heuristic, moves, puzzle,
+                       [0]) == _FOUND:
+        return moves
+    return []
+
+
+def iterative_deepening_search(state: int, puzzle=p8,
+                               stats=None) -> List[int]:
     """Finds path to solution via iterative deepening. Returns a list of
-    squares that the blank moves to in order to get to solution.
+    squares that the blank moves to in order to get to solution. puzzle can
+    be puzzle8 or anything with the same functions, such as an
+    npuzzle.NPuzzle. This is IDA* with no heuristic, so the depth limit goes
+    up by one each iteration (stats is as for ida_star_search).
     """
-    depth = 1
-    while(True):
-        result = depth_first_search(state, depth, [])
-        if (len(result) != 0):
-            return result
-        depth = depth + 1
-    
\ No newline at end of file
+    return ida_star_search(state, _no_heuristic, puzzle, stats)
+
+
+def ida_star_search(state: int, heuristic, puzzle=p8,
+                    stats=None) -> Optional[List[int]]:
+    """Finds path to solution via IDA*. Each iteration is a depth first
+    search that cuts off any node whose f-cost (moves so far plus heuristic)
+    is over the threshold, and the next threshold is the smallest f-cost
+    that was cut off. With an admissible heuristic the path is optimal.
+
+    Only one list of moves is kept, and it is changed in place, so memory
+    use stays flat. If a stats dict is given, the number of nodes visited
+    in each iteration is stored in stats["iterations"] (and the total in
+    stats["expanded"]). Returns None if no threshold is left to try.
+
+    Heuristics with a tile_costs table (see incremental.py) are updated
+    from the one tile each move slides instead of being called again.
+    """
+    moves: List[int] = []
+    iterations = []
+    tile_costs = incremental.heuristic_costs(heuristic, puzzle)
+    if tile_costs is not None:
+        bound = incremental.evaluate(state, tile_costs, puzzle)
+    else:
+        bound = heuristic(state)
+    while True:
+        nodes = [0]
+        result = _bounded_search(state, bound, heuristic, moves, puzzle, nodes)
+        iterations.append(nodes[0])
+        if result == _FOUND or result is None:
+            break
+        bound = result
+
+    if stats is not None:
+        stats["iterations"] = iterations
+        stats["expanded"] = sum(iterations)
+    if result == _FOUND:
+        return moves
+    return None
+
+
+def _bounded_search(state: int, bound: int, heuristic, moves: List[int],
+                    puzzle, nodes: List[int]) -> Optional[int]:
+    """One IDA* iteration from state. moves holds the path so far and is
+    extended in place. Returns _FOUND if the goal was reached, else the
+    smallest f-cost over the bound (None if nothing was cut off).
+    """
+    goal = puzzle.solution()
+    tile_costs = incremental.heuristic_costs(heuristic, puzzle)
+
+    def search(state: int, blank: int, previous: int, g: int, h: int):
+        nodes[0] += 1
+        f = g + h
+        if f > bound:
+            return f
+        if state == goal:
+            return _FOUND
+        smallest = None
+        for square in puzzle.neighbors(blank):
+            # moving the blank back where it just was undoes the last move
+            if square == previous:
+                continue
+            moves.append(square)
+            if tile_costs is not None:
+                new_state, delta = incremental.move_blank_with_delta(
+                    state, blank, square, tile_costs, puzzle)
+                result = search(new_state, square, blank, g + 1, h + delta)
+            else:
+                new_state = puzzle.move_blank(state, square)
+                result = search(new_state, square, blank, g + 1,
+                                heuristic(new_state))
+            if result == _FOUND:
+                return _FOUND
+            moves.pop()
+            if result is not None and (smallest is None or result < smallest):
+                smallest = result
+        return smallest
+
+    if tile_costs is not None:
+        h = incremental.evaluate(state, tile_costs, puzzle)
+    else:
+        h = heuristic(state)
+    return search(state, puzzle.blank_square(state), -1, 0, h)
@@ -1,3 +1,5 @@
+import puzzle8 as p8
+import astar
 import itdeep
 import pytest
 import time
@@ -31,3 +33,30 @@ def test_itdeep(test_input, expected):
         " roughly constant")
     assert soln_path is not None
     assert len(soln_path) == expected
+
+
+def test_itdeep_already_solved():
+    assert itdeep.iterative_deepening_search(p8.solution()) == []
+
+
+@pytest.mark.parametrize("heuristic",
+                         [astar.num_wrong_tiles, astar.manhattan_distance])
+@pytest.mark.parametrize("test_input,expected",
+                         states_and_shortest_lengths + [(108306836, 16)],
+                         ids=ids + ["108306836"])
+def test_ida_star(test_input, expected, heuristic):
+    stats = {}
+    soln_path = itdeep.ida_star_search(test_input, heuristic, stats=stats)
+    assert soln_path is not None
+    assert len(soln_path) == expected
+    assert sum(stats["iterations"]) == stats["expanded"]
+
+    state = test_input
+    for square in soln_path:
+        state = p8.move_blank(state, square)
+    assert state == p8.solution()
+
+
+def test_depth_first_search():
+    assert len(itdeep.depth_first_search(247860748, 2, [])) == 2
+    assert itdeep.depth_first_search(253206748, 3, []) == []
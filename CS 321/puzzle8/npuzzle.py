@@ -0,0 +1,186 @@
+'''
+    npuzzle.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    The general n-puzzle (3x3, 4x4 and 5x5 boards), with the same functions
+    as puzzle8 so that bfs, astar and itdeep can be pointed at it through
+    their puzzle parameter.
+
+    Squares are numbered row by row from 0, as in puzzle8. A state packs each
+    tile into 4 bits (5 bits on a 5x5 board), with the tile in square i
+    stored at bit i * bits. The square of the blank is stored above the
+    tiles, so finding it is a single shift. For example, on the 15-puzzle
+
+     1  2  3  4
+     5  6  7  8      tile 1 is in bits 0-3, tile 2 in bits 4-7, ...,
+     9 10 11 12      the blank (0) in bits 60-63 and its square (15)
+    13 14 15  .      in bits 64-67
+
+    Since the blank is 0, sliding a tile is just two xors of the tile into
+    place plus one xor of the blank's square, all taken from tables built
+    when the puzzle is created.
+'''
+
+import random
+from typing import List, Optional
+import incremental
+
+
+class IllegalMoveException(Exception):
+    pass
+
+
+class IllegalSquareException(Exception):
+    pass
+
+
+class NPuzzle:
+    '''A width x width sliding puzzle. The methods mirror the functions in
+    puzzle8, so an NPuzzle can be passed anywhere puzzle8 is used.'''
+
+    def __init__(self, width: int, goal: Optional[List[int]] = None) -> None:
+        '''goal lists the tile in each square (0 for the blank). It defaults
+        to the tiles in order with the blank in the last square.'''
+        if width < 2 or width > 5:
+            raise ValueError("Width should be between 2 and 5")
+        self.width = width
+        self.num_squares = width * width
+        self.bits = 4 if self.num_squares <= 16 else 5
+        self._tile_mask = (1 << self.bits) - 1
+        self._blank_shift = self.num_squares * self.bits
+
+        self._neighbors = []
+        for square in range(self.num_squares):
+            row, col = divmod(square, width)
+            squares = []
+            if row > 0:
+                squares.append(square - width)
+            if col > 0:
+                squares.append(square - 1)
+            if col < width - 1:
+                squares.append(square + 1)
+            if row < width - 1:
+                squares.append(square + width)
+            self._neighbors.append(tuple(squares))
+
+        # _moves[source][dest] is (dest shift, source shift, blank xor)
+        self._moves = []
+        for source in range(self.num_squares):
+            self._moves.append({
+                dest: (dest * self.bits, source * self.bits,
+                       (source ^ dest) << self._blank_shift)
+                for dest in self._neighbors[source]})
+
+        if goal is None:
+            goal = list(range(1, self.num_squares)) + [0]
+        self._goal_tiles = list(goal)
+        self._goal = self.state(goal)
+
+        # Distance of each tile from its goal square, indexed by tile and then
+        # by square
+        goal_xy = [None] * self.num_squares
+        for square, tile in enumerate(goal):
+            goal_xy[tile] = self.xy_location(square)
+        self._manhattan = [[0] * self.num_squares]
+        for tile in range(1, self.num_squares):
+            goal_x, goal_y = goal_xy[tile]
+            self._manhattan.append([
+                abs(goal_x - x) + abs(goal_y - y)
+                for (x, y) in map(self.xy_location, range(self.num_squares))])
+
+    def state(self, pieces: List[int]) -> int:
+        '''Define a new state with the tile number indicated in each position
+        (use 0 for blank).'''
+        if sorted(pieces) != list(range(self.num_squares)):
+            raise Exception("List should be a permutation of 0 to "
+                            + str(self.num_squares - 1))
+        state = pieces.index(0) << self._blank_shift
+        for square, tile in enumerate(pieces):
+            state |= tile << (square * self.bits)
+        return state
+
+    def tiles(self, state: int) -> List[int]:
+        '''Returns the tile in each square, the inverse of state.'''
+        return [(state >> (square * self.bits)) & self._tile_mask
+                for square in range(self.num_squares)]
+
+    def move_blank(self, state: int, dest: int) -> int:
+        '''Move the blank from one square to another and return the
+        resulting state. Raises an exception if the move is not legal.'''
+        source = state >> self._blank_shift
+        try:
+            dest_shift, source_shift, blank_xor = self._moves[source][dest]
+        except KeyError:
+            raise IllegalMoveException(dest)
+        tile = (state >> dest_shift) & self._tile_mask
+        return state ^ (tile << dest_shift) ^ (tile << source_shift) ^ blank_xor
+
+    def blank_square(self, state: int) -> int:
+        '''Find the number of the square where the blank is.'''
+        return state >> self._blank_shift
+
+    def random_state(self, num_moves: int = 100) -> int:
+        '''Produces a random puzzle by randomly sliding puzzle pieces around
+        num_moves times, starting from the goal.'''
+        state = self._goal
+        for _ in range(num_moves):
+            choices = self._neighbors[self.blank_square(state)]
+            state = self.move_blank(
+                state, choices[random.randint(0, len(choices) - 1)])
+        return state
+
+    def neighbors(self, square: int):
+        '''The squares that can be reached from a given square.'''
+        if square < 0 or square >= self.num_squares:
+            raise IllegalSquareException(square)
+        return self._neighbors[square]
+
+    def get_tile(self, state: int, square: int) -> int:
+        '''Return the tile that occupies the given square.'''
+        return (state >> (square * self.bits)) & self._tile_mask
+
+    def display(self, state: int) -> None:
+        '''Display the puzzle associated with the given state.'''
+        field = len(str(self.num_squares - 1))
+        for square, tile in enumerate(self.tiles(state)):
+            print(('.' if tile == 0 else str(tile)).rjust(field), end=' ')
+            if (square + 1) % self.width == 0:
+                print()
+
+    def xy_location(self, square: int):
+        '''Return the (x y) location of a square number, where x represents
+        the column number, and y represents the row number.'''
+        return (square % self.width, square // self.width)
+
+    def solution(self) -> int:
+        '''Returns the state corresponding to the solution.'''
+        return self._goal
+
+    def num_wrong_tiles(self, state: int) -> int:
+        '''Number of tiles (not counting the blank) out of place.'''
+        wrong = 0
+        for square, tile in enumerate(self.tiles(state)):
+            if tile != 0 and tile != self._goal_tiles[square]:
+                wrong += 1
+        return wrong
+
+    def manhattan_distance(self, state: int) -> int:
+        '''Sum of the distances of every tile from its goal square.'''
+        distance = 0
+        for square, tile in enumerate(self.tiles(state)):
+            distance += self._manhattan[tile][square]
+        return distance
+
+
+# Both heuristics are sums of per-tile costs, so searches can update them one
+# move at a time; each puzzle's tables are built from its own goal (see
+# incremental.heuristic_costs)
+NPuzzle.num_wrong_tiles.tile_costs = incremental.wrong_tile_costs
+NPuzzle.manhattan_distance.tile_costs = incremental.manhattan_costs
+
+
+# The textbook 8-puzzle, with the same goal as puzzle8
+PUZZLE8 = NPuzzle(3, [1, 2, 3, 8, 0, 4, 7, 6, 5])
+PUZZLE15 = NPuzzle(4)
+PUZZLE24 = NPuzzle(5)
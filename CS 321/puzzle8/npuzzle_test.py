@@ -0,0 +1,86 @@
+import puzzle8 as p8
+import npuzzle
+from npuzzle import PUZZLE8, PUZZLE15, PUZZLE24
+import bfs
+import astar
+import itdeep
+import pytest
+import random
+
+
+def test_state():
+    assert PUZZLE8.tiles(PUZZLE8.solution()) == [1, 2, 3, 8, 0, 4, 7, 6, 5]
+    assert PUZZLE15.tiles(PUZZLE15.solution()) == list(range(1, 16)) + [0]
+    assert PUZZLE24.state(list(range(1, 25)) + [0]) == PUZZLE24.solution()
+
+
+def test_get_tile():
+    assert PUZZLE8.get_tile(PUZZLE8.solution(), 0) == 1
+    assert PUZZLE8.get_tile(PUZZLE8.solution(), 3) == 8
+    assert PUZZLE15.get_tile(PUZZLE15.solution(), 14) == 15
+    assert PUZZLE24.get_tile(PUZZLE24.solution(), 23) == 24
+
+
+def test_blank_square():
+    assert PUZZLE8.blank_square(PUZZLE8.solution()) == 4
+    assert PUZZLE15.blank_square(PUZZLE15.solution()) == 15
+    assert PUZZLE24.blank_square(PUZZLE24.solution()) == 24
+
+
+def test_move_blank():
+    state1 = PUZZLE8.state([1, 2, 3, 8, 0, 4, 7, 6, 5])
+    state2 = PUZZLE8.state([1, 0, 3, 8, 2, 4, 7, 6, 5])
+    assert PUZZLE8.move_blank(state1, 1) == state2
+    assert PUZZLE8.move_blank(state2, 4) == state1
+    with pytest.raises(npuzzle.IllegalMoveException):
+        PUZZLE8.move_blank(state1, 0)
+
+
+def test_neighbors():
+    assert set(PUZZLE8.neighbors(4)) == set([1, 3, 7, 5])
+    assert set(PUZZLE15.neighbors(15)) == set([11, 14])
+    assert set(PUZZLE24.neighbors(12)) == set([7, 11, 13, 17])
+    for square in range(9):
+        assert PUZZLE8.neighbors(square) == p8.neighbors(square)
+
+
+def test_xy_location():
+    assert PUZZLE8.xy_location(5) == (2, 1)
+    assert PUZZLE15.xy_location(7) == (3, 1)
+
+
+def test_random_state_matches_puzzle8():
+    random.seed(12345)
+    state = PUZZLE8.random_state(100)
+    assert PUZZLE8.tiles(state) == [p8.get_tile(108261756, i)
+                                    for i in range(9)]
+
+
+def test_heuristics():
+    state = PUZZLE8.state([8, 7, 6, 5, 4, 3, 2, 1, 0])
+    assert PUZZLE8.manhattan_distance(state) == 18
+    assert PUZZLE8.num_wrong_tiles(state) == 8
+    assert PUZZLE15.manhattan_distance(PUZZLE15.solution()) == 0
+
+
+def random_fifteen_puzzles():
+    random.seed(321)
+    return [PUZZLE15.random_state(12) for _ in range(5)]
+
+
+@pytest.mark.parametrize("state", random_fifteen_puzzles())
+def test_solvers_on_fifteen_puzzle(state):
+    solutions = [
+        bfs.breadth_first_search(state, puzzle=PUZZLE15),
+        bfs.breadth_first_search(state, bidirectional=True,
+                                 puzzle=PUZZLE15),
+        astar.astar_search(state, PUZZLE15.manhattan_distance,
+                           puzzle=PUZZLE15),
+        itdeep.iterative_deepening_search(state, puzzle=PUZZLE15)]
+    assert len(set(len(soln) for soln in solutions)) == 1
+
+    for soln in solutions:
+        current = state
+        for square in soln:
+            current = PUZZLE15.move_blank(current, square)
+        assert current == PUZZLE15.solution()
@@ -0,0 +1,262 @@
+'''
+    parallel_bfs.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Level-synchronous breadth first search across worker processes. Every
+    state is owned by one worker, picked by a hash of the state, and only
+    its owner stores it or expands it. For each level:
+
+      1. The coordinator tells every worker to expand its part of the
+         frontier.
+      2. Each worker sends the successors it generates, in batches, to the
+         workers that own them, followed by an end marker for every worker.
+      3. Each worker reads its inbox until it has an end marker from every
+         worker, keeps the states it hasn't seen, and reports how many there
+         were and whether the goal was among them.
+      4. The coordinator waits for all of the reports (the barrier between
+         levels) before starting the next level.
+
+    A worker keeps each level it owns as a sorted array of states, with an
+    array alongside holding the square the blank came from, instead of a set
+    of Python ints. Since every successor of a level d state is in level
+    d - 1, d or d + 1, only the last two levels are searched for duplicates.
+    Once the goal turns up, the path is rebuilt by asking each state's owner
+    where the blank came from. If a worker dies (of a MemoryError, say), the
+    coordinator notices while waiting for reports and raises RuntimeError
+    rather than waiting forever.
+
+    Running this module times the search with 1 to N workers. For example:
+
+        python parallel_bfs.py --max_workers 4 --count 5
+'''
+
+import argparse
+import bisect
+import importlib
+import multiprocessing
+import queue
+import random
+import time
+import types
+from array import array
+from typing import List, Optional
+import puzzle8 as p8
+import external_bfs
+import tracked8
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK = (1 << 64) - 1
+
+
+def owner(state: int, workers: int) -> int:
+    '''The worker that owns state. The state is mixed first, since puzzle8
+    states aren't spread evenly by a plain modulus (every base 9 digit is 1
+    mod 8, for one).'''
+    return (((state * _HASH_MULTIPLIER) & _MASK) >> 32) % workers
+
+
+def _find(levels: List[array], depth: int, state: int) -> int:
+    # index of state in the given level, or -1
+    level = levels[depth]
+    i = bisect.bisect_left(level, state)
+    if i < len(level) and level[i] == state:
+        return i
+    return -1
+
+
+def _worker(me, workers, puzzle, start, batch_size, inboxes, commands,
+            results) -> None:
+    if isinstance(puzzle, str):
+        puzzle = importlib.import_module(puzzle)
+    goal = puzzle.solution()
+    levels = [array("Q", [start] if owner(start, workers) == me else [])]
+    sources = [array("b", [-1] * len(levels[0]))]
+    results.put((len(levels[0]), goal in levels[0]))
+
+    while True:
+        command = commands.get()
+        if command[0] == "stop":
+            return
+        if command[0] == "source":
+            _, depth, state = command
+            results.put(sources[depth][_find(levels, depth, state)])
+            continue
+
+        # expand this worker's part of the frontier
+        outgoing = [(array("Q"), array("b")) for _ in range(workers)]
+        for state in levels[-1]:
+            blank = puzzle.blank_square(state)
+            for square in puzzle.neighbors(blank):
+                dest = puzzle.move_blank(state, square)
+                states, blanks = outgoing[owner(dest, workers)]
+                states.append(dest)
+                blanks.append(blank)
+                if len(states) == batch_size:
+                    inboxes[owner(dest, workers)].put((states, blanks))
+                    outgoing[owner(dest, workers)] = (array("Q"), array("b"))
+        for other, batch in enumerate(outgoing):
+            if batch[0]:
+                inboxes[other].put(batch)
+            inboxes[other].put(None)
+
+        # collect the successors this worker owns
+        depth = len(levels) - 1
+        new = {}
+        ends = 0
+        while ends < workers:
+            batch = inboxes[me].get()
+            if batch is None:
+                ends += 1
+                continue
+            for dest, blank in zip(*batch):
+                if (dest not in new and _find(levels, depth, dest) < 0
+                        and (depth == 0
+                             or _find(levels, depth - 1, dest) < 0)):
+                    new[dest] = blank
+        level = array("Q", sorted(new))
+        levels.append(level)
+        sources.append(array("b", [new[state] for state in level]))
+        results.put((len(level), goal in new))
+
+
+# How often, in seconds, the coordinator checks that the workers are alive
+# while it waits for them
+POLL_SECONDS = 0.5
+
+
+def _receive(results, processes):
+    # the next report, unless a worker has died first
+    while True:
+        try:
+            return results.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            for process in processes:
+                if not process.is_alive():
+                    raise RuntimeError(
+                        "A worker process died (exit code "
+                        + str(process.exitcode) + ")")
+
+
+def parallel_breadth_first_search(state, workers: Optional[int] = None,
+                                  puzzle=p8, batch_size: int = 4096,
+                                  stats=None) -> Optional[List[int]]:
+    '''Finds a shortest path to the goal using workers processes (defaults
+    to the number of CPUs). Returns the list of squares the blank moves to,
+    like bfs.breadth_first_search, or None if the goal can't be reached.
+    Successors are sent between workers batch_size at a time. puzzle can be
+    a module such as puzzle8 or tracked8 (the workers import it by name) or
+    a picklable object such as an npuzzle.NPuzzle whose states fit in 64
+    bits. If a stats dict is given, the numbers of states expanded and of
+    levels are stored in it.'''
+    if external_bfs.state_bytes(puzzle) > 8:
+        raise ValueError("States need to fit in 64 bits")
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    puzzle_arg = puzzle.__name__ if isinstance(puzzle,
+                                               types.ModuleType) else puzzle
+
+    inboxes = [multiprocessing.Queue() for _ in range(workers)]
+    commands = [multiprocessing.Queue() for _ in range(workers)]
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(
+        target=_worker, args=(me, workers, puzzle_arg, state, batch_size,
+                              inboxes, commands[me], results))
+        for me in range(workers)]
+    for process in processes:
+        process.start()
+
+    def gather():
+        reports = [_receive(results, processes) for _ in range(workers)]
+        return (sum(count for (count, _) in reports),
+                any(found for (_, found) in reports))
+
+    expanded = 0
+    depth = 0
+    solution = None
+    try:
+        count, found = gather()
+        while count and not found:
+            for command in commands:
+                command.put(("expand",))
+            expanded += count
+            depth += 1
+            count, found = gather()
+
+        if found:
+            # walk back from the goal, asking each state's owner where the
+            # blank came from
+            solution = []
+            currState = puzzle.solution()
+            for level in range(depth, 0, -1):
+                commands[owner(currState, workers)].put(
+                    ("source", level, currState))
+                solution.append(puzzle.blank_square(currState))
+                currState = puzzle.move_blank(currState,
+                                              _receive(results, processes))
+            solution.reverse()
+    except BaseException:
+        # the others may be waiting for batches from a worker that is gone
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for command in commands:
+            command.put(("stop",))
+        for process in processes:
+            process.join()
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["levels"] = depth + 1
+    return solution
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """ Parse command line arguments.
+    """
+    p = argparse.ArgumentParser()
+
+    p.add_argument("--max_workers", type=int,
+                   default=multiprocessing.cpu_count(), help=(
+                       "Largest number of workers to time. Defaults to the"
+                       " number of CPUs."))
+
+    p.add_argument("--count", type=int, default=3, help=(
+        "Number of random puzzles to solve. Default=3."))
+
+    p.add_argument("--moves", type=int, default=100, help=(
+        "Number of random moves used to make each puzzle. Default=100."))
+
+    p.add_argument("--seed", type=int, default=12345, help=(
+        "Seed for generating the puzzles. Default=12345."))
+
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    random.seed(args.seed)
+    # tracked8 finds the blank without scanning, which leaves more of the
+    # time for the part that is being parallelized
+    states = [tracked8.random_state(args.moves) for _ in range(args.count)]
+
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}{'expanded':>10}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        expanded = 0
+        time_before = time.perf_counter()
+        for state in states:
+            stats = {}
+            parallel_breadth_first_search(state, workers, puzzle=tracked8,
+                                          stats=stats)
+            expanded += stats["expanded"]
+        seconds = time.perf_counter() - time_before
+        if baseline is None:
+            baseline = seconds
+        print(f"{workers:>8}{seconds:>10.2f}{baseline / seconds:>10.2f}"
+              f"{expanded:>10}")
+
+
+if __name__ == '__main__':
+    main()
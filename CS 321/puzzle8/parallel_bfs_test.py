@@ -0,0 +1,100 @@
+import puzzle8 as p8
+import bfs
+import parallel_bfs
+import tracked8
+from npuzzle import NPuzzle, PUZZLE8
+from functools import reduce
+import itertools
+import os
+import random
+import pytest
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+]
+
+workers = [1, 3]
+
+cases = list(itertools.product(states_and_shortest_lengths, workers))
+
+ids = [str(state) + " " + str(n) for ((state, steps), n) in cases]
+
+
+@pytest.mark.parametrize("test_input_pair,workers", cases, ids=ids)
+def test_parallel_bfs(test_input_pair, workers):
+    (test_input, expected) = test_input_pair
+    soln_path = parallel_bfs.parallel_breadth_first_search(test_input,
+                                                           workers)
+    assert len(soln_path) == expected
+    assert len(soln_path) == len(bfs.breadth_first_search(test_input))
+    assert reduce(p8.move_blank, soln_path, test_input) == p8.solution()
+
+
+def test_owner_spreads_states():
+    random.seed(12345)
+    states = [p8.random_state(30) for _ in range(200)]
+    counts = [0] * 4
+    for state in states:
+        counts[parallel_bfs.owner(state, 4)] += 1
+    assert min(counts) > 25
+
+
+def test_parallel_bfs_stats_match_across_workers():
+    first = {}
+    second = {}
+    parallel_bfs.parallel_breadth_first_search(300501380, 1, stats=first)
+    parallel_bfs.parallel_breadth_first_search(300501380, 2, stats=second)
+    assert first == second
+    assert first["levels"] == 13
+
+
+def test_parallel_bfs_already_solved():
+    assert parallel_bfs.parallel_breadth_first_search(p8.solution(), 2) == []
+
+
+def test_parallel_bfs_tracked():
+    soln_path = parallel_bfs.parallel_breadth_first_search(
+        tracked8.from_state(108306836), 2, puzzle=tracked8)
+    assert len(soln_path) == 16
+
+
+def test_parallel_bfs_npuzzle():
+    state = PUZZLE8.state([0, 2, 1, 3, 5, 8, 4, 6, 7])
+    soln_path = parallel_bfs.parallel_breadth_first_search(state, 2,
+                                                           puzzle=PUZZLE8)
+    assert len(soln_path) == 30
+
+
+def test_parallel_bfs_unsolvable():
+    puzzle = NPuzzle(2)
+    state = puzzle.state([2, 1, 3, 0])
+    assert parallel_bfs.parallel_breadth_first_search(state, 2,
+                                                      puzzle=puzzle) is None
+
+
+def test_parallel_bfs_wide_states():
+    with pytest.raises(ValueError):
+        parallel_bfs.parallel_breadth_first_search(0, 2, puzzle=NPuzzle(4))
+
+
+class CrashingPuzzle(NPuzzle):
+    # kills the worker that expands anything but the start state
+    def __init__(self, width, start) -> None:
+        super().__init__(width)
+        self.start = start
+
+    def move_blank(self, state, square):
+        if state != self.start:
+            os._exit(1)
+        return super().move_blank(state, square)
+
+
+def test_parallel_bfs_dead_worker():
+    start = PUZZLE8.state([0, 2, 1, 3, 5, 8, 4, 6, 7])
+    with pytest.raises(RuntimeError):
+        parallel_bfs.parallel_breadth_first_search(
+            start, 2, puzzle=CrashingPuzzle(3, start))
@@ -0,0 +1,218 @@
+'''
+    pattern_db.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Disjoint additive pattern databases, for use as astar_search heuristics.
+
+    The tiles are split into disjoint groups (e.g. 1-4 and 5-8 on the
+    8-puzzle, or 5-5-5 and 6-6-3 on the 15-puzzle). For each group, a
+    backward search from the goal finds the fewest moves of that group's
+    tiles needed to get them all home, ignoring every other tile (moves of
+    other tiles are free). Since every move only moves one tile, the values
+    of disjoint groups can be added and still never overestimate.
+
+    Each group's table has one byte per placement of its tiles, indexed by
+    the rank of the squares they occupy, so a group of k tiles on n squares
+    takes n!/(n-k)! bytes. Tables are written to disk as raw bytes and
+    memory-mapped when loaded.
+
+    Building is done in pure Python. On the 15-puzzle a group of 5 tiles
+    takes under a minute and a group of 6 several minutes, so 5-5-5 and
+    6-6-3 are practical. A 7-8 partition needs hours and over 8 GB while
+    building, but only has to be built once.
+'''
+
+import mmap
+import os
+from typing import List, Sequence
+import safe_write
+
+UNREACHED = 255
+
+
+def _num_squares(puzzle) -> int:
+    # puzzle8 itself doesn't say how big it is
+    return getattr(puzzle, "num_squares", 9)
+
+
+def _multipliers(n: int, k: int) -> List[int]:
+    '''Place values used to rank a placement of k tiles on n squares.'''
+    multipliers = []
+    for i in range(k):
+        m = 1
+        for j in range(n - k + 1, n - i):
+            m *= j
+        multipliers.append(m)
+    return multipliers
+
+
+def _rank(placement: Sequence[int], multipliers: List[int]) -> int:
+    # each square is counted among the squares not used by earlier tiles
+    r = 0
+    for i, square in enumerate(placement):
+        smaller = 0
+        for j in range(i):
+            if placement[j] < square:
+                smaller += 1
+        r += (square - smaller) * multipliers[i]
+    return r
+
+
+def table_size(puzzle, pattern: Sequence[int]) -> int:
+    '''Number of entries in the table for the given group of tiles.'''
+    n = _num_squares(puzzle)
+    size = 1
+    for i in range(len(pattern)):
+        size *= n - i
+    return size
+
+
+def build_table(puzzle, pattern: Sequence[int]) -> bytearray:
+    '''Builds the table for one group of tiles. Entry i holds the fewest
+    moves of the group's tiles needed to solve the placement ranked i.'''
+    n = _num_squares(puzzle)
+    k = len(pattern)
+    multipliers = _multipliers(n, k)
+    size = table_size(puzzle, pattern)
+
+    goal = puzzle.solution()
+    goal_tiles = [puzzle.get_tile(goal, square) for square in range(n)]
+    placement = tuple(goal_tiles.index(tile) for tile in pattern)
+    blank = goal_tiles.index(0)
+
+    # Costs of (placement, blank) pairs; the blank matters while searching
+    # since it decides which tiles can move, but not in the final table.
+    costs = bytearray([UNREACHED]) * (size * n)
+    r = _rank(placement, multipliers)
+    costs[r * n + blank] = 0
+    level = [(placement, r, blank)]
+    cost = 0
+
+    # Each level holds the pairs at the same cost. Sliding a tile outside the
+    # group keeps the cost, so those moves are flooded within the level;
+    # sliding a group tile costs one and goes to the next level.
+    while level:
+        next_level = []
+        stack = level
+        while stack:
+            placement, r, blank = stack.pop()
+            if costs[r * n + blank] != cost:
+                # was found again more cheaply
+                continue
+            for square in puzzle.neighbors(blank):
+                if square in placement:
+                    moved = list(placement)
+                    moved[placement.index(square)] = blank
+                    moved_rank = _rank(moved, multipliers)
+                    index = moved_rank * n + square
+                    if costs[index] == UNREACHED:
+                        costs[index] = cost + 1
+                        next_level.append((tuple(moved), moved_rank, square))
+                else:
+                    index = r * n + square
+                    if costs[index] > cost:
+                        costs[index] = cost
+                        stack.append((placement, r, square))
+        level = next_level
+        cost += 1
+
+    table = bytearray(size)
+    for r in range(size):
+        table[r] = min(costs[r * n:(r + 1) * n])
+    return table
+
+
+class PatternDatabase:
+    '''Sum of the tables for a partition of the tiles. Calling it on a state
+    returns the heuristic value, so it can be passed straight to
+    astar_search.'''
+
+    def __init__(self, puzzle, partition: Sequence[Sequence[int]],
+                 tables) -> None:
+        self.puzzle = puzzle
+        self.partition = [tuple(pattern) for pattern in partition]
+        self.tables = list(tables)
+        self._n = _num_squares(puzzle)
+        self._multipliers = [_multipliers(self._n, len(pattern))
+                             for pattern in self.partition]
+
+    def __call__(self, state) -> int:
+        where = [0] * self._n
+        for square in range(self._n):
+            where[self.puzzle.get_tile(state, square)] = square
+        total = 0
+        for pattern, multipliers, table in zip(
+                self.partition, self._multipliers, self.tables):
+            total += table[_rank([where[tile] for tile in pattern],
+                                 multipliers)]
+        return total
+
+    def save(self, directory: str) -> None:
+        '''Writes each table to its own file in directory.'''
+        os.makedirs(directory, exist_ok=True)
+        for pattern, table in zip(self.partition, self.tables):
+            with safe_write.replacing(
+                    table_path(self.puzzle, pattern, directory)) as f:
+                f.write(table)
+
+    def close(self) -> None:
+        for table in self.tables:
+            if isinstance(table, mmap.mmap):
+                table.close()
+
+
+def table_path(puzzle, pattern: Sequence[int], directory: str) -> str:
+    '''Where the table for the given group of tiles lives in directory.'''
+    name = "pdb" + str(_num_squares(puzzle)) + "_" + "-".join(
+        str(tile) for tile in pattern) + ".bin"
+    return os.path.join(directory, name)
+
+
+def build(puzzle, partition: Sequence[Sequence[int]]) -> PatternDatabase:
+    '''Builds the tables for every group in the partition.'''
+    _check_partition(puzzle, partition)
+    return PatternDatabase(puzzle, partition,
+                           [build_table(puzzle, pattern)
+                            for pattern in partition])
+
+
+def load(puzzle, partition: Sequence[Sequence[int]],
+         directory: str) -> PatternDatabase:
+    '''Memory-maps the tables for the partition from directory, building and
+    saving any that are missing first.'''
+    _check_partition(puzzle, partition)
+    os.makedirs(directory, exist_ok=True)
+    tables = []
+    for pattern in partition:
+        path = table_path(puzzle, pattern, directory)
+        if not os.path.exists(path):
+            table = build_table(puzzle, pattern)
+            with safe_write.replacing(path) as f:
+                f.write(table)
+        with open(path, "rb") as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(table) != table_size(puzzle, pattern):
+            table.close()
+            raise ValueError("Pattern database has the wrong size: " + path)
+        tables.append(table)
+    return PatternDatabase(puzzle, partition, tables)
+
+
+def _check_partition(puzzle, partition) -> None:
+    tiles = [tile for pattern in partition for tile in pattern]
+    if len(tiles) != len(set(tiles)):
+        raise ValueError("Groups in a partition can't share tiles")
+    if not all(0 < tile < _num_squares(puzzle) for tile in tiles):
+        raise ValueError("Partition should only contain tiles 1 to "
+                         + str(_num_squares(puzzle) - 1))
+
+
+def parse_partition(text: str) -> List[List[int]]:
+    '''Parses a partition written like "1,2,3,4/5,6,7,8".'''
+    return [[int(tile) for tile in group.split(",")]
+            for group in text.split("/")]
+
+
+# A partition that works for puzzle8 (and npuzzle.PUZZLE8)
+PUZZLE8_PARTITION = [[1, 2, 3, 4], [5, 6, 7, 8]]
@@ -0,0 +1,92 @@
+'''
+    pattern_db_benchmark.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Compares A* with a pattern database against A* with Manhattan distance,
+    on random puzzles. For example:
+
+        python pattern_db_benchmark.py --width 4 --moves 40 --count 5
+'''
+
+import argparse
+import os
+import random
+import time
+import astar
+import pattern_db
+from npuzzle import PUZZLE8, PUZZLE15, PUZZLE24
+
+PUZZLES = {3: PUZZLE8, 4: PUZZLE15, 5: PUZZLE24}
+
+DEFAULT_PARTITIONS = {
+    3: "1,2,3,4/5,6,7,8",
+    4: "1,2,3,4,5/6,7,8,9,10/11,12,13,14,15",
+    5: "1,2,3,4/5,6,7,8/9,10,11,12/13,14,15,16/17,18,19,20/21,22,23,24",
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """ Parse command line arguments.
+    """
+    p = argparse.ArgumentParser()
+
+    p.add_argument("--width", type=int, default=4, choices=[3, 4, 5], help=(
+        "Width of the puzzle. Default=4."))
+
+    p.add_argument("--partition", type=str, default=None, help=(
+        "Groups of tiles, separated by slashes, e.g. \"1,2,3/4,5,6,7,8\"."
+        " Defaults to 4-4 for the 8-puzzle and 5-5-5 for the 15-puzzle."))
+
+    p.add_argument("--directory", type=str, default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "pdb"), help=(
+        "Where tables are saved and loaded from. Missing tables are built."))
+
+    p.add_argument("--count", type=int, default=5, help=(
+        "Number of random puzzles to solve. Default=5."))
+
+    p.add_argument("--moves", type=int, default=40, help=(
+        "Number of random moves used to make each puzzle. Default=40."))
+
+    p.add_argument("--seed", type=int, default=12345, help=(
+        "Seed for generating the puzzles. Default=12345."))
+
+    return p.parse_args()
+
+
+def run(puzzle, states, heuristic):
+    '''Solves every state, returning total nodes expanded and seconds.'''
+    expanded = 0
+    time_before = time.time()
+    for state in states:
+        stats = {}
+        astar.astar_search(state, heuristic, puzzle=puzzle, stats=stats)
+        expanded += stats["expanded"]
+    return expanded, time.time() - time_before
+
+
+def main() -> None:
+    args = parse_args()
+
+    puzzle = PUZZLES[args.width]
+    partition = pattern_db.parse_partition(
+        args.partition or DEFAULT_PARTITIONS[args.width])
+
+    time_before = time.time()
+    database = pattern_db.load(puzzle, partition, args.directory)
+    print("Time to load (or build) tables =", time.time() - time_before)
+
+    random.seed(args.seed)
+    states = [puzzle.random_state(args.moves) for _ in range(args.count)]
+
+    print(f"{'heuristic':<20}{'nodes expanded':>16}{'seconds':>12}")
+    for name, heuristic in [("manhattan", puzzle.manhattan_distance),
+                            ("pattern database", database)]:
+        expanded, seconds = run(puzzle, states, heuristic)
+        print(f"{name:<20}{expanded:>16}{seconds:>12.3f}")
+
+    database.close()
+
+
+if __name__ == '__main__':
+    main()
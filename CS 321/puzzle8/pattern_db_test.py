@@ -0,0 +1,85 @@
+import puzzle8 as p8
+import astar
+import pattern_db
+from npuzzle import PUZZLE8, PUZZLE15
+import pytest
+import random
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+
+@pytest.fixture(scope="module")
+def database():
+    return pattern_db.build(p8, pattern_db.PUZZLE8_PARTITION)
+
+
+def test_goal_is_zero(database):
+    assert database(p8.solution()) == 0
+
+
+def test_dominates_manhattan(database):
+    random.seed(12345)
+    for _ in range(100):
+        state = p8.random_state(30)
+        assert database(state) >= astar.manhattan_distance(state)
+
+
+@pytest.mark.parametrize("test_input,expected", states_and_shortest_lengths)
+def test_admissible_and_optimal(database, test_input, expected):
+    assert database(test_input) <= expected
+    soln_path = astar.astar_search(test_input, database)
+    assert len(soln_path) == expected
+
+
+def test_save_and_load(database, tmp_path):
+    database.save(str(tmp_path))
+    loaded = pattern_db.load(p8, pattern_db.PUZZLE8_PARTITION, str(tmp_path))
+    random.seed(12345)
+    for _ in range(20):
+        state = p8.random_state(30)
+        assert loaded(state) == database(state)
+    loaded.close()
+
+
+def test_npuzzle_tables(tmp_path):
+    # the same tables work for the packed encoding of the same puzzle
+    loaded = pattern_db.load(PUZZLE8, pattern_db.PUZZLE8_PARTITION,
+                             str(tmp_path))
+    state = PUZZLE8.state([8, 7, 6, 5, 4, 3, 2, 1, 0])
+    assert loaded(state) >= PUZZLE8.manhattan_distance(state)
+    loaded.close()
+
+
+def test_interrupted_build_leaves_no_file(tmp_path, monkeypatch):
+    def interrupted(puzzle, pattern):
+        raise KeyboardInterrupt()
+    monkeypatch.setattr(pattern_db, "build_table", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        pattern_db.load(p8, pattern_db.PUZZLE8_PARTITION, str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_fifteen_puzzle_small_groups():
+    database = pattern_db.build(PUZZLE15, [[1, 2, 3], [4, 5, 6]])
+    assert database(PUZZLE15.solution()) == 0
+    random.seed(12345)
+    state = PUZZLE15.random_state(10)
+    assert len(astar.astar_search(state, database, puzzle=PUZZLE15)) <= 10
+
+
+def test_bad_partition():
+    with pytest.raises(ValueError):
+        pattern_db.build(p8, [[1, 2], [2, 3]])
+    with pytest.raises(ValueError):
+        pattern_db.build(p8, [[1, 9]])
+
+
+def test_parse_partition():
+    assert pattern_db.parse_partition("1,2,3/4,5") == [[1, 2, 3], [4, 5]]
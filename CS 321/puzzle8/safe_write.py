@@ -0,0 +1,47 @@
+'''
+    safe_write.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Writing a file that other processes may be reading (or memory-mapping)
+    at the same time. The data goes to a temporary file in the same
+    directory, which is renamed over the real one only once it is complete,
+    so a reader sees either the old file or the new one, never a partial
+    one, and a writer that is interrupted leaves the old file alone.
+
+        with safe_write.replacing(path) as f:
+            f.write(table)
+
+    Temporary files are named after the file they replace, with a random
+    part and .tmp added, and are removed if the write fails.
+'''
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def _umask() -> int:
+    # the only way to read the umask is to set it
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+@contextmanager
+def replacing(path: str, mode: str = "wb"):
+    '''Opens a temporary file next to path for writing in mode ("wb" or
+    "w"), and moves it to path when the with block finishes. The file gets
+    the permissions open would have given it, rather than the owner-only
+    ones of a temporary file, so other users can still read it.'''
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, mode) as f:
+            yield f
+        os.chmod(temporary, 0o666 & ~_umask())
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
@@ -0,0 +1,39 @@
+import safe_write
+import os
+import stat
+import pytest
+
+
+@pytest.mark.parametrize("umask", [0o022, 0o002, 0o077])
+def test_permissions_follow_umask(tmp_path, umask):
+    path = str(tmp_path / "table.bin")
+    old = os.umask(umask)
+    try:
+        with safe_write.replacing(path) as f:
+            f.write(b"table")
+    finally:
+        os.umask(old)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+    with open(path, "rb") as f:
+        assert f.read() == b"table"
+
+
+def test_failed_write_keeps_old_file(tmp_path):
+    path = str(tmp_path / "table.bin")
+    with safe_write.replacing(path) as f:
+        f.write(b"old")
+    with pytest.raises(KeyboardInterrupt):
+        with safe_write.replacing(path) as f:
+            f.write(b"partial")
+            raise KeyboardInterrupt()
+    with open(path, "rb") as f:
+        assert f.read() == b"old"
+    assert os.listdir(str(tmp_path)) == ["table.bin"]
+
+
+def test_text_mode(tmp_path):
+    path = str(tmp_path / "manifest.json")
+    with safe_write.replacing(path, "w") as f:
+        f.write("{}")
+    with open(path) as f:
+        assert f.read() == "{}"
@@ -0,0 +1,211 @@
+'''
+    smastar.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    Simplified memory-bounded A* (SMA*). The search tree never holds more
+    than max_nodes nodes. When it is full, the worst leaf (highest f, and
+    shallowest among those) is dropped, and its f-value is backed up into
+    its parent, which remembers it so that it knows when the forgotten
+    subtree is worth regenerating. Like A*, it returns an optimal solution
+    as long as the cap leaves room for an optimal path; if the cap is too
+    small for any solution, it returns None.
+
+    If a stats dict is given, the numbers of nodes expanded, generated,
+    regenerated (generated again after being forgotten) and forgotten are
+    stored in it, along with the most nodes held at once, which helps with
+    sizing the cap.
+'''
+
+import heapq
+import itertools
+from typing import List, Optional
+import puzzle8 as p8
+import incremental
+
+INFINITY = float("inf")
+
+
+class _Node:
+    '''A node in the search tree.'''
+
+    __slots__ = ("state", "parent", "square", "g", "depth", "f", "expanded",
+                 "pending", "forgotten", "children", "alive")
+
+    def __init__(self, state, parent, square, g, f) -> None:
+        self.state = state
+        self.parent = parent
+        # square the blank moved to in order to reach this node
+        self.square = square
+        self.g = g
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.f = f
+        self.expanded = False
+        # successors not in memory, by the square the blank moves to, with
+        # their f-values (estimated, or backed up when they were forgotten)
+        self.pending = {}
+        self.forgotten = set()
+        self.children = []
+        self.alive = True
+
+    def priority(self):
+        '''How promising the next node generated from here is.'''
+        if not self.expanded:
+            return self.f
+        if self.pending:
+            return min(self.pending.values())
+        return None
+
+
+def sma_star_search(state: int, heuristic, max_nodes: int, puzzle=p8,
+                    stats=None) -> Optional[List[int]]:
+    '''Finds a path to the goal while keeping at most max_nodes nodes in
+    memory. Returns the squares the blank moves to, or None.'''
+    if max_nodes < 1:
+        raise ValueError("max_nodes should be at least 1")
+
+    goal = puzzle.solution()
+    tile_costs = incremental.heuristic_costs(heuristic, puzzle)
+
+    def evaluate(state):
+        if tile_costs is not None:
+            return incremental.evaluate(state, tile_costs, puzzle)
+        return heuristic(state)
+
+    order = itertools.count()
+    root = _Node(state, None, None, 0, evaluate(state))
+
+    # Both heaps use lazy deletion: entries are checked against the node
+    # when they come to the top.
+    # open_heap: (priority, -depth, order, node), best node to work on first
+    # leaf_heap: (-f, depth, order, node), worst leaf first
+    open_heap = [(root.f, 0, next(order), root)]
+    leaf_heap = []
+    used = 1
+    most_used = 1
+    expanded = 0
+    generated = 1
+    regenerated = 0
+    forgotten = 0
+    solution = None
+
+    def push_open(node):
+        priority = node.priority()
+        if priority is not None:
+            heapq.heappush(open_heap,
+                           (priority, -node.depth, next(order), node))
+
+    def push_leaf(node):
+        if node.parent is not None and not node.children:
+            heapq.heappush(leaf_heap, (-node.f, node.depth, next(order), node))
+
+    def backup(node):
+        # An expanded node's f is the smallest f among its successors, in
+        # memory or not; changes are passed up to the ancestors.
+        while node is not None and node.expanded:
+            values = [child.f for child in node.children]
+            values.extend(node.pending.values())
+            new_f = min(values) if values else INFINITY
+            if new_f == node.f:
+                break
+            node.f = new_f
+            push_open(node)
+            push_leaf(node)
+            node = node.parent
+
+    def forget_worst_leaf(keep):
+        nonlocal used, forgotten
+        kept = []
+        while leaf_heap:
+            entry = heapq.heappop(leaf_heap)
+            leaf = entry[3]
+            if not leaf.alive or leaf.children or -entry[0] != leaf.f:
+                continue
+            if leaf is keep:
+                kept.append(entry)
+                continue
+            parent = leaf.parent
+            parent.children.remove(leaf)
+            parent.pending[leaf.square] = leaf.f
+            parent.forgotten.add(leaf.square)
+            leaf.alive = False
+            used -= 1
+            forgotten += 1
+            push_open(parent)
+            push_leaf(parent)
+            break
+        for entry in kept:
+            heapq.heappush(leaf_heap, entry)
+
+    while open_heap:
+        priority, _, _, node = heapq.heappop(open_heap)
+        if not node.alive or priority != node.priority():
+            continue
+        if priority == INFINITY:
+            # nothing left that fits in memory
+            break
+
+        if not node.expanded:
+            if node.state == goal:
+                solution = []
+                while node.parent is not None:
+                    solution.append(node.square)
+                    node = node.parent
+                solution.reverse()
+                break
+
+            # Work out every successor's f-value at once. States already on
+            # the path are skipped, and so is anything that could only lead
+            # to a path too long to fit in memory.
+            node.expanded = True
+            expanded += 1
+            ancestors = set()
+            ancestor = node.parent
+            while ancestor is not None:
+                ancestors.add(ancestor.state)
+                ancestor = ancestor.parent
+            blank = puzzle.blank_square(node.state)
+            for square in puzzle.neighbors(blank):
+                dest = puzzle.move_blank(node.state, square)
+                if dest in ancestors:
+                    continue
+                if node.depth + 2 > max_nodes or (
+                        node.depth + 2 == max_nodes and dest != goal):
+                    node.pending[square] = INFINITY
+                else:
+                    node.pending[square] = max(node.f,
+                                               node.g + 1 + evaluate(dest))
+            # a dead end backs up an f of infinity, so it is forgotten first
+            backup(node)
+            push_open(node)
+            if node.priority() is None or node.priority() == INFINITY:
+                continue
+
+        # Generate the most promising successor that isn't in memory.
+        square = min(node.pending, key=node.pending.get)
+        f = node.pending.pop(square)
+        child = _Node(puzzle.move_blank(node.state, square), node, square,
+                      node.g + 1, f)
+        node.children.append(child)
+        generated += 1
+        if square in node.forgotten:
+            node.forgotten.discard(square)
+            regenerated += 1
+        used += 1
+        push_open(child)
+        push_leaf(child)
+        push_open(node)
+
+        # Make room by dropping the worst leaf other than the new child. There
+        # is always one, since a path as long as the cap is never extended.
+        if used > max_nodes:
+            forget_worst_leaf(child)
+        most_used = max(most_used, used)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["generated"] = generated
+        stats["regenerated"] = regenerated
+        stats["forgotten"] = forgotten
+        stats["most_used"] = most_used
+    return solution
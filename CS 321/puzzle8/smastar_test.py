@@ -0,0 +1,75 @@
+import puzzle8 as p8
+import astar
+import smastar
+import tracked8
+import pytest
+import random
+import itertools
+from functools import reduce
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+heuristics = [astar.num_wrong_tiles, astar.manhattan_distance]
+
+caps = [30, 1000]
+
+cases = list(itertools.product(states_and_shortest_lengths, heuristics, caps))
+
+ids = [str(state) + " " + heuristic.__name__ + " " + str(cap)
+       for ((state, steps), heuristic, cap) in cases]
+
+
+@pytest.mark.parametrize("test_input_pair,heuristic,cap", cases, ids=ids)
+def test_sma_star(test_input_pair, heuristic, cap):
+    (test_input, expected) = test_input_pair
+    stats = {}
+    soln_path = smastar.sma_star_search(test_input, heuristic, cap,
+                                        stats=stats)
+    assert len(soln_path) == expected
+    assert reduce(p8.move_blank, soln_path, test_input) == p8.solution()
+    assert stats["most_used"] <= cap
+
+
+def test_sma_star_tight_cap():
+    # room for the optimal path and nothing else
+    random.seed(12345)
+    state = p8.random_state(100)
+    optimal = len(astar.astar_search(state, astar.manhattan_distance))
+    stats = {}
+    soln_path = smastar.sma_star_search(state, astar.manhattan_distance,
+                                        optimal + 1, stats=stats)
+    assert len(soln_path) == optimal
+    assert stats["most_used"] == optimal + 1
+    assert stats["regenerated"] > 0
+    assert stats["forgotten"] > 0
+
+
+def test_sma_star_cap_too_small():
+    assert smastar.sma_star_search(247860748, astar.manhattan_distance,
+                                   2) is None
+    assert smastar.sma_star_search(247860748, astar.manhattan_distance,
+                                   3) == [5, 4]
+
+
+def test_sma_star_already_solved():
+    assert smastar.sma_star_search(p8.solution(), astar.manhattan_distance,
+                                   1) == []
+
+
+def test_sma_star_tracked():
+    soln_path = smastar.sma_star_search(tracked8.from_state(108306836),
+                                        astar.manhattan_distance, 30,
+                                        puzzle=tracked8)
+    assert len(soln_path) == 16
+
+
+def test_sma_star_bad_cap():
+    with pytest.raises(ValueError):
+        smastar.sma_star_search(247860748, astar.manhattan_distance, 0)
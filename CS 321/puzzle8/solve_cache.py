@@ -0,0 +1,114 @@
+'''
+    solve_cache.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    An LRU cache in front of any of the solvers, keyed by the encoded state.
+    Any part of a shortest path that ends at the goal is also a shortest
+    path, so when the solver is optimal, every state along a returned path
+    is cached with the rest of the path as its solution. A later query for
+    any of those states is answered without searching. The moves of one
+    path are stored once and shared by all of its states.
+
+    The cache holds at most max_entries states; the least recently used are
+    evicted first. Hit, miss and eviction counts are kept for monitoring.
+    For example:
+
+        cache = SolveCache(lambda state, stats=None: astar.astar_search(
+            state, astar.manhattan_distance, stats=stats))
+        cache(state)
+        print(cache.info())
+'''
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import puzzle8 as p8
+import incremental
+
+
+class SolveCache:
+    '''Wraps solver, which takes a state (and a stats keyword), so that
+    calling the cache works the same way as calling the solver.'''
+
+    def __init__(self, solver, max_entries: int = 100000, optimal=True,
+                 puzzle=p8) -> None:
+        '''Only set optimal if the solver always returns shortest paths;
+        otherwise just the states that were asked about are cached. puzzle
+        is used to follow the paths.'''
+        if max_entries < 1:
+            raise ValueError("max_entries should be at least 1")
+        self.solver = solver
+        self.max_entries = max_entries
+        self.optimal = optimal
+        self.puzzle = puzzle
+        # state -> (moves, offset) where the state's solution is
+        # moves[offset:], or None if it can't be solved
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, state, stats=None) -> Optional[List[int]]:
+        if state in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(state)
+            if stats is not None:
+                stats["expanded"] = 0
+            entry = self._entries[state]
+            if entry is None:
+                return None
+            moves, offset = entry
+            return list(moves[offset:])
+
+        self.misses += 1
+        solution = self.solver(state, stats=stats)
+        if solution is None:
+            self._store(state, None)
+        else:
+            self.add(state, solution)
+        return solution
+
+    def add(self, state, solution: List[int]) -> None:
+        '''Caches a solution for state, and, for an optimal solver, the
+        rest of it for every state along the way.'''
+        moves = tuple(solution)
+        if not self.optimal:
+            self._store(state, (moves, 0))
+            return
+        states = [state]
+        if self.puzzle is p8:
+            # skip the blank_square scan in puzzle8.move_blank
+            blank = p8.blank_square(state)
+            for square in moves:
+                states.append(incremental.move_blank(states[-1], blank,
+                                                     square)[0])
+                blank = square
+        else:
+            for square in moves:
+                states.append(self.puzzle.move_blank(states[-1], square))
+        # the start goes in last, so it is the most recently used
+        for offset in range(len(moves), -1, -1):
+            self._store(states[offset], (moves, offset))
+
+    def _store(self, state, entry) -> None:
+        self._entries[state] = entry
+        self._entries.move_to_end(state)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, state) -> bool:
+        return state in self._entries
+
+    def clear(self) -> None:
+        '''Empties the cache. The counters keep their values.'''
+        self._entries.clear()
+
+    def info(self) -> Dict[str, int]:
+        '''Counters for monitoring.'''
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "entries": len(self._entries),
+                "max_entries": self.max_entries}
@@ -0,0 +1,107 @@
+import puzzle8 as p8
+import astar
+import solve_cache
+from functools import reduce
+import pytest
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+    (108306836, 16),
+]
+
+
+class CountingSolver:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, state, stats=None):
+        self.calls += 1
+        return astar.astar_search(state, astar.manhattan_distance,
+                                  stats=stats)
+
+
+@pytest.mark.parametrize("test_input,expected", states_and_shortest_lengths)
+def test_cache_hit(test_input, expected):
+    solver = CountingSolver()
+    cache = solve_cache.SolveCache(solver)
+    first = cache(test_input)
+    stats = {}
+    second = cache(test_input, stats=stats)
+    assert first == second
+    assert len(second) == expected
+    assert solver.calls == 1
+    assert stats["expanded"] == 0
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+
+
+def test_suffixes_are_cached():
+    solver = CountingSolver()
+    cache = solve_cache.SolveCache(solver)
+    solution = cache(108306836)
+    assert len(cache) == len(solution) + 1
+
+    state = 108306836
+    for i, square in enumerate(solution):
+        state = p8.move_blank(state, square)
+        suffix = cache(state)
+        assert suffix == solution[i + 1:]
+        assert reduce(p8.move_blank, suffix, state) == p8.solution()
+    assert solver.calls == 1
+    assert cache.info()["hits"] == len(solution)
+
+
+def test_returned_solution_is_a_copy():
+    cache = solve_cache.SolveCache(CountingSolver())
+    cache(300501380).append(0)
+    assert len(cache(300501380)) == 12
+
+
+def test_not_optimal():
+    cache = solve_cache.SolveCache(CountingSolver(), optimal=False)
+    cache(300501380)
+    assert len(cache) == 1
+
+
+def test_eviction():
+    cache = solve_cache.SolveCache(CountingSolver(), max_entries=10)
+    cache(253780508)
+    assert len(cache) == 9
+    assert cache.info()["evictions"] == 0
+    cache(152293420)
+    assert len(cache) == 10
+    assert cache.info()["evictions"] > 0
+    # the start state was cached last, so it survives
+    assert 152293420 in cache
+    assert 253780508 not in cache
+
+
+def test_lru_order():
+    cache = solve_cache.SolveCache(CountingSolver(), max_entries=4)
+    cache(247860748)
+    cache(p8.solution())
+    cache(247860748)
+    cache(253206748)
+    assert 253206748 in cache
+
+
+def test_unsolvable_is_cached():
+    calls = []
+
+    def never(state, stats=None):
+        calls.append(state)
+        return None
+
+    cache = solve_cache.SolveCache(never)
+    assert cache(5) is None
+    assert cache(5) is None
+    assert calls == [5]
+
+
+def test_bad_size():
+    with pytest.raises(ValueError):
+        solve_cache.SolveCache(CountingSolver(), max_entries=0)
@@ -0,0 +1,107 @@
+'''
+    tracked8.py
+    Author: A.J. Ristino
+    For use in CS 321.00
+
+    The 8-puzzle with the square of the blank carried along in the state, so
+    blank_square never has to scan the tiles. A tracked state is a puzzle8
+    state shifted left 4 bits, with the blank's square in the low 4 bits:
+
+        tracked = puzzle8_state * 16 + blank_square
+
+    The functions mirror puzzle8, so this module can be passed as the puzzle
+    argument of the solvers. The solutions they return are the same lists
+    of squares either way; use from_state and to_state to convert states.
+'''
+
+import random
+import puzzle8 as p8
+
+_POWERS = [9 ** i for i in range(9)]
+
+
+class IllegalMoveException(Exception):
+    pass
+
+
+# Amount added to a tracked state when the blank moves from one square to a
+# neighbor, per unit of the tile that slides the other way
+_MOVES = [{dest: (_POWERS[source] - _POWERS[dest]) << 4
+           for dest in p8.neighbors(source)} for source in range(9)]
+
+
+def from_state(state) -> int:
+    '''Converts a puzzle8 state into a tracked state.'''
+    return (state << 4) | p8.blank_square(state)
+
+
+def to_state(tracked) -> int:
+    '''Converts a tracked state back into a puzzle8 state.'''
+    return tracked >> 4
+
+
+def state(pieces) -> int:
+    '''Define a new state with the tile number indicated in each position
+    (use 0 for blank). Parameter should be a list of nine digits.'''
+    return (p8.state(pieces) << 4) | pieces.index(0)
+
+
+# Puzzle goal
+_goal = from_state(p8._goal)
+
+# No tracked state is larger than this, for code that stores states in a
+# fixed number of bytes
+MAX_STATE = ((9 ** 9 - 1) << 4) | 8
+
+
+def move_blank(tracked, dest) -> int:
+    '''Move the blank from one square to another and return the resulting
+    state. Raises an exception if the move is not legal.'''
+    source = tracked & 15
+    try:
+        delta = _MOVES[source][dest]
+    except KeyError:
+        raise IllegalMoveException(dest)
+    tile = ((tracked >> 4) // _POWERS[dest]) % 9
+    return tracked + tile * delta + dest - source
+
+
+def blank_square(tracked) -> int:
+    '''Find the number of the square where the blank is.'''
+    return tracked & 15
+
+
+def random_state(num_moves=100) -> int:
+    '''Produces a random puzzle by randomly sliding puzzle pieces around
+    num_moves times, exactly as puzzle8.random_state does.'''
+    tracked = _goal
+    for _ in range(num_moves):
+        choices = p8.neighbors(tracked & 15)
+        tracked = move_blank(tracked,
+                             choices[random.randint(0, len(choices) - 1)])
+    return tracked
+
+
+def neighbors(square):
+    '''The squares that can be reached from a given square.'''
+    return p8.neighbors(square)
+
+
+def get_tile(tracked, square) -> int:
+    '''Return the tile that occupies the given square.'''
+    return ((tracked >> 4) // _POWERS[square]) % 9
+
+
+def display(tracked) -> None:
+    '''Display the puzzle associated with the given state.'''
+    p8.display(tracked >> 4)
+
+
+def xy_location(square):
+    '''Return the (x y) location of a square number.'''
+    return p8.xy_location(square)
+
+
+def solution() -> int:
+    '''Returns the state corresponding to the solution.'''
+    return _goal
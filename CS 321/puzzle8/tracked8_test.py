@@ -0,0 +1,79 @@
+import puzzle8 as p8
+import tracked8
+from tracked8 import (
+    state, get_tile, blank_square, move_blank, neighbors, solution,
+    random_state, from_state, to_state)
+import astar
+import bfs
+import itdeep
+import pytest
+import random
+
+states_and_shortest_lengths = [
+    (247860748, 2),
+    (253206748, 4),
+    (253780508, 8),
+    (152293420, 10),
+    (300501380, 12),
+]
+
+
+def test_state():
+    assert to_state(state([1, 2, 3, 8, 0, 4, 7, 6, 5])) == 247893796
+    assert state([1, 2, 3, 8, 0, 4, 7, 6, 5]) == solution()
+
+
+def test_conversion_round_trip():
+    random.seed(12345)
+    for _ in range(100):
+        original = p8.random_state(30)
+        tracked = from_state(original)
+        assert to_state(tracked) == original
+        assert blank_square(tracked) == p8.blank_square(original)
+
+
+def test_get_tile():
+    assert get_tile(from_state(247893796), 0) == 1
+    assert get_tile(from_state(247893796), 3) == 8
+
+
+def test_blank_square():
+    assert blank_square(from_state(247893796)) == 4
+
+
+def test_move_blank():
+    state1 = state([1, 2, 3, 8, 0, 4, 7, 6, 5])
+    state2 = state([1, 0, 3, 8, 2, 4, 7, 6, 5])
+    assert move_blank(state1, 1) == state2
+    assert blank_square(state2) == 1
+    with pytest.raises(tracked8.IllegalMoveException):
+        move_blank(state1, 0)
+
+
+def test_move_blank_matches_puzzle8():
+    random.seed(12345)
+    for _ in range(100):
+        original = p8.random_state(30)
+        for square in neighbors(p8.blank_square(original)):
+            assert to_state(move_blank(from_state(original), square)) == \
+                p8.move_blank(original, square)
+
+
+def test_random_state():
+    assert random_state(0) == solution()
+    random.seed(12345)
+    assert to_state(random_state(100)) == 108261756
+
+
+@pytest.mark.parametrize("test_input,expected", states_and_shortest_lengths)
+def test_solvers_give_same_moves(test_input, expected):
+    tracked = from_state(test_input)
+    assert bfs.breadth_first_search(tracked, puzzle=tracked8) == \
+        bfs.breadth_first_search(test_input)
+    assert astar.astar_search(tracked, astar.manhattan_distance,
+                              puzzle=tracked8) == \
+        astar.astar_search(test_input, astar.manhattan_distance)
+    assert itdeep.iterative_deepening_search(tracked, puzzle=tracked8) == \
+        itdeep.iterative_deepening_search(test_input)
+    assert len(itdeep.ida_star_search(tracked, astar.num_wrong_tiles,
+                                      puzzle=tracked8)) == expected